@@ -19,6 +19,8 @@ from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
 
+from core.data import set_read_cache
+
 SCRIPT_DIR = Path(__file__).parent.parent.resolve()
 DB_PATH = SCRIPT_DIR / 'portfolio.db'
 CSV_PATH = SCRIPT_DIR / 'data' / 'event_log_enhanced.csv'
@@ -66,6 +68,14 @@ def init_database():
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON events(timestamp)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_deleted ON events(is_deleted)')
 
+        # Cache metadata (e.g. which CSV state the events table was synced from)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
         # Price cache table for quick lookups
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS price_cache (
@@ -132,6 +142,11 @@ def sync_csv_to_db():
     if not CSV_PATH.exists():
         return
 
+    # Stat before reading: if the CSV changes mid-sync the recorded
+    # signature is already stale and readers fall back to the CSV.
+    st = CSV_PATH.stat()
+    csv_signature = f"{CSV_PATH}:{st.st_mtime_ns}:{st.st_size}"
+
     df = pd.read_csv(CSV_PATH)
 
     with get_db() as conn:
@@ -150,18 +165,41 @@ def sync_csv_to_db():
                 str(row['timestamp']),
                 str(row['event_type']),
                 str(row['data_json']),
-                str(row.get('reason_json', '{}')),
-                str(row.get('notes', '')),
-                str(row.get('tags_json', '[]')),
+                str(row['reason_json']) if pd.notna(row.get('reason_json')) else None,
+                str(row['notes']) if pd.notna(row.get('notes')) else '',
+                str(row['tags_json']) if pd.notna(row.get('tags_json')) else None,
                 1 if row.get('affects_cash', False) else 0,
                 float(row.get('cash_delta', 0))
             ))
 
+        cursor.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_signature', ?)",
+            (csv_signature,)
+        )
         conn.commit()
 
     return len(df)
 
 
+def query_synced_events(csv_signature: str, sql: str, params: tuple = ()):
+    """
+    Run an events query for core.data's read cache.
+
+    Returns the rows as dicts, or None if the database does not exist or
+    was last synced from a different CSV state. Never creates the database.
+    """
+    if not DB_PATH.exists():
+        return None
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM meta WHERE key = 'csv_signature'")
+        row = cursor.fetchone()
+        if not row or row['value'] != csv_signature:
+            return None
+        cursor.execute(sql, params)
+        return [dict(r) for r in cursor.fetchall()]
+
+
 def get_all_events(limit=None, event_type=None, ticker=None):
     """Get events from database with optional filtering."""
     with get_db() as conn:
@@ -452,3 +490,6 @@ def clear_old_notifications(days: int = 30) -> int:
 init_database()
 if CSV_PATH.exists():
     sync_csv_to_db()
+
+# Serve core.data's event reads from this database while it is in sync
+set_read_cache(query_synced_events)
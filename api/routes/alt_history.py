@@ -3,6 +3,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
 import sys
 from pathlib import Path
 
@@ -19,7 +20,8 @@ from core.realities import (
     apply_modifications
 )
 from core.realities import (
-    generate_projection,
+    generate_projection_async,
+    generate_projections_batch,
     load_projection,
     list_projections,
     delete_projection
@@ -92,6 +94,10 @@ class ProjectionRequest(BaseModel):
     idea_ids: list[str] = []  # Ideas to toggle on as mods in projection
 
 
+class BatchProjectionRequest(BaseModel):
+    projections: list[ProjectionRequest]
+
+
 @router.get("/projections")
 async def list_future_projections():
     """List all saved future projections."""
@@ -116,7 +122,7 @@ async def create_future_projection(request: ProjectionRequest):
     if request.years < 1 or request.years > 5:
         raise HTTPException(status_code=400, detail="Years must be between 1 and 5")
 
-    projection = generate_projection(
+    projection = await generate_projection_async(
         history_id=request.history_id,
         years=request.years,
         use_llm=request.use_llm,
@@ -129,6 +135,30 @@ async def create_future_projection(request: ProjectionRequest):
     return projection
 
 
+@router.post("/projections/generate-batch")
+async def create_future_projections(request: BatchProjectionRequest):
+    """Generate several future projections at once.
+
+    LLM analyses for the portfolios are requested a few per prompt rather
+    than one call each, so comparing many histories stays fast.
+
+    Returns:
+        One projection (or {"error": ...}) per request, in request order
+    """
+    if any(p.years < 1 or p.years > 5 for p in request.projections):
+        raise HTTPException(status_code=400, detail="Years must be between 1 and 5")
+
+    # Blocking replays and LLM calls; keep them off the event loop
+    projections = await asyncio.to_thread(
+        generate_projections_batch, [p.model_dump() for p in request.projections]
+    )
+
+    return {
+        "projections": projections,
+        "count": len(projections)
+    }
+
+
 @router.get("/projections/{projection_id}")
 async def get_future_projection(projection_id: str):
     """Get a saved future projection."""
@@ -328,7 +358,7 @@ async def project_history_future(history_id: str, years: int = 3, use_llm: bool
 
     Shortcut endpoint that creates a projection for the given history.
     """
-    projection = generate_projection(
+    projection = await generate_projection_async(
         history_id=history_id,
         years=min(max(years, 1), 5),
         use_llm=use_llm
@@ -11,6 +11,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from api.database import get_db, get_all_events, sync_csv_to_db
+from core.data import append_event, append_events_bulk, get_next_event_id
 from llm.config import get_llm_config
 from llm.client import LLMClient
 
@@ -42,38 +43,16 @@ class ManifestRequest(BaseModel):
     context: str = ""  # Additional context for the LLM
 
 
-def get_next_event_id():
-    """Get the next event ID from CSV."""
-    import pandas as pd
-    if CSV_PATH.exists():
-        df = pd.read_csv(CSV_PATH)
-        return int(df['event_id'].max()) + 1 if len(df) > 0 else 1
-    return 1
-
-
-def append_event_to_csv(event_id, event_type, data, reason=None, notes="", affects_cash=False, cash_delta=0):
-    """Append a new event to the CSV file."""
-    import pandas as pd
-
-    new_row = {
-        'event_id': event_id,
-        'timestamp': datetime.now().isoformat(),
-        'event_type': event_type,
-        'data_json': json.dumps(data),
-        'reason_json': json.dumps(reason or {}),
-        'notes': notes,
-        'tags_json': '[]',
-        'affects_cash': affects_cash,
-        'cash_delta': cash_delta
-    }
-
-    if CSV_PATH.exists():
-        df = pd.read_csv(CSV_PATH)
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-    else:
-        df = pd.DataFrame([new_row])
-
-    df.to_csv(CSV_PATH, index=False)
+def append_event_to_csv(event_type, data, reason=None, notes="", affects_cash=False, cash_delta=0):
+    """Append a new event to the CSV file and refresh the SQLite cache."""
+    event_id = append_event(
+        event_type=event_type,
+        data=data,
+        reason=reason,
+        notes=notes,
+        affects_cash=affects_cash,
+        cash_delta=cash_delta
+    )
     sync_csv_to_db()
     return event_id
 
@@ -208,7 +187,6 @@ async def get_idea(idea_id: str):
 async def create_idea(idea: IdeaSeed):
     """Create a new seed idea."""
     idea_id = str(uuid.uuid4())[:8]
-    event_id = get_next_event_id()
 
     data = {
         'idea_id': idea_id,
@@ -221,8 +199,7 @@ async def create_idea(idea: IdeaSeed):
         'enabled': idea.enabled
     }
 
-    append_event_to_csv(
-        event_id=event_id,
+    event_id = append_event_to_csv(
         event_type='IDEA_SEED',
         data=data,
         notes=f"New idea: {idea.title}"
@@ -337,15 +314,14 @@ Respond in this exact JSON format:
 
         manifest_data = json.loads(json_match.group())
 
-        # Create action events for each generated action
-        actions_created = []
-        for action in manifest_data.get('actions', []):
-            action_id = str(uuid.uuid4())[:8]
-            event_id = get_next_event_id()
-
+        # Create action events for each generated action, plus the status
+        # change, in a single append
+        new_events = []
+        actions = manifest_data.get('actions', [])
+        for action in actions:
             action_data = {
                 'idea_id': idea_id,
-                'action_id': action_id,
+                'action_id': str(uuid.uuid4())[:8],
                 'action_type': action.get('action_type'),
                 'target': action.get('target', action.get('ticker', '')),  # Support legacy 'ticker'
                 'details': action.get('details', {}),
@@ -354,28 +330,30 @@ Respond in this exact JSON format:
                 'approved': False,
                 'executed': False
             }
-
-            append_event_to_csv(
-                event_id=event_id,
-                event_type='IDEA_ACTION',
-                data=action_data,
-                notes=f"LLM-generated action for idea {idea_id}"
-            )
-
-            actions_created.append({
-                'action_id': action_id,
-                'event_id': event_id,
-                **action
+            new_events.append({
+                'event_type': 'IDEA_ACTION',
+                'data': action_data,
+                'notes': f"LLM-generated action for idea {idea_id}"
             })
 
         # Update idea status to manifested
-        status_event_id = get_next_event_id()
-        append_event_to_csv(
-            event_id=status_event_id,
-            event_type='IDEA_STATUS',
-            data={'idea_id': idea_id, 'status': 'manifested'},
-            notes=f"Idea manifested with {len(actions_created)} actions"
-        )
+        new_events.append({
+            'event_type': 'IDEA_STATUS',
+            'data': {'idea_id': idea_id, 'status': 'manifested'},
+            'notes': f"Idea manifested with {len(actions)} actions"
+        })
+
+        event_ids = append_events_bulk(new_events)
+        sync_csv_to_db()
+
+        actions_created = [
+            {
+                'action_id': event['data']['action_id'],
+                'event_id': event_id,
+                **action
+            }
+            for action, event, event_id in zip(actions, new_events, event_ids)
+        ]
 
         return {
             "success": True,
@@ -409,7 +387,6 @@ async def approve_action(idea_id: str, action_id: str, feedback: str = None):
         raise HTTPException(status_code=404, detail="Action not found")
 
     # Create approval event
-    event_id = get_next_event_id()
     approval_data = {
         'idea_id': idea_id,
         'action_id': action_id,
@@ -423,8 +400,7 @@ async def approve_action(idea_id: str, action_id: str, feedback: str = None):
         'user_feedback': feedback
     }
 
-    append_event_to_csv(
-        event_id=event_id,
+    event_id = append_event_to_csv(
         event_type='IDEA_ACTION',
         data=approval_data,
         notes=f"Action {action_id} approved"
@@ -444,7 +420,6 @@ async def reject_action(idea_id: str, action_id: str, reason: str = None):
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
-    event_id = get_next_event_id()
     rejection_data = {
         'idea_id': idea_id,
         'action_id': action_id,
@@ -453,8 +428,7 @@ async def reject_action(idea_id: str, action_id: str, reason: str = None):
         'rejection_reason': reason
     }
 
-    append_event_to_csv(
-        event_id=event_id,
+    event_id = append_event_to_csv(
         event_type='IDEA_ACTION',
         data=rejection_data,
         notes=f"Action {action_id} rejected: {reason or 'No reason given'}"
@@ -485,8 +459,6 @@ async def execute_action(idea_id: str, action_id: str):
         raise HTTPException(status_code=404, detail="Approved action not found")
 
     # Create the actual trade event based on action type
-    event_id = get_next_event_id()
-
     if action['action_type'] == 'sell_put':
         details = action['details']
         trade_data = {
@@ -502,8 +474,7 @@ async def execute_action(idea_id: str, action_id: str):
             'from_action': action_id
         }
 
-        append_event_to_csv(
-            event_id=event_id,
+        event_id = append_event_to_csv(
             event_type='OPTION_OPEN',
             data=trade_data,
             reason={'explanation': f"Executed from idea: {idea['title']}", 'from_idea': idea_id},
@@ -526,8 +497,7 @@ async def execute_action(idea_id: str, action_id: str):
             'from_action': action_id
         }
 
-        append_event_to_csv(
-            event_id=event_id,
+        event_id = append_event_to_csv(
             event_type='OPTION_OPEN',
             data=trade_data,
             reason={'explanation': f"Executed from idea: {idea['title']}", 'from_idea': idea_id},
@@ -547,8 +517,7 @@ async def execute_action(idea_id: str, action_id: str):
             'from_action': action_id
         }
 
-        append_event_to_csv(
-            event_id=event_id,
+        event_id = append_event_to_csv(
             event_type='TRADE',
             data=trade_data,
             reason={'explanation': f"Executed from idea: {idea['title']}", 'from_idea': idea_id},
@@ -558,10 +527,9 @@ async def execute_action(idea_id: str, action_id: str):
 
     else:
         # For research or other action types, just mark as executed
-        pass
+        event_id = get_next_event_id()
 
     # Mark action as executed
-    exec_event_id = get_next_event_id()
     exec_data = {
         'idea_id': idea_id,
         'action_id': action_id,
@@ -570,7 +538,6 @@ async def execute_action(idea_id: str, action_id: str):
     }
 
     append_event_to_csv(
-        event_id=exec_event_id,
         event_type='IDEA_ACTION',
         data=exec_data,
         notes=f"Action {action_id} executed as event {event_id}"
@@ -591,9 +558,7 @@ async def archive_idea(idea_id: str):
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
-    event_id = get_next_event_id()
     append_event_to_csv(
-        event_id=event_id,
         event_type='IDEA_STATUS',
         data={'idea_id': idea_id, 'status': 'archived'},
         notes=f"Idea archived"
@@ -627,9 +592,7 @@ async def toggle_idea(idea_id: str, enabled: bool = None):
     new_enabled = not current_enabled if enabled is None else enabled
 
     # Create status event to record the change
-    event_id = get_next_event_id()
     append_event_to_csv(
-        event_id=event_id,
         event_type='IDEA_STATUS',
         data={'idea_id': idea_id, 'enabled': new_enabled},
         notes=f"Idea {'enabled' if new_enabled else 'disabled'}"
@@ -179,7 +179,7 @@ async def scan_ticker(ticker: str, max_dte: int = 45):
     Scan a specific ticker for options opportunities.
     Returns both puts and calls for the ticker.
     """
-    from core.scanner import fetch_options_chain, score_option, get_portfolio_holdings
+    from core.scanner import fetch_options_chain, score_options, get_portfolio_holdings
 
     try:
         ticker = ticker.upper()
@@ -196,8 +196,8 @@ async def scan_ticker(ticker: str, max_dte: int = 45):
             }
 
         # Score all options
-        for opt in options:
-            opt['score'] = score_option(opt, portfolio)
+        for opt, score in zip(options, score_options(options, portfolio)):
+            opt['score'] = score
 
         # Sort by score
         options.sort(key=lambda x: x['score'], reverse=True)
@@ -472,7 +472,7 @@ def get_recent_events(limit=10, ticker=None):
     if ticker:
         ticker = ticker.upper()
         # Filter events that mention this ticker
-        mask = df['data_json'].str.contains(f'"{ticker}"', case=False, na=False)
+        mask = df['data_json'].str.contains(f'"{ticker}"', case=False, regex=False, na=False)
         df = df[mask]
 
     return df.tail(limit).to_dict('records')
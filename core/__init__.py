@@ -19,6 +19,8 @@ from core.realities import (
     generate_algorithmic_trades,
     generate_llm_trading_history,
     build_historical_timeline,
+    get_reality_state,
+    get_reality_prices,
 
     # From alternate_reality.py - Simple Reality Engine
     load_alternate_realities,
@@ -12,17 +12,71 @@ KEY PRINCIPLES:
 """
 
 import pandas as pd
+import csv
 import json
 import fcntl
+import io
 import os
+import shutil
+import tempfile
+import threading
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from contextlib import contextmanager
 
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib have a go
+            return json.dumps(obj, separators=(',', ':'))
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
 SCRIPT_DIR = Path(__file__).parent.parent.resolve()
 CSV_PATH = SCRIPT_DIR / 'data' / 'event_log_enhanced.csv'
 
+CSV_COLUMNS = [
+    'event_id', 'timestamp', 'event_type', 'data_json', 'reason_json',
+    'notes', 'tags_json', 'affects_cash', 'cash_delta'
+]
+
+
+# Serializes access to the event log within this process (CLI, API requests,
+# background AI tasks). fcntl.flock below handles the cross-process case.
+_LOCK = threading.RLock()
+_lock_state = threading.local()
+
+# Lock file handles, opened once per lock path and process. flock() belongs to
+# the open file, which is why in-process callers must go through _LOCK.
+_lock_files: Dict[Path, Tuple[int, Any]] = {}
+
+
+def _lock_fd() -> int:
+    """Return the fd of CSV_PATH's lock file, opening it on first use. Call with _LOCK held."""
+    lock_path = CSV_PATH.with_suffix('.lock')
+    pid, lock_file = _lock_files.get(lock_path, (None, None))
+    if pid != os.getpid():
+        # A forked child must not share the parent's open file (and its lock)
+        lock_file = open(lock_path, 'w')
+        _lock_files[lock_path] = (os.getpid(), lock_file)
+    return lock_file.fileno()
+
 
 @contextmanager
 def csv_lock(mode='r'):
@@ -30,28 +84,184 @@ def csv_lock(mode='r'):
     File lock context manager for CSV operations.
     Prevents concurrent write corruption.
 
+    The lock file stays open for the life of the process; each call only
+    pays for flock(). Since flock() is per open file rather than per thread,
+    threads in this process are serialized by an RLock around it. The lock
+    is re-entrant: a thread holding it may nest csv_lock() calls, and a
+    nested write upgrades an outer read lock for its duration.
+
     Usage:
         with csv_lock('w'):
             # perform write operations
             df.to_csv(CSV_PATH, index=False)
     """
-    lock_path = CSV_PATH.with_suffix('.lock')
-    lock_file = open(lock_path, 'w')
+    with _LOCK:
+        held = getattr(_lock_state, 'mode', None)
+        fd = _lock_fd()
+
+        if held is None or (mode == 'w' and held == 'r'):
+            # Acquire exclusive lock for writes, shared lock for reads
+            fcntl.flock(fd, fcntl.LOCK_EX if mode == 'w' else fcntl.LOCK_SH)
+            _lock_state.mode = mode
+        try:
+            yield
+        finally:
+            if held is None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif held != _lock_state.mode:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            _lock_state.mode = held
+
+
+def _parse_json_columns(df: pd.DataFrame):
+    """Parse data_json/reason_json/tags_json into data/reason/tags columns in place."""
+    for col in ['data_json', 'reason_json', 'tags_json']:
+        if col in df.columns:
+            empty = list if col == 'tags_json' else dict
+            # Missing cells come back as NaN/None/pd.NA; only non-empty strings parse
+            df[col.replace('_json', '')] = [
+                _loads(x) if isinstance(x, str) and x else empty()
+                for x in df[col].values
+            ]
+
+
+def _contains(col: pd.Series, needle: str):
+    """Case-insensitive literal substring match over a string column."""
+    if pa is not None:
+        arr = pa.array(col.values, type=pa.string(), from_pandas=True)
+        mask = pc.match_substring(arr, needle, ignore_case=True).fill_null(False)
+        return mask.to_numpy(zero_copy_only=False)
+    return col.str.contains(needle, case=False, regex=False, na=False).values
+
+
+def log_signature(csv_path: Path) -> Optional[str]:
+    """
+    Identify the on-disk state of an event log.
 
+    Combines path, mtime and size of the CSV. Returns None if the CSV does
+    not exist.
+    """
     try:
-        # Acquire exclusive lock for writes, shared lock for reads
-        lock_type = fcntl.LOCK_EX if mode == 'w' else fcntl.LOCK_SH
-        fcntl.flock(lock_file.fileno(), lock_type)
-        yield
-    finally:
-        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
-        lock_file.close()
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    return f"{csv_path}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def _csv_signature() -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the CSV, or None if it does not exist."""
+    try:
+        st = os.stat(CSV_PATH)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Explicit dtypes for the event log. event_type is categorical so type
+# filters compare small integer codes instead of strings.
+CSV_DTYPES = {
+    'event_id': 'int64',
+    'event_type': 'category',
+    'affects_cash': 'bool',
+    'cash_delta': 'float64',
+}
+
+# affects_cash may be blank in hand-edited or alternate-history logs, so it
+# is read as nullable and blanks are filled with False afterwards
+_READ_DTYPES = {**CSV_DTYPES, 'affects_cash': 'boolean'}
+
+
+def read_event_csv(path: Path) -> pd.DataFrame:
+    """
+    Read an event log file into a DataFrame.
+
+    Also used for alternate-history logs, which share the column layout.
+    Uses pyarrow's multi-threaded CSV reader when pyarrow is installed,
+    with column types pinned so timestamps stay strings. Falls back to
+    pd.read_csv otherwise. Both paths produce CSV_DTYPES, with a blank
+    affects_cash read as False.
+    """
+    if pa is None:
+        return _fill_affects_cash(pd.read_csv(path, dtype=_READ_DTYPES))
+
+    column_types = {
+        'event_id': pa.int64(),
+        'timestamp': pa.string(),
+        'event_type': pa.dictionary(pa.int32(), pa.string()),
+        'data_json': pa.string(),
+        'reason_json': pa.string(),
+        'notes': pa.string(),
+        'tags_json': pa.string(),
+        'affects_cash': pa.bool_(),
+        'cash_delta': pa.float64(),
+    }
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+    )
+    return _fill_affects_cash(table.to_pandas())
+
+
+def _fill_affects_cash(df: pd.DataFrame) -> pd.DataFrame:
+    if 'affects_cash' in df.columns:
+        df['affects_cash'] = df['affects_cash'].fillna(False).astype(bool)
+    return df
+
+
+# Parsed CSV frames for the current file signature, one per parse_json flag.
+# Writers in this module call _invalidate_cache() before releasing the lock;
+# edits made by other processes are picked up through the signature.
+_CACHE: Dict[str, Any] = {'key': None, 'frames': {}}
+
+
+def _invalidate_cache():
+    """Drop cached frames. Call with csv_lock('w') held."""
+    _CACHE['key'] = None
+    _CACHE['frames'] = {}
+
+
+def _cached_frame(parse_json: bool, by_id: bool = False) -> pd.DataFrame:
+    """
+    Return the cached events frame for the current CSV, reading it if needed.
+
+    With by_id=True the frame is indexed by event_id (column kept) for O(1)
+    lookups. The result is shared with the cache; callers must not mutate it.
+    Call with csv_lock held.
+    """
+    key = _csv_signature()
+    if _CACHE['key'] != key:
+        _CACHE['key'] = key
+        _CACHE['frames'] = {}
+
+    frames = _CACHE['frames']
+    df = frames.get(parse_json)
+    if df is None:
+        df = read_event_csv(CSV_PATH)
+
+        if parse_json:
+            _parse_json_columns(df)
+
+        frames[parse_json] = df
+
+    if not by_id:
+        return df
+
+    indexed = frames.get(('by_id', parse_json))
+    if indexed is None:
+        indexed = df.set_index('event_id', drop=False)
+        frames[('by_id', parse_json)] = indexed
+    return indexed
 
 
 def load_events(parse_json: bool = True) -> pd.DataFrame:
     """
     Load all events from CSV (source of truth).
 
+    The parsed CSV is cached in-process until the file changes, so repeat
+    reads only pay for a stat() and a DataFrame copy. Parsed data/reason/tags
+    cells are shared with the cache and should be treated as read-only.
+
     Args:
         parse_json: If True, parse JSON columns into dicts/lists
 
@@ -59,23 +269,127 @@ def load_events(parse_json: bool = True) -> pd.DataFrame:
         DataFrame with all events
     """
     with csv_lock('r'):
-        df = pd.read_csv(CSV_PATH)
+        return _cached_frame(parse_json).copy()
 
-        if parse_json:
-            # Parse JSON columns
-            for col in ['data_json', 'reason_json', 'tags_json']:
-                if col in df.columns:
-                    df[col.replace('_json', '')] = df[col].apply(
-                        lambda x: json.loads(x) if pd.notna(x) and x else ({} if col != 'tags_json' else [])
-                    )
 
-        return df
+def _read_max_id() -> int:
+    """
+    Return the highest event_id in the CSV.
+
+    Uses the `.maxid` sidecar written by append_event(). The sidecar also
+    records the CSV signature it was written against, so if anything else
+    touched the CSV since (edits, restores, other tools) we fall back to
+    scanning the event_id column. Call with csv_lock held.
+    """
+    sig = _csv_signature()
+    if sig is None:
+        return 0
+
+    try:
+        max_id, mtime_ns, size = CSV_PATH.with_suffix('.maxid').read_text().split()
+        if (int(mtime_ns), int(size)) == sig:
+            return int(max_id)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    df = pd.read_csv(CSV_PATH, usecols=['event_id'])
+    return int(df['event_id'].max()) if len(df) > 0 else 0
+
+
+def _write_max_id(max_id: int):
+    """Atomically record max_id against the current CSV signature."""
+    mtime_ns, size = _csv_signature()
+    sidecar = CSV_PATH.with_suffix('.maxid')
+    tmp = sidecar.with_suffix('.maxid.tmp')
+    tmp.write_text(f"{max_id} {mtime_ns} {size}\n")
+    os.replace(tmp, sidecar)
+
+
+def _append_rows(rows: List[Dict[str, Any]]):
+    """
+    Append pre-built rows to the CSV without rewriting it.
+
+    Columns are written in the order of the existing header. The rows are
+    formatted into one bytes payload up front and written with os.write on
+    an O_APPEND descriptor, which releases the GIL during the I/O.
+    Call with csv_lock('w') held.
+    """
+    header = None
+    needs_newline = False
+    try:
+        with open(CSV_PATH, 'rb') as f:
+            first_line = f.readline()
+            if first_line:
+                header = next(csv.reader([first_line.decode('utf-8')]))
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+    except FileNotFoundError:
+        pass
+
+    buf = io.StringIO()
+    if needs_newline:
+        buf.write('\n')
+    writer = csv.writer(buf, lineterminator='\n')
+    if header is None:
+        header = CSV_COLUMNS
+        writer.writerow(header)
+    writer.writerows([[row.get(col, '') for col in header] for row in rows])
+    payload = buf.getvalue().encode('utf-8')
+
+    fd = os.open(CSV_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _rewrite_rows(transform: Callable[[Dict[str, str]], Optional[Dict[str, str]]]) -> bool:
+    """
+    Stream the CSV through `transform` into a temp file and swap it in.
+
+    `transform` gets each row as a dict of raw strings and returns the same
+    dict to keep it untouched, a new dict to replace it, or None to drop it.
+    Rows are copied as text, so untouched rows are never re-serialized
+    through pandas. The file is only replaced if some row changed.
+    Call with csv_lock('w') held.
+
+    Returns:
+        True if the CSV was rewritten
+    """
+    changed = False
+    with open(CSV_PATH, 'r', newline='') as src:
+        reader = csv.DictReader(src)
+        tmp = tempfile.NamedTemporaryFile(
+            'w', dir=CSV_PATH.parent, prefix=CSV_PATH.name, suffix='.tmp',
+            newline='', delete=False
+        )
+        try:
+            with tmp:
+                writer = csv.DictWriter(tmp, fieldnames=reader.fieldnames, lineterminator='\n')
+                writer.writeheader()
+                for row in reader:
+                    out = transform(row)
+                    if out is not row:
+                        changed = True
+                    if out is not None:
+                        writer.writerow(out)
+
+            if changed:
+                shutil.copymode(CSV_PATH, tmp.name)
+                os.replace(tmp.name, CSV_PATH)
+        finally:
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+
+    return changed
 
 
 def get_next_event_id() -> int:
     """Get the next available event ID."""
-    df = load_events(parse_json=False)
-    return int(df['event_id'].max()) + 1 if len(df) > 0 else 1
+    with csv_lock('r'):
+        return _read_max_id() + 1
 
 
 def append_event(
@@ -105,75 +419,148 @@ def append_event(
     Returns:
         The event_id of the created event
     """
-    if reason is None:
-        reason = {}
-    if tags is None:
-        tags = []
+    return append_events_bulk([{
+        'event_type': event_type,
+        'data': data,
+        'reason': reason,
+        'notes': notes,
+        'tags': tags,
+        'affects_cash': affects_cash,
+        'cash_delta': cash_delta
+    }])[0]
+
+
+def append_events_bulk(events: List[Dict[str, Any]]) -> List[int]:
+    """
+    Append several events to the CSV log in one write.
 
-    with csv_lock('w'):
-        df = pd.read_csv(CSV_PATH)
+    Takes the write lock once, allocates a contiguous block of event IDs and
+    writes all rows in a single call. Use this instead of calling
+    append_event() in a loop (e.g. bursts of PRICE_UPDATE or IDEA_ACTION
+    events).
 
-        event_id = int(df['event_id'].max()) + 1 if len(df) > 0 else 1
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    Args:
+        events: List of dicts with the same keys as append_event()'s
+            arguments (event_type and data required, the rest optional)
 
-        new_row = {
-            'event_id': event_id,
-            'timestamp': timestamp,
-            'event_type': event_type,
-            'data_json': json.dumps(data),
-            'reason_json': json.dumps(reason),
-            'notes': notes,
-            'tags_json': json.dumps(tags),
-            'affects_cash': affects_cash,
-            'cash_delta': cash_delta
-        }
+    Returns:
+        List of created event_ids, in the same order as `events`
+    """
+    if not events:
+        return []
 
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        df.to_csv(CSV_PATH, index=False)
+    with csv_lock('w'):
+        first_id = _read_max_id() + 1
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
+
+        rows = []
+        for offset, event in enumerate(events):
+            reason = event.get('reason')
+            tags = event.get('tags')
+            rows.append({
+                'event_id': first_id + offset,
+                'timestamp': timestamp,
+                'event_type': event['event_type'],
+                'data_json': _dumps(event['data']),
+                'reason_json': _dumps(reason if reason is not None else {}),
+                'notes': event.get('notes', ''),
+                'tags_json': _dumps(tags if tags is not None else []),
+                'affects_cash': bool(event.get('affects_cash', False)),
+                'cash_delta': float(event.get('cash_delta', 0))
+            })
+
+        _append_rows(rows)
+        _write_max_id(first_id + len(rows) - 1)
+        _invalidate_cache()
+
+    return [row['event_id'] for row in rows]
+
+
+_JSON_FIELDS = {'data': 'data_json', 'reason': 'reason_json', 'tags': 'tags_json'}
+
+
+def _format_cell(column: str, value: Any) -> str:
+    """Format a value the way it is stored in the CSV column."""
+    if column.endswith('_json') and isinstance(value, (dict, list)):
+        return _dumps(value)
+    if column == 'affects_cash':
+        return str(bool(value))
+    if column == 'cash_delta':
+        return str(float(value))
+    return '' if value is None else str(value)
+
+
+def _patch_cached_frames(frames: Dict[bool, pd.DataFrame], event_id: int, cells: Dict[str, str]):
+    """
+    Apply an update_event() patch to cached frames and re-key the cache to
+    the rewritten CSV, so the next read does not re-parse the whole log.
+    Call with csv_lock('w') held, right after the rewrite.
+    """
+    if not frames or 'event_type' in cells:
+        _invalidate_cache()
+        return
+
+    # Indexed views are cheap to rebuild; only patch the base frames
+    frames = {k: v for k, v in frames.items() if isinstance(k, bool)}
+
+    try:
+        for parse_json, df in frames.items():
+            rows = df.index[df['event_id'] == event_id]
+            for column, text in cells.items():
+                if column not in df.columns:
+                    continue
+                if column == 'affects_cash':
+                    value = text == 'True'
+                elif column == 'cash_delta':
+                    value = float(text)
+                else:
+                    value = text if text else None
+                for idx in rows:
+                    df.at[idx, column] = value
+                    if parse_json and column in _JSON_FIELDS.values():
+                        empty = [] if column == 'tags_json' else {}
+                        df.at[idx, column.replace('_json', '')] = _loads(text) if text else empty
+    except Exception:
+        _invalidate_cache()
+        return
 
-    return event_id
+    _CACHE['key'] = _csv_signature()
+    _CACHE['frames'] = frames
 
 
 def update_event(event_id: int, updates: Dict[str, Any]) -> bool:
     """
     Update an event in the CSV (source of truth).
 
+    The event's line is patched while streaming the log to a temp file, and
+    the in-process cache is patched in place rather than re-parsed.
+
     Args:
         event_id: The event ID to update
-        updates: Dict with fields to update (data, reason, notes, tags, affects_cash, cash_delta)
+        updates: Dict with fields to update (data, reason, notes, tags, affects_cash, cash_delta).
+            Column names (data_json, ...) are accepted too; dict/list values
+            for JSON columns are serialized.
 
     Returns:
         True if successful, False if event not found
     """
-    with csv_lock('w'):
-        df = pd.read_csv(CSV_PATH)
+    target = str(event_id)
+    cells = {}
+    for field, value in updates.items():
+        # Map field names to CSV column names
+        column = _JSON_FIELDS.get(field, field)
+        cells[column] = _format_cell(column, value)
+
+    def patch(row):
+        if row['event_id'] != target:
+            return row
+        return {**row, **{c: v for c, v in cells.items() if c in row}}
 
-        mask = df['event_id'] == event_id
-        if not mask.any():
+    with csv_lock('w'):
+        frames = _CACHE['frames'] if _CACHE['key'] == _csv_signature() else {}
+        if not _rewrite_rows(patch):
             return False
-
-        # Update fields
-        for field, value in updates.items():
-            # Map field names to CSV column names
-            if field == 'data':
-                field = 'data_json'
-                value = json.dumps(value) if isinstance(value, dict) else value
-            elif field == 'reason':
-                field = 'reason_json'
-                value = json.dumps(value) if isinstance(value, dict) else value
-            elif field == 'tags':
-                field = 'tags_json'
-                value = json.dumps(value) if isinstance(value, list) else value
-
-            if field in df.columns:
-                if field in ['affects_cash']:
-                    df.loc[mask, field] = bool(value)
-                elif field in ['cash_delta']:
-                    df.loc[mask, field] = float(value)
-                else:
-                    df.loc[mask, field] = value
-
-        df.to_csv(CSV_PATH, index=False)
+        _patch_cached_frames(frames, int(event_id), cells)
 
     return True
 
@@ -188,22 +575,82 @@ def delete_event(event_id: int) -> bool:
     Returns:
         True if successful, False if event not found
     """
-    with csv_lock('w'):
-        df = pd.read_csv(CSV_PATH)
-        mask = df['event_id'] == event_id
+    target = str(event_id)
 
-        if not mask.any():
+    with csv_lock('w'):
+        if not _rewrite_rows(lambda row: None if row['event_id'] == target else row):
             return False
-
-        df = df[~mask]
-        df.to_csv(CSV_PATH, index=False)
+        _invalidate_cache()
 
     return True
 
 
+_CACHE_COLUMNS = ', '.join(CSV_COLUMNS)
+
+
+# Optional read cache for event queries. core never imports the API layer;
+# api.database installs its SQLite mirror here through set_read_cache().
+_read_cache: Optional[Callable[[str, str, tuple], Optional[List[Dict[str, Any]]]]] = None
+
+# Text columns the CSV reader returns as NaN when the cell is empty
+_TEXT_COLUMNS = ('data_json', 'reason_json', 'notes', 'tags_json')
+
+
+def set_read_cache(query: Optional[Callable[[str, str, tuple], Optional[List[Dict[str, Any]]]]]):
+    """
+    Install (or, with None, remove) a read cache for get_events/get_event_by_id.
+
+    query(csv_signature, sql, params) runs the SELECT against the events
+    table and returns the rows as dicts, or None unless it was synced from
+    the CSV in exactly that state.
+    """
+    global _read_cache
+    _read_cache = query
+
+
+def _query_read_cache(where: str = '', params: tuple = (), suffix: str = '') -> Optional[List[Dict[str, Any]]]:
+    """
+    Run an events query against the read cache, if one is installed.
+
+    Only answers when the cache was synced from the CSV as it is right now
+    (same path, mtime and size); returns None otherwise so the caller falls
+    back to reading the CSV. Rows come back shaped like the CSV path's.
+    """
+    query = _read_cache
+    if query is None:
+        return None
+    sig = log_signature(CSV_PATH)
+    if sig is None:
+        return None
+
+    try:
+        rows = query(sig, f'SELECT {_CACHE_COLUMNS} FROM events WHERE is_deleted = 0 {where} {suffix}', params)
+    except Exception:
+        return None
+    if rows is None:
+        return None
+
+    for row in rows:
+        row['affects_cash'] = bool(row['affects_cash'])
+        for col in _TEXT_COLUMNS:
+            if not row[col]:
+                row[col] = float('nan')
+    return rows
+
+
+def _parse_json_row(row: Dict[str, Any]):
+    """Parse the JSON columns of a single event dict in place."""
+    for col in ['data_json', 'reason_json', 'tags_json']:
+        x = row.get(col)
+        row[col.replace('_json', '')] = _loads(x) if isinstance(x, str) and x else ([] if col == 'tags_json' else {})
+
+
 def get_event_by_id(event_id: int, parse_json: bool = True) -> Optional[Dict[str, Any]]:
     """
-    Get a single event by ID from CSV.
+    Get a single event by ID.
+
+    Served from the SQLite cache when it is in sync with the CSV,
+    otherwise read from the CSV.
 
     Args:
         event_id: The event ID to retrieve
@@ -212,13 +659,24 @@ def get_event_by_id(event_id: int, parse_json: bool = True) -> Optional[Dict[str
     Returns:
         Event dict or None if not found
     """
-    df = load_events(parse_json=parse_json)
-    mask = df['event_id'] == event_id
-
-    if not mask.any():
-        return None
+    rows = _query_read_cache('AND event_id = ?', (int(event_id),))
+    if rows is not None:
+        if not rows:
+            return None
+        if parse_json:
+            _parse_json_row(rows[0])
+        return rows[0]
 
-    row = df[mask].iloc[0]
+    with csv_lock('r'):
+        df = _cached_frame(parse_json, by_id=True)
+        try:
+            row = df.loc[event_id]
+        except KeyError:
+            return None
+
+    if isinstance(row, pd.DataFrame):
+        # Duplicate event_id in the log - keep the first, as before
+        row = row.iloc[0]
     return row.to_dict()
 
 
@@ -231,6 +689,9 @@ def get_events(
     """
     Get events with optional filtering.
 
+    Served from the SQLite cache (indexed, only the returned rows are
+    JSON-parsed) when it is in sync with the CSV, otherwise read from the CSV.
+
     Args:
         limit: Maximum number of events to return (most recent first)
         event_type: Filter by event type
@@ -240,6 +701,27 @@ def get_events(
     Returns:
         List of event dicts
     """
+    where = ''
+    params = []
+    if event_type:
+        where += ' AND event_type = ?'
+        params.append(event_type)
+    if ticker:
+        escaped = ticker.upper().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        where += " AND data_json LIKE ? ESCAPE '\\'"
+        params.append(f'%"{escaped}"%')
+    suffix = 'ORDER BY event_id DESC'
+    if limit:
+        suffix += ' LIMIT ?'
+        params.append(int(limit))
+
+    rows = _query_read_cache(where, tuple(params), suffix)
+    if rows is not None:
+        if parse_json:
+            for row in rows:
+                _parse_json_row(row)
+        return rows
+
     df = load_events(parse_json=False)
 
     if event_type:
@@ -247,7 +729,7 @@ def get_events(
 
     if ticker:
         ticker_upper = ticker.upper()
-        df = df[df['data_json'].str.contains(f'"{ticker_upper}"', case=False, na=False)]
+        df = df[_contains(df['data_json'], f'"{ticker_upper}"')]
 
     # Sort by event_id descending (most recent first)
     df = df.sort_values('event_id', ascending=False)
@@ -256,11 +738,7 @@ def get_events(
         df = df.head(limit)
 
     if parse_json:
-        for col in ['data_json', 'reason_json', 'tags_json']:
-            if col in df.columns:
-                df[col.replace('_json', '')] = df[col].apply(
-                    lambda x: json.loads(x) if pd.notna(x) and x else ({} if col != 'tags_json' else [])
-                )
+        _parse_json_columns(df)
 
     return df.to_dict('records')
 
@@ -285,106 +763,124 @@ def compact_price_events() -> Dict[str, int]:
         Dict with count of events removed per day
     """
     with csv_lock('w'):
-        df = pd.read_csv(CSV_PATH)
-
-        # Parse timestamps
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['date'] = df['timestamp'].dt.date
-
-        # Get only PRICE_UPDATE events
-        price_events = df[df['event_type'] == 'PRICE_UPDATE'].copy()
-
-        if len(price_events) <= 2:
+        # Pass 1: per day, track the earliest and latest PRICE_UPDATE and a count
+        days: Dict[date, list] = {}
+        total = 0
+        with open(CSV_PATH, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return {}
+            id_col = header.index('event_id')
+            ts_col = header.index('timestamp')
+            type_col = header.index('event_type')
+
+            for row in reader:
+                if row[type_col] != 'PRICE_UPDATE':
+                    continue
+                total += 1
+                ts = datetime.fromisoformat(row[ts_col])
+                day = days.get(ts.date())
+                if day is None:
+                    days[ts.date()] = [ts, row[id_col], ts, row[id_col], 1]
+                    continue
+                if ts < day[0]:
+                    day[0], day[1] = ts, row[id_col]
+                if ts >= day[2]:
+                    day[2], day[3] = ts, row[id_col]
+                day[4] += 1
+
+        if total <= 2:
             return {}  # Nothing to compact
 
+        # Keep first and last of each day, drop the middle ones
         removed_counts = {}
-        events_to_remove = []
-
-        # Group by date
-        for date_val, group in price_events.groupby('date'):
-            if len(group) <= 2:
+        keep_ids = set()
+        crowded_days = set()
+        for date_val, (_, first_id, _, last_id, count) in days.items():
+            if count <= 2:
                 continue  # Keep all if only 1 or 2 events
+            keep_ids.update((first_id, last_id))
+            crowded_days.add(date_val)
+            removed_counts[str(date_val)] = count - 2
 
-            # Sort by timestamp within the day
-            group_sorted = group.sort_values('timestamp')
-
-            # Keep first and last, mark middle ones for removal
-            middle_events = group_sorted.iloc[1:-1]
-            events_to_remove.extend(middle_events['event_id'].tolist())
-            removed_counts[str(date_val)] = len(middle_events)
-
-        if not events_to_remove:
+        if not removed_counts:
             return {}
 
-        # Remove the middle events
-        df = df[~df['event_id'].isin(events_to_remove)]
+        # Pass 2: stream-copy the log, skipping the middle events
+        def drop_middle(row):
+            if (row['event_type'] == 'PRICE_UPDATE'
+                    and row['event_id'] not in keep_ids
+                    and datetime.fromisoformat(row['timestamp']).date() in crowded_days):
+                return None
+            return row
 
-        # Drop helper column and save
-        df = df.drop('date', axis=1)
-        df.to_csv(CSV_PATH, index=False)
+        _rewrite_rows(drop_middle)
+        _invalidate_cache()
 
     return removed_counts
 
 
 # Helper functions for backward compatibility with existing code
 
-def calculate_cash_delta(event_type: str, data: dict) -> Tuple[bool, float]:
-    """
-    Calculate cash_delta from event type and data.
-    Returns (affects_cash, cash_delta).
+def _buy_sell_delta(data: dict) -> Tuple[bool, float]:
+    """BUY costs money, SELL brings it in (TRADE and OPTION_ASSIGN)."""
+    action = data.get('action', '').upper()
+    total = float(data.get('total', 0))
+    if action == 'BUY':
+        return True, -total
+    elif action == 'SELL':
+        return True, total
+    return False, 0
 
-    This is a helper function for automatic cash delta calculation.
-    """
-    if event_type == 'TRADE':
-        action = data.get('action', '').upper()
-        total = float(data.get('total', 0))
-        if action == 'BUY':
-            return True, -total  # Buying costs money
-        elif action == 'SELL':
-            return True, total   # Selling gives money
-        return False, 0
 
-    elif event_type == 'OPTION_OPEN':
-        # For SELL: receive premium (positive), for BUY: pay premium (negative)
-        action = data.get('action', 'SELL').upper()
-        premium = float(data.get('total_premium', data.get('premium', 0)))
-        if action == 'SELL':
-            return True, premium
-        else:  # BUY
-            return True, -premium
-
-    elif event_type == 'OPTION_CLOSE':
-        # Buying back option costs money
-        close_cost = float(data.get('close_cost', 0))
-        return True, -close_cost
-
-    elif event_type == 'OPTION_EXPIRE':
-        # No cash impact - premium already collected at open
-        return False, 0
+def _option_open_delta(data: dict) -> Tuple[bool, float]:
+    """For SELL: receive premium (positive), for BUY: pay premium (negative)."""
+    action = data.get('action', 'SELL').upper()
+    premium = float(data.get('total_premium', data.get('premium', 0)))
+    if action == 'SELL':
+        return True, premium
+    return True, -premium
 
-    elif event_type == 'OPTION_ASSIGN':
-        # Assignment: depends on put/call and action
-        action = data.get('action', '').upper()
-        total = float(data.get('total', 0))
-        if action == 'BUY':
-            return True, -total
-        elif action == 'SELL':
-            return True, total
-        return False, 0
 
-    elif event_type == 'DEPOSIT':
-        amount = float(data.get('amount', 0))
-        return True, amount
+def _option_close_delta(data: dict) -> Tuple[bool, float]:
+    """Buying back option costs money."""
+    return True, -float(data.get('close_cost', 0))
+
+
+def _inflow_delta(data: dict) -> Tuple[bool, float]:
+    return True, float(data.get('amount', 0))
+
+
+def _outflow_delta(data: dict) -> Tuple[bool, float]:
+    return True, -float(data.get('amount', 0))
+
 
-    elif event_type == 'WITHDRAWAL':
-        amount = float(data.get('amount', 0))
-        return True, -amount
+_CASH_DELTA_HANDLERS = {
+    'TRADE': _buy_sell_delta,
+    'OPTION_OPEN': _option_open_delta,
+    'OPTION_CLOSE': _option_close_delta,
+    'OPTION_ASSIGN': _buy_sell_delta,
+    'DEPOSIT': _inflow_delta,
+    'WITHDRAWAL': _outflow_delta,
+    'DIVIDEND': _inflow_delta,
+}
 
-    elif event_type == 'DIVIDEND':
-        amount = float(data.get('amount', 0))
-        return True, amount
+# Event types with no cash impact. OPTION_EXPIRE: premium already collected at open.
+_NO_CASH_EVENT_TYPES = frozenset({
+    'OPTION_EXPIRE', 'PRICE_UPDATE', 'NOTE', 'GOAL_UPDATE', 'STRATEGY_UPDATE', 'INSIGHT_LOG', 'ADJUSTMENT'
+})
 
-    elif event_type in ['PRICE_UPDATE', 'NOTE', 'GOAL_UPDATE', 'STRATEGY_UPDATE', 'INSIGHT_LOG', 'ADJUSTMENT']:
+
+def calculate_cash_delta(event_type: str, data: dict) -> Tuple[bool, float]:
+    """
+    Calculate cash_delta from event type and data.
+    Returns (affects_cash, cash_delta).
+
+    This is a helper function for automatic cash delta calculation.
+    """
+    if event_type in _NO_CASH_EVENT_TYPES:
         return False, 0
 
-    return False, 0
+    handler = _CASH_DELTA_HANDLERS.get(event_type)
+    return handler(data) if handler else (False, 0)
@@ -23,20 +23,71 @@ Key Features:
    - Macro event simulation
 """
 
+import copy
+import csv
+import fcntl
 import json
+import os
 import uuid
 import shutil
 import re
-import math
 import hashlib
 import asyncio
-import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache, reduce
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import yfinance as yf
 
+from core.data import log_signature, read_event_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pacsv
+    HISTORY_PARQUET = True
+except ImportError:
+    pa = None
+    HISTORY_PARQUET = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj, indent: bool = False) -> str:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib have a go
+            return json.dumps(obj, default=str, indent=2 if indent else None)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj, indent: bool = False) -> str:
+        return json.dumps(obj, default=str, indent=2 if indent else None)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Without numba, "compiled" kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # =============================================================================
 # Storage Configuration
 # =============================================================================
@@ -47,10 +98,46 @@ ALT_HISTORIES_DIR = DATA_DIR / "alt_histories"
 ALT_HISTORIES_INDEX = ALT_HISTORIES_DIR / "index.json"
 ALT_REALITIES_FILE = DATA_DIR / "alternate_realities.json"
 PROJECTIONS_DIR = DATA_DIR / "projections"
+PRICE_CACHE_DIR = DATA_DIR / "price_cache"
+
+# How long a cached price range that runs up to today stays fresh
+PRICE_CACHE_TTL = timedelta(hours=1)
+
+# Portfolios per batched projection prompt; past ~5 the answers get long
+# enough that quality drops and one bad parse costs too much work
+PROJECTION_BATCH_SIZE = 5
+# Concurrent LLM requests when generating projections in bulk
+PROJECTION_MAX_WORKERS = 5
+
+# Random source for projection noise
+_rng = np.random.default_rng()
+
+# Chain-of-thought blocks some models emit before their JSON answer
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _decode_json_object(text: str) -> Optional[dict]:
+    """Decode the first JSON object in text, ignoring any prose around it.
+
+    Returns None when text has no '{'; raises json.JSONDecodeError when the
+    object there is malformed.
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    result, _ = _JSON_DECODER.raw_decode(text, start)
+    return result
 
 
+@lru_cache(maxsize=1)
 def ensure_storage():
-    """Ensure storage directories exist."""
+    """Ensure storage directories exist.
+
+    Runs once per process; call ensure_storage.cache_clear() if the storage
+    directories are removed at runtime.
+    """
     ALT_HISTORIES_DIR.mkdir(parents=True, exist_ok=True)
     PROJECTIONS_DIR.mkdir(parents=True, exist_ok=True)
     if not ALT_HISTORIES_INDEX.exists():
@@ -62,18 +149,37 @@ def ensure_storage():
 # Part 1: Alternate History Management (from alt_history.py)
 # =============================================================================
 
+def _file_key(path: Path) -> tuple:
+    """Cache key for a file's current contents: (path, mtime_ns, size)."""
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=1)
+def _read_index(key: tuple) -> dict:
+    """Parse the index file identified by a _file_key(). Treat as read-only."""
+    with open(key[0], 'rb') as f:
+        return _loads(f.read())
+
+
 def load_index() -> dict:
-    """Load the alternate histories index."""
+    """Load the alternate histories index.
+
+    The parsed file is cached until it changes on disk; callers get their
+    own copy and may modify it before passing it to save_index().
+    """
     ensure_storage()
-    with open(ALT_HISTORIES_INDEX) as f:
-        return json.load(f)
+    return copy.deepcopy(_read_index(_file_key(ALT_HISTORIES_INDEX)))
 
 
 def save_index(index: dict):
     """Save the alternate histories index."""
     ensure_storage()
     with open(ALT_HISTORIES_INDEX, 'w') as f:
-        json.dump(index, f, indent=2, default=str)
+        f.write(_dumps(index, indent=True))
+    # mtime may not tick between two quick writes
+    _read_index.cache_clear()
+    _index_by_id.cache_clear()
 
 
 def list_histories() -> list:
@@ -82,30 +188,96 @@ def list_histories() -> list:
     return index.get("histories", [])
 
 
+@lru_cache(maxsize=1)
+def _index_by_id(key: tuple) -> dict:
+    """Map history id to its index entry for the index file at key."""
+    histories = _read_index(key).get("histories", [])
+    # Keep the first entry per id, as the old linear scan did
+    return {h["id"]: h for h in reversed(histories)}
+
+
 def get_history(history_id: str) -> Optional[dict]:
     """Get a specific alternate history metadata."""
-    histories = list_histories()
-    for h in histories:
-        if h["id"] == history_id:
-            return h
-    return None
+    ensure_storage()
+    h = _index_by_id(_file_key(ALT_HISTORIES_INDEX)).get(history_id)
+    return copy.deepcopy(h) if h is not None else None
+
+
+def _history_event_file(history_id: str) -> Path:
+    """Event log of a history: Parquet for seeded realities, CSV otherwise."""
+    parquet_file = ALT_HISTORIES_DIR / f"{history_id}.parquet"
+    if parquet_file.exists():
+        return parquet_file
+    return ALT_HISTORIES_DIR / f"{history_id}.csv"
+
+
+def _read_event_file(path: Path) -> pd.DataFrame:
+    """Read a history event log in either storage format."""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _write_event_file(df: pd.DataFrame, path: Path):
+    """Write a history event log in the format its file name says.
+
+    CSVs go through pyarrow's multi-threaded writer when available. It
+    quotes every string cell and writes bools as true/false, which both
+    pandas and pyarrow read back the same.
+    """
+    if path.suffix == '.parquet':
+        df.to_parquet(path, index=False, compression='zstd')
+        return
+
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass  # mixed-type object column; let pandas handle it
+        else:
+            pacsv.write_csv(table, path)
+            return
+    df.to_csv(path, index=False)
+
+
+@lru_cache(maxsize=16)
+def _read_history_events(key: tuple) -> pd.DataFrame:
+    """Parse the event file identified by a _file_key(). Treat as read-only."""
+    path = key[0]
+    df = pd.read_parquet(path) if path.suffix == '.parquet' else read_event_csv(path)
+    df['data'] = [_loads(x) if isinstance(x, str) and x else {} for x in df['data_json'].values]
+    df = df.drop('data_json', axis=1)
+    # Logs mix 'YYYY-MM-DD HH:MM:SS' and isoformat() timestamps
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+    return df.sort_values('timestamp')
 
 
 def get_history_events(history_id: str) -> Optional[pd.DataFrame]:
-    """Load the event log for an alternate history."""
+    """Load the event log for an alternate history.
+
+    Parsed logs are cached until the file changes on disk. The returned
+    frame is a copy, but its `data` dicts are shared with the cache and
+    should be treated as read-only.
+    """
     history = get_history(history_id)
     if not history:
         return None
 
-    event_file = ALT_HISTORIES_DIR / f"{history_id}.csv"
+    event_file = _history_event_file(history_id)
     if not event_file.exists():
         return None
 
-    df = pd.read_csv(event_file)
-    df['data'] = df['data_json'].apply(json.loads)
-    df = df.drop('data_json', axis=1)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df.sort_values('timestamp')
+    return _read_history_events(_file_key(event_file)).copy()
+
+
+def _count_csv_rows(path: Path) -> int:
+    """Count the data rows in a CSV without building a DataFrame.
+
+    Uses the csv module rather than a raw newline count so that quoted
+    fields containing newlines (e.g. multi-line notes) are counted once.
+    """
+    with open(path, newline='') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
 
 
 def create_history(name: str, description: str = "", modifications: list = None, use_llm: bool = True) -> dict:
@@ -127,7 +299,8 @@ def create_history(name: str, description: str = "", modifications: list = None,
     # Copy the real event log as base
     real_events = DATA_DIR / "event_log_enhanced.csv"
     alt_events = ALT_HISTORIES_DIR / f"{history_id}.csv"
-    shutil.copy(real_events, alt_events)
+    # copyfile skips the permission copy and uses sendfile() on Linux
+    shutil.copyfile(real_events, alt_events)
 
     # If description provided but no modifications, use LLM to generate them
     llm_generated = False
@@ -151,7 +324,7 @@ def create_history(name: str, description: str = "", modifications: list = None,
         "created_at": datetime.now().isoformat(),
         "modified_at": datetime.now().isoformat(),
         "modifications": modifications or [],
-        "event_count": len(pd.read_csv(alt_events)),
+        "event_count": _count_csv_rows(alt_events),
         "llm_generated": llm_generated,
         "llm_analysis": llm_analysis,
         "status": "ready"
@@ -184,9 +357,7 @@ def generate_modifications_from_description(description: str, history_id: str) -
             return None
 
         # Load current holdings to understand the portfolio
-        from reconstruct_state import load_event_log, reconstruct_state
-        events = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
-        state = reconstruct_state(events)
+        state = get_reality_state()
 
         holdings_summary = "\n".join([
             f"- {ticker}: {shares:.0f} shares"
@@ -233,14 +404,11 @@ If the scenario is about market conditions (bull/bear) rather than specific trad
         # Parse JSON from response - handle <think> tags and other prefixes
         try:
             # Remove <think>...</think> tags if present
-            clean_response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
+            clean_response = _THINK_RE.sub('', response)
 
-            # Find JSON object
-            json_start = clean_response.find('{')
-            json_end = clean_response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                json_str = clean_response[json_start:json_end]
-                result = json.loads(json_str)
+            # Decode the JSON object, stopping at its closing brace
+            result = _decode_json_object(clean_response)
+            if result is not None:
                 return result
         except json.JSONDecodeError as e:
             print(f"LLM response JSON parse failed: {e}")
@@ -256,6 +424,17 @@ If the scenario is about market conditions (bull/bear) rather than specific trad
         return None
 
 
+def _event_ticker(data_json) -> Optional[str]:
+    """Top-level "ticker" of an event's data_json, or None."""
+    if not isinstance(data_json, str):
+        return None
+    try:
+        data = _loads(data_json)
+    except ValueError:
+        return None
+    return data.get('ticker') if isinstance(data, dict) else None
+
+
 def apply_modifications(history_id: str, modifications: list):
     """Apply modification rules to an alternate history.
 
@@ -266,29 +445,53 @@ def apply_modifications(history_id: str, modifications: list):
     - what_if_price: Change price at a point in time
     - what_if_trade: Add/remove a hypothetical trade
     """
-    event_file = ALT_HISTORIES_DIR / f"{history_id}.csv"
-    df = pd.read_csv(event_file)
+    event_file = _history_event_file(history_id)
+    df = _read_event_file(event_file)
+
+    # Consecutive add_trade rows are collected and concatenated in one go
+    new_rows = []
+
+    def flush_new_rows(df: pd.DataFrame) -> pd.DataFrame:
+        if not new_rows:
+            return df
+        df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True)
+        new_rows.clear()
+        return df
+
+    # Ticker of each row, decoded once and shared by ticker-scoped rules
+    tickers = None
 
     for mod in modifications:
         mod_type = mod.get("type")
 
+        if mod_type != "add_trade" and new_rows:
+            # Later rules may target the added trades, so apply them first
+            df = flush_new_rows(df)
+            tickers = None
+
+        if mod_type in ("remove_ticker", "scale_position") and tickers is None:
+            tickers = pd.Series([_event_ticker(s) for s in df['data_json'].values], index=df.index)
+
         if mod_type == "remove_ticker":
             # Remove all events for a ticker
-            ticker = mod.get("ticker")
-            df = df[~df['data_json'].str.contains(f'"ticker": "{ticker}"', na=False)]
+            keep = tickers != mod.get("ticker")
+            df = df[keep]
+            tickers = tickers[keep]
 
         elif mod_type == "remove_event":
             # Remove specific event by ID
-            event_id = mod.get("event_id")
-            df = df[df['event_id'] != event_id]
+            keep = df['event_id'] != mod.get("event_id")
+            df = df[keep]
+            if tickers is not None:
+                tickers = tickers[keep]
 
         elif mod_type == "add_trade":
             # Add a hypothetical trade
             new_event = {
-                "event_id": df['event_id'].max() + 1,
+                "event_id": (new_rows[-1]["event_id"] if new_rows else df['event_id'].max()) + 1,
                 "timestamp": mod.get("timestamp", datetime.now().isoformat()),
                 "event_type": "TRADE",
-                "data_json": json.dumps({
+                "data_json": _dumps({
                     "action": mod.get("action", "BUY"),
                     "ticker": mod.get("ticker"),
                     "shares": mod.get("shares"),
@@ -296,53 +499,56 @@ def apply_modifications(history_id: str, modifications: list):
                     "total": mod.get("shares", 0) * mod.get("price", 0),
                     "source": "ALTERNATE_REALITY"
                 }),
-                "reason_json": json.dumps({"primary": "WHAT_IF_SCENARIO"}),
+                "reason_json": _dumps({"primary": "WHAT_IF_SCENARIO"}),
                 "notes": mod.get("notes", "Alternate reality trade"),
                 "tags_json": '["alternate", "what-if"]',
                 "affects_cash": True,
                 "cash_delta": -mod.get("shares", 0) * mod.get("price", 0) if mod.get("action") == "BUY" else mod.get("shares", 0) * mod.get("price", 0)
             }
-            df = pd.concat([df, pd.DataFrame([new_event])], ignore_index=True)
+            new_rows.append(new_event)
 
         elif mod_type == "change_trade_price":
             # What if I bought at a different price?
             event_id = mod.get("event_id")
             new_price = mod.get("price")
 
-            idx = df[df['event_id'] == event_id].index
+            idx = df.index[(df['event_id'] == event_id).to_numpy()]
             if len(idx) > 0:
-                row = df.loc[idx[0]]
-                data = json.loads(row['data_json'])
-                old_total = data.get('total', 0)
+                data = _loads(df.at[idx[0], 'data_json'])
                 data['price'] = new_price
                 data['total'] = data.get('shares', 0) * new_price
-                df.loc[idx[0], 'data_json'] = json.dumps(data)
+                df.at[idx[0], 'data_json'] = _dumps(data)
                 # Update cash delta
                 if data.get('action') == 'BUY':
-                    df.loc[idx[0], 'cash_delta'] = -data['total']
+                    df.at[idx[0], 'cash_delta'] = -data['total']
                 else:
-                    df.loc[idx[0], 'cash_delta'] = data['total']
+                    df.at[idx[0], 'cash_delta'] = data['total']
 
         elif mod_type == "scale_position":
             # What if I bought more/less shares?
             ticker = mod.get("ticker")
             scale = mod.get("scale", 1.0)  # 2.0 = double, 0.5 = half
 
-            for idx, row in df.iterrows():
-                if f'"ticker": "{ticker}"' in row['data_json']:
-                    data = json.loads(row['data_json'])
-                    if 'shares' in data:
-                        data['shares'] = data['shares'] * scale
-                        data['total'] = data.get('total', 0) * scale
-                        df.loc[idx, 'data_json'] = json.dumps(data)
-                        df.loc[idx, 'cash_delta'] = row['cash_delta'] * scale
+            mask = tickers == ticker
+            scaled = {
+                idx: {**data, 'shares': data['shares'] * scale, 'total': data.get('total', 0) * scale}
+                for idx, data in zip(df.index[mask], map(_loads, df.loc[mask, 'data_json']))
+                if 'shares' in data
+            }
+            if scaled:
+                rows = list(scaled)
+                df.loc[rows, 'data_json'] = [_dumps(data) for data in scaled.values()]
+                df.loc[rows, 'cash_delta'] = df.loc[rows, 'cash_delta'].to_numpy() * scale
+
+    df = flush_new_rows(df)
 
     # Re-sort and re-index
     df = df.sort_values('timestamp')
-    df['event_id'] = range(1, len(df) + 1)
+    df['event_id'] = np.arange(1, len(df) + 1, dtype=np.int64)
 
     # Save
-    df.to_csv(event_file, index=False)
+    _write_event_file(df, event_file)
+    _read_history_events.cache_clear()
 
 
 def update_history(history_id: str, updates: dict) -> Optional[dict]:
@@ -369,13 +575,54 @@ def delete_history(history_id: str) -> bool:
     save_index(index)
 
     # Delete event file
-    event_file = ALT_HISTORIES_DIR / f"{history_id}.csv"
-    if event_file.exists():
-        event_file.unlink()
+    for suffix in ('.csv', '.parquet'):
+        event_file = ALT_HISTORIES_DIR / f"{history_id}{suffix}"
+        if event_file.exists():
+            event_file.unlink()
 
     return True
 
 
+@lru_cache(maxsize=2)
+def _reality_events_and_state(signature: str, today: str) -> tuple:
+    """Parse and replay the real event log for a given log signature and day.
+
+    The day is part of the key because YTD figures depend on it. Treat
+    the result as read-only; use _reality_snapshot() for a copy.
+    """
+    from reconstruct_state import reconstruct_state, load_event_log
+    events = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
+    return events, reconstruct_state(events)
+
+
+def _reality_snapshot() -> tuple:
+    """Real event log and its reconstructed state, cached until the log changes."""
+    signature = log_signature(DATA_DIR / "event_log_enhanced.csv")
+    events, state = _reality_events_and_state(signature, datetime.now().date().isoformat())
+    return events.copy(), copy.deepcopy(state)
+
+
+def get_reality_state() -> dict:
+    """Reconstructed state of the real event log, cached until the log changes.
+
+    The caller gets its own copy and may modify it.
+    """
+    signature = log_signature(DATA_DIR / "event_log_enhanced.csv")
+    _, state = _reality_events_and_state(signature, datetime.now().date().isoformat())
+    return copy.deepcopy(state)
+
+
+def get_reality_prices() -> dict:
+    """Latest known price per ticker in the real event log.
+
+    Shares the cached replay behind get_reality_state() but copies only the
+    price map, not the whole state.
+    """
+    signature = log_signature(DATA_DIR / "event_log_enhanced.csv")
+    _, state = _reality_events_and_state(signature, datetime.now().date().isoformat())
+    return dict(state.get('latest_prices') or {})
+
+
 def compare_histories(history_id_1: str, history_id_2: str = "reality", include_projections: bool = True) -> dict:
     """Compare two histories (or one against reality).
 
@@ -390,11 +637,12 @@ def compare_histories(history_id_1: str, history_id_2: str = "reality", include_
     """
     import sys
     sys.path.insert(0, str(SCRIPT_DIR))
-    from reconstruct_state import reconstruct_state, load_event_log
+    from reconstruct_state import reconstruct_state
 
     # Load first history
+    state1 = state2 = None
     if history_id_1 == "reality":
-        events1 = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
+        events1, state1 = _reality_snapshot()
         name1 = "Reality"
         desc1 = "Actual portfolio history"
     else:
@@ -405,7 +653,7 @@ def compare_histories(history_id_1: str, history_id_2: str = "reality", include_
 
     # Load second history
     if history_id_2 == "reality":
-        events2 = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
+        events2, state2 = _reality_snapshot()
         name2 = "Reality"
         desc2 = "Actual portfolio history"
     else:
@@ -417,9 +665,11 @@ def compare_histories(history_id_1: str, history_id_2: str = "reality", include_
     if events1 is None or events2 is None:
         return {"error": "History not found"}
 
-    # Reconstruct states
-    state1 = reconstruct_state(events1)
-    state2 = reconstruct_state(events2)
+    # Reconstruct states (reality's comes from the cache)
+    if state1 is None:
+        state1 = reconstruct_state(events1)
+    if state2 is None:
+        state2 = reconstruct_state(events2)
 
     # Calculate current holdings differences
     holdings_diff = {}
@@ -486,9 +736,12 @@ def compare_histories(history_id_1: str, history_id_2: str = "reality", include_
 
     # Generate and compare future projections
     if include_projections:
-        # Generate projections for both histories (use statistical for speed)
-        proj1 = generate_projection(history_id_1, years=3, use_llm=False)
-        proj2 = generate_projection(history_id_2, years=3, use_llm=False)
+        # Generate projections for both histories (use statistical for speed).
+        # The two runs are independent, so overlap their price lookups.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(generate_projection, history_id_1, years=3, use_llm=False)
+            future2 = executor.submit(generate_projection, history_id_2, years=3, use_llm=False)
+            proj1, proj2 = future1.result(), future2.result()
 
         if "error" not in proj1 and "error" not in proj2:
             # Extract key projection data
@@ -536,6 +789,37 @@ def compare_histories(history_id_1: str, history_id_2: str = "reality", include_
     return result
 
 
+def _events_by_id(events: pd.DataFrame) -> Dict[int, tuple]:
+    """Map event_id -> (timestamp, event_type, data) using the first row per id.
+
+    data is left as stored: parsed dicts from the `data` column, or raw
+    JSON strings from `data_json` when the frame has not been parsed.
+    """
+    if 'event_id' not in events.columns:
+        return {}
+
+    firsts = events.drop_duplicates('event_id')
+    n = len(firsts)
+    data_col = 'data' if 'data' in firsts.columns else 'data_json'
+    columns = [
+        firsts[col].tolist() if col in firsts.columns else [default] * n
+        for col, default in (('timestamp', ''), ('event_type', ''), (data_col, {}))
+    ]
+    return dict(zip(firsts['event_id'].tolist(), zip(*columns)))
+
+
+def _as_dict(data) -> dict:
+    """Event data as a dict, parsing JSON strings; anything unparseable becomes {}."""
+    if isinstance(data, dict):
+        return data
+    if isinstance(data, str):
+        try:
+            return _loads(data)
+        except ValueError:
+            pass
+    return {}
+
+
 def find_divergence_points(events1: pd.DataFrame, events2: pd.DataFrame) -> list:
     """Find events that differ between two histories.
 
@@ -543,86 +827,51 @@ def find_divergence_points(events1: pd.DataFrame, events2: pd.DataFrame) -> list
     """
     divergences = []
 
-    # Get event IDs from both
-    ids1 = set(events1['event_id'].tolist()) if 'event_id' in events1.columns else set()
-    ids2 = set(events2['event_id'].tolist()) if 'event_id' in events2.columns else set()
+    # Index both histories by event ID once instead of scanning per ID
+    by_id1 = _events_by_id(events1)
+    by_id2 = _events_by_id(events2)
 
     # Events only in history 1
-    only_in_1 = ids1 - ids2
+    only_in_1 = by_id1.keys() - by_id2.keys()
     # Events only in history 2
-    only_in_2 = ids2 - ids1
-
-    # Process events only in history 1 (removed in history 2)
-    for event_id in sorted(only_in_1):
-        event_row = events1[events1['event_id'] == event_id]
-        if len(event_row) > 0:
-            row = event_row.iloc[0]
-            data = row.get('data', {}) if 'data' in row else {}
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except:
-                    data = {}
-
+    only_in_2 = by_id2.keys() - by_id1.keys()
+
+    # Process events only in history 1 (removed in history 2), then only in
+    # history 2 (added in history 2)
+    for only_in, by_id, label in ((only_in_1, by_id1, "history_1_only"), (only_in_2, by_id2, "history_2_only")):
+        for event_id in sorted(only_in):
+            timestamp, event_type, data = by_id[event_id]
+            data = _as_dict(data)
             divergences.append({
                 "event_id": event_id,
-                "timestamp": str(row.get('timestamp', '')),
-                "type": row.get('event_type', ''),
-                "in_history": "history_1_only",
-                "description": f"Event #{event_id}: {row.get('event_type', '')} - {data.get('ticker', data.get('action', ''))}",
-                "data": data
-            })
-
-    # Process events only in history 2 (added in history 2)
-    for event_id in sorted(only_in_2):
-        event_row = events2[events2['event_id'] == event_id]
-        if len(event_row) > 0:
-            row = event_row.iloc[0]
-            data = row.get('data', {}) if 'data' in row else {}
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except:
-                    data = {}
-
-            divergences.append({
-                "event_id": event_id,
-                "timestamp": str(row.get('timestamp', '')),
-                "type": row.get('event_type', ''),
-                "in_history": "history_2_only",
-                "description": f"Event #{event_id}: {row.get('event_type', '')} - {data.get('ticker', data.get('action', ''))}",
+                "timestamp": str(timestamp),
+                "type": event_type,
+                "in_history": label,
+                "description": f"Event #{event_id}: {event_type} - {data.get('ticker', data.get('action', ''))}",
                 "data": data
             })
 
     # Check for events with same ID but different data
-    common_ids = ids1 & ids2
+    common_ids = by_id1.keys() & by_id2.keys()
     for event_id in sorted(common_ids):
-        row1 = events1[events1['event_id'] == event_id].iloc[0]
-        row2 = events2[events2['event_id'] == event_id].iloc[0]
-
-        # Compare data_json if it exists
-        data1 = row1.get('data', {})
-        data2 = row2.get('data', {})
+        timestamp, event_type, raw1 = by_id1[event_id]
+        raw2 = by_id2[event_id][2]
 
-        if isinstance(data1, str):
-            try:
-                data1 = json.loads(data1)
-            except:
-                data1 = {}
-        if isinstance(data2, str):
-            try:
-                data2 = json.loads(data2)
-            except:
-                data2 = {}
+        # Unchanged events are usually the same object or the same JSON
+        # string; only parse when that cheap check fails
+        if raw1 is raw2 or raw1 == raw2:
+            continue
+        data1 = _as_dict(raw1)
+        data2 = _as_dict(raw2)
 
         # Check for differences
         if data1 != data2:
             divergences.append({
                 "event_id": event_id,
-                "timestamp": str(row1.get('timestamp', '')),
-                "type": row1.get('event_type', ''),
+                "timestamp": str(timestamp),
+                "type": event_type,
                 "in_history": "modified",
-                "description": f"Event #{event_id} modified: {row1.get('event_type', '')}",
+                "description": f"Event #{event_id} modified: {event_type}",
                 "data_1": data1,
                 "data_2": data2,
                 "changes": {k: {"from": data1.get(k), "to": data2.get(k)}
@@ -667,30 +916,32 @@ def create_seeded_reality(
     ensure_storage()
     history_id = str(uuid.uuid4())[:8]
 
-    # Fetch historical prices for all tickers
+    # Fetch historical prices for all tickers (network-bound, so in parallel)
     end_date = datetime.now().strftime('%Y-%m-%d')
     price_data = {}
+    date_indexes = []
 
-    for ticker in tickers:
+    def fetch(ticker):
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
-            if not hist.empty:
-                price_data[ticker] = {
-                    date.strftime('%Y-%m-%d'): row['Close']
-                    for date, row in hist.iterrows()
-                }
+            return ticker, yf.Ticker(ticker).history(start=start_date, end=end_date)
         except Exception as e:
             print(f"Error fetching {ticker}: {e}")
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=min(16, len(tickers)) or 1) as executor:
+        for ticker, hist in executor.map(fetch, tickers):
+            if hist is not None and not hist.empty:
+                # Format per ticker so each date stays in its exchange's timezone
+                dates = hist.index.strftime('%Y-%m-%d')
+                date_indexes.append(dates)
+                price_data[ticker] = dict(zip(dates.tolist(), hist['Close'].to_numpy().tolist()))
 
     if not price_data:
         return {"error": "Could not fetch historical prices for any ticker"}
 
     # Get all trading dates
-    all_dates = set()
-    for ticker_prices in price_data.values():
-        all_dates.update(ticker_prices.keys())
-    sorted_dates = sorted(all_dates)
+    all_dates = reduce(lambda a, b: a.union(b), date_indexes).unique()
+    sorted_dates = all_dates.sort_values().tolist()
 
     if not sorted_dates:
         return {"error": "No price data available"}
@@ -707,65 +958,48 @@ def create_seeded_reality(
             scenario_type, trading_style
         )
 
-    # Build event log
-    events = []
-    event_id = 1
+    # Build event log column by column: the initial deposit, then one row per trade
+    totals = [trade['shares'] * trade['price'] for trade in trades]
+    event_count = len(trades) + 1
 
-    # Initial deposit
-    events.append({
-        "event_id": event_id,
-        "timestamp": f"{sorted_dates[0]} 09:30:00",
-        "event_type": "DEPOSIT",
-        "data_json": json.dumps({
+    columns = {
+        "event_id": range(1, event_count + 1),
+        "timestamp": [f"{sorted_dates[0]} 09:30:00"] + [f"{trade['date']} 10:00:00" for trade in trades],
+        "event_type": ["DEPOSIT"] + ["TRADE"] * len(trades),
+        "data_json": [_dumps({
             "amount": starting_cash,
             "source": f"Alternate Reality: {name}"
-        }),
-        "reason_json": json.dumps({"primary": "ALTERNATE_REALITY_SEED"}),
-        "notes": f"Initial deposit for {name}",
-        "tags_json": '["alternate", "deposit"]',
-        "affects_cash": True,
-        "cash_delta": starting_cash
-    })
-    event_id += 1
-
-    # Add trades
-    for trade in trades:
-        action = trade['action']
-        total = trade['shares'] * trade['price']
-        cash_delta = total if action == 'SELL' else -total
-
-        events.append({
-            "event_id": event_id,
-            "timestamp": f"{trade['date']} 10:00:00",
-            "event_type": "TRADE",
-            "data_json": json.dumps({
-                "action": action,
-                "ticker": trade['ticker'],
-                "shares": trade['shares'],
-                "price": round(trade['price'], 2),
-                "total": round(total, 2),
-                "reason": trade.get('reason', ''),
-                "source": "ALTERNATE_REALITY"
-            }),
-            "reason_json": json.dumps({
-                "primary": trade.get('reason_code', 'WHAT_IF_TRADE'),
-                "explanation": trade.get('reason', '')
-            }),
-            "notes": trade.get('reason', f"{action} {trade['ticker']}"),
-            "tags_json": '["alternate", "trade"]',
-            "affects_cash": True,
-            "cash_delta": cash_delta
-        })
-        event_id += 1
+        })] + [_dumps({
+            "action": trade['action'],
+            "ticker": trade['ticker'],
+            "shares": trade['shares'],
+            "price": round(trade['price'], 2),
+            "total": round(total, 2),
+            "reason": trade.get('reason', ''),
+            "source": "ALTERNATE_REALITY"
+        }) for trade, total in zip(trades, totals)],
+        "reason_json": [_dumps({"primary": "ALTERNATE_REALITY_SEED"})] + [_dumps({
+            "primary": trade.get('reason_code', 'WHAT_IF_TRADE'),
+            "explanation": trade.get('reason', '')
+        }) for trade in trades],
+        "notes": [f"Initial deposit for {name}"] + [
+            trade.get('reason', f"{trade['action']} {trade['ticker']}") for trade in trades
+        ],
+        "tags_json": ['["alternate", "deposit"]'] + ['["alternate", "trade"]'] * len(trades),
+        "affects_cash": [True] * event_count,
+        "cash_delta": [starting_cash] + [
+            total if trade['action'] == 'SELL' else -total for trade, total in zip(trades, totals)
+        ],
+    }
 
-    # Save event log
-    df = pd.DataFrame(events)
-    event_file = ALT_HISTORIES_DIR / f"{history_id}.csv"
-    df.to_csv(event_file, index=False)
+    # Save event log (Parquet keeps it typed and compressed when pyarrow is available)
+    df = pd.DataFrame(columns)
+    event_file = ALT_HISTORIES_DIR / f"{history_id}.{'parquet' if HISTORY_PARQUET else 'csv'}"
+    _write_event_file(df, event_file)
 
     # Calculate final stats
     from reconstruct_state import reconstruct_state
-    df['data'] = df['data_json'].apply(json.loads)
+    df['data'] = df['data_json'].apply(_loads)
     final_state = reconstruct_state(df)
 
     # Create metadata
@@ -783,7 +1017,7 @@ def create_seeded_reality(
             "trading_style": trading_style
         },
         "trade_count": len(trades),
-        "event_count": len(events),
+        "event_count": event_count,
         "final_state": {
             "total_value": final_state.get('total_value', 0),
             "cash": final_state.get('cash', 0),
@@ -808,6 +1042,97 @@ def create_seeded_reality(
     return history
 
 
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the `window` values before each position (NaN until there are enough)."""
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    means = np.full(len(values), np.nan)
+    means[window:] = (csum[window:-1] - csum[:-window - 1]) / window
+    return means
+
+
+def _trailing_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Minimum of the `window` values before each position (NaN until there are enough)."""
+    lows = np.full(len(values), np.nan)
+    lows[window:] = sliding_window_view(values, window)[:-1].min(axis=1)
+    return lows
+
+
+def _ticker_series(price_data: dict, sorted_dates: list, tickers: list) -> dict:
+    """Each ticker's trading dates along sorted_dates with their closes.
+
+    Maps ticker -> (dates, closes as a list, closes as a float64 array);
+    tickers without price data are left out.
+    """
+    series = {}
+    date_set = set(sorted_dates)
+    for ticker in tickers:
+        if ticker not in price_data:
+            continue
+        # Walk the ticker's own dates (already in order when they come from
+        # yfinance, so sorting is a single pass) rather than every date
+        ticker_prices = price_data[ticker]
+        dates, closes = [], []
+        for d in sorted(ticker_prices):
+            price = ticker_prices[d]
+            if price and d in date_set:
+                dates.append(d)
+                closes.append(price)
+        series[ticker] = (dates, closes, np.array(closes, dtype=np.float64))
+    return series
+
+
+@njit(cache=True)
+def _swing_simulate(prices, buy_signals, below_ma20, cash, holdings, cost_basis,
+                    position_pct, profit_target, stop_loss):
+    """Run the swing strategy's buy/sell state machine over one ticker.
+
+    Returns (bar index, shares, signed action: 1 buy / -1 sell, gain at sell)
+    arrays for the trades made, plus the cash, holdings and cost basis after
+    the last bar.
+    """
+    n = len(prices)
+    trade_bars = np.empty(n, np.int64)
+    trade_shares = np.empty(n, np.int64)
+    trade_actions = np.empty(n, np.int64)
+    trade_gains = np.empty(n, np.float64)
+    count = 0
+
+    for i in range(20, n):
+        price = prices[i]
+
+        # Buy signal: price crosses above MA20, short MA above long MA
+        if holdings == 0 and buy_signals[i] and cash > 1000:
+            amount = cash * position_pct
+            shares = int(amount / price)
+            if shares > 0:
+                trade_bars[count] = i
+                trade_shares[count] = shares
+                trade_actions[count] = 1
+                trade_gains[count] = 0.0
+                count += 1
+                cash -= shares * price
+                holdings += shares
+                cost_basis = shares * price
+
+        # Sell signal: price crosses below MA20 or profit target hit
+        elif holdings > 0:
+            avg_cost = cost_basis / holdings
+            gain_pct = (price - avg_cost) / avg_cost
+
+            if below_ma20[i] or gain_pct >= profit_target or gain_pct <= -stop_loss:
+                trade_bars[count] = i
+                trade_shares[count] = holdings
+                trade_actions[count] = -1
+                trade_gains[count] = gain_pct
+                count += 1
+                cash += holdings * price
+                holdings = 0
+                cost_basis = 0.0
+
+    return (trade_bars[:count], trade_shares[:count], trade_actions[:count],
+            trade_gains[:count], cash, holdings, cost_basis)
+
+
 def generate_algorithmic_trades(
     price_data: dict,
     sorted_dates: list,
@@ -839,6 +1164,9 @@ def generate_algorithmic_trades(
     # Track cost basis for P&L
     cost_basis = {t: 0 for t in tickers}
 
+    # Per-ticker price series for the strategies that walk each ticker's bars
+    ticker_series = _ticker_series(price_data, sorted_dates, tickers) if scenario_type in ("swing", "bull", "bear") else {}
+
     if scenario_type == "dca":
         # Dollar cost averaging - buy regularly
         buy_interval = max(5, len(sorted_dates) // (len(tickers) * 12))  # ~monthly per ticker
@@ -871,58 +1199,53 @@ def generate_algorithmic_trades(
     elif scenario_type == "swing":
         # Swing trading - buy low, sell high based on moving averages
         for ticker in tickers:
-            if ticker not in price_data:
+            if ticker not in ticker_series:
                 continue
 
-            prices = [(d, price_data[ticker].get(d)) for d in sorted_dates if price_data[ticker].get(d)]
-            if len(prices) < 20:
+            dates, closes, price_arr = ticker_series[ticker]
+            if len(dates) < 20:
                 continue
 
-            # Calculate simple moving average
-            for i in range(20, len(prices)):
-                date, price = prices[i]
-                ma20 = sum(p[1] for p in prices[i-20:i]) / 20
-                ma5 = sum(p[1] for p in prices[i-5:i]) / 5
-
-                # Buy signal: price crosses above MA20, short MA above long MA
-                if holdings[ticker] == 0 and price > ma20 and ma5 > ma20 and cash > 1000:
-                    amount = cash * params["position_pct"]
-                    shares = int(amount / price)
-                    if shares > 0:
-                        trades.append({
-                            "date": date,
-                            "ticker": ticker,
-                            "action": "BUY",
-                            "shares": shares,
-                            "price": price,
-                            "reason": f"Swing buy: price {price:.2f} > MA20 {ma20:.2f}",
-                            "reason_code": "SWING_BUY"
-                        })
-                        cash -= shares * price
-                        holdings[ticker] += shares
-                        cost_basis[ticker] = shares * price
-
-                # Sell signal: price crosses below MA20 or profit target hit
-                elif holdings[ticker] > 0:
-                    avg_cost = cost_basis[ticker] / holdings[ticker] if holdings[ticker] > 0 else price
-                    gain_pct = (price - avg_cost) / avg_cost
-
-                    if price < ma20 or gain_pct >= params["profit_target"] or gain_pct <= -params["stop_loss"]:
-                        reason = "profit target" if gain_pct >= params["profit_target"] else (
-                            "stop loss" if gain_pct <= -params["stop_loss"] else "MA crossover"
-                        )
-                        trades.append({
-                            "date": date,
-                            "ticker": ticker,
-                            "action": "SELL",
-                            "shares": holdings[ticker],
-                            "price": price,
-                            "reason": f"Swing sell: {reason} ({gain_pct*100:.1f}%)",
-                            "reason_code": "SWING_SELL"
-                        })
-                        cash += holdings[ticker] * price
-                        holdings[ticker] = 0
-                        cost_basis[ticker] = 0
+            # Simple moving averages over the bars before each one, and the
+            # signals that only depend on prices, computed for all bars at once
+            ma20_arr = _trailing_mean(price_arr, 20)
+            ma5_arr = _trailing_mean(price_arr, 5)
+            buy_signals = (price_arr > ma20_arr) & (ma5_arr > ma20_arr)
+            below_ma20 = price_arr < ma20_arr
+            if not NUMBA_AVAILABLE:
+                # Element access on lists is much cheaper for the interpreter
+                price_arr, buy_signals, below_ma20 = closes, buy_signals.tolist(), below_ma20.tolist()
+
+            bars, shares_traded, actions, gains, cash, holdings[ticker], cost_basis[ticker] = _swing_simulate(
+                price_arr, buy_signals, below_ma20, float(cash), holdings[ticker], float(cost_basis[ticker]),
+                params["position_pct"], params["profit_target"], params["stop_loss"]
+            )
+
+            for i, shares, action, gain_pct in zip(bars.tolist(), shares_traded.tolist(), actions.tolist(), gains.tolist()):
+                date, price = dates[i], closes[i]
+                if action > 0:
+                    trades.append({
+                        "date": date,
+                        "ticker": ticker,
+                        "action": "BUY",
+                        "shares": shares,
+                        "price": price,
+                        "reason": f"Swing buy: price {price:.2f} > MA20 {ma20_arr[i]:.2f}",
+                        "reason_code": "SWING_BUY"
+                    })
+                else:
+                    reason = "profit target" if gain_pct >= params["profit_target"] else (
+                        "stop loss" if gain_pct <= -params["stop_loss"] else "MA crossover"
+                    )
+                    trades.append({
+                        "date": date,
+                        "ticker": ticker,
+                        "action": "SELL",
+                        "shares": shares,
+                        "price": price,
+                        "reason": f"Swing sell: {reason} ({gain_pct*100:.1f}%)",
+                        "reason_code": "SWING_SELL"
+                    })
 
     elif scenario_type in ["bull", "bear"]:
         # Bull: Aggressive buying, patient selling
@@ -931,19 +1254,20 @@ def generate_algorithmic_trades(
         sell_threshold = params["profit_target"] if scenario_type == "bull" else params["profit_target"] * 0.5
 
         for ticker in tickers:
-            if ticker not in price_data:
+            if ticker not in ticker_series:
                 continue
 
-            prices = [(d, price_data[ticker].get(d)) for d in sorted_dates if price_data[ticker].get(d)]
-            if len(prices) < 10:
+            dates, closes, price_arr = ticker_series[ticker]
+            if len(dates) < 10:
                 continue
 
-            recent_high = max(p[1] for p in prices[:10])
+            recent_high = float(price_arr[:10].max())
+            # Only the bear quick exit looks at the recent low
+            recent_lows = _trailing_min(price_arr, 10).tolist() if scenario_type == "bear" else None
 
-            for i in range(10, len(prices)):
-                date, price = prices[i]
+            for i in range(10, len(dates)):
+                date, price = dates[i], closes[i]
                 recent_high = max(recent_high, price)
-                recent_low = min(p[1] for p in prices[max(0, i-10):i])
 
                 # Buy on dips
                 if holdings[ticker] == 0 and price <= recent_high * buy_threshold and cash > 1000:
@@ -972,7 +1296,7 @@ def generate_algorithmic_trades(
                     should_sell = (
                         gain_pct >= sell_threshold or
                         gain_pct <= -params["stop_loss"] or
-                        (scenario_type == "bear" and price < recent_low * 1.02)  # Quick exit in bear
+                        (scenario_type == "bear" and price < recent_lows[i] * 1.02)  # Quick exit in bear
                     )
 
                     if should_sell:
@@ -1017,19 +1341,18 @@ def generate_algorithmic_trades(
         for i in range(rebalance_interval, len(sorted_dates), rebalance_interval):
             date = sorted_dates[i]
 
+            # Look up the day's prices once for both passes below
+            quotes = [(ticker, price_data[ticker][date]) for ticker in tickers
+                      if ticker in price_data and date in price_data[ticker]]
+
             # Calculate current values
             total_value = cash
-            for ticker in tickers:
-                if ticker in price_data and date in price_data[ticker]:
-                    total_value += holdings[ticker] * price_data[ticker][date]
+            for ticker, price in quotes:
+                total_value += holdings[ticker] * price
 
             target_per_ticker = total_value / len(tickers) * 0.8  # 80% in stocks
 
-            for ticker in tickers:
-                if ticker not in price_data or date not in price_data[ticker]:
-                    continue
-
-                price = price_data[ticker][date]
+            for ticker, price in quotes:
                 current_value = holdings[ticker] * price
                 diff = target_per_ticker - current_value
 
@@ -1061,12 +1384,11 @@ def generate_algorithmic_trades(
                                 "reason": "Rebalance sell",
                                 "reason_code": "REBALANCE"
                             })
+                            # Sold shares leave at the average cost
+                            avg_cost = cost_basis[ticker] / holdings[ticker]
                             cash += shares * price
                             holdings[ticker] -= shares
-                            if holdings[ticker] > 0:
-                                cost_basis[ticker] *= (holdings[ticker] / (holdings[ticker] + shares))
-                            else:
-                                cost_basis[ticker] = 0
+                            cost_basis[ticker] = cost_basis[ticker] - shares * avg_cost if holdings[ticker] > 0 else 0
 
     return trades
 
@@ -1090,13 +1412,18 @@ def generate_llm_trading_history(
             return generate_algorithmic_trades(price_data, sorted_dates, starting_cash, tickers, scenario_type, trading_style)
 
         # Build price summary for LLM
-        price_summary = []
         sample_dates = sorted_dates[::max(1, len(sorted_dates) // 20)]  # ~20 sample points
+        priced = [(t, price_data[t]) for t in tickers if t in price_data]
+
+        def summary_lines(dates):
+            for date in dates:
+                prices_on_date = [(t, prices[date]) for t, prices in priced if date in prices]
+                if prices_on_date:
+                    yield f"{date}: " + ", ".join(f"{t}=${p:.2f}" for t, p in prices_on_date)
 
-        for date in sample_dates:
-            prices_on_date = {t: price_data[t].get(date) for t in tickers if t in price_data and date in price_data[t]}
-            if prices_on_date:
-                price_summary.append(f"{date}: " + ", ".join(f"{t}=${p:.2f}" for t, p in prices_on_date.items()))
+        # Only the first 15 and last 5 lines go into the prompt
+        summary_head = list(islice(summary_lines(sample_dates), 15))
+        summary_tail = list(islice(summary_lines(reversed(sample_dates)), 5))[::-1]
 
         prompt = f"""You are a portfolio manager creating a trading history for an alternate reality simulation.
 
@@ -1107,9 +1434,9 @@ STARTING CASH: ${starting_cash:,.0f}
 TICKERS TO TRADE: {', '.join(tickers)}
 
 HISTORICAL PRICES (sample dates):
-{chr(10).join(price_summary[:15])}
+{chr(10).join(summary_head)}
 ...
-{chr(10).join(price_summary[-5:])}
+{chr(10).join(summary_tail)}
 
 Generate a realistic trading history with 10-30 trades spread throughout the timeline.
 Include both BUY and SELL trades with realistic reasoning.
@@ -1142,12 +1469,9 @@ Rules:
             return generate_algorithmic_trades(price_data, sorted_dates, starting_cash, tickers, scenario_type, trading_style)
 
         # Parse response
-        clean_response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
-        json_start = clean_response.find('{')
-        json_end = clean_response.rfind('}') + 1
+        result = _decode_json_object(_THINK_RE.sub('', response))
 
-        if json_start >= 0 and json_end > json_start:
-            result = json.loads(clean_response[json_start:json_end])
+        if result is not None:
             llm_trades = result.get("trades", [])
 
             # Validate and enrich trades with actual prices
@@ -1171,6 +1495,22 @@ Rules:
         return generate_algorithmic_trades(price_data, sorted_dates, starting_cash, tickers, scenario_type, trading_style)
 
 
+def _event_days(events: pd.DataFrame) -> np.ndarray:
+    """Each event's calendar date as datetime64[D] (wall-clock date for tz-aware stamps)."""
+    timestamps = pd.to_datetime(events['timestamp'])
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.to_numpy().astype('datetime64[D]')
+
+
+def _events_through(events: pd.DataFrame, event_days: np.ndarray, date, ordered: bool) -> pd.DataFrame:
+    """Events on or before date, given each event's date and whether they are in date order."""
+    if ordered:
+        # Time-ordered log: the events up to date are a prefix
+        return events.iloc[:np.searchsorted(event_days, date, side='right')]
+    return events[event_days <= date]
+
+
 def build_historical_timeline(events1: pd.DataFrame, events2: pd.DataFrame,
                              name1: str, name2: str) -> list:
     """Build a timeline showing how portfolio values evolved differently.
@@ -1179,41 +1519,56 @@ def build_historical_timeline(events1: pd.DataFrame, events2: pd.DataFrame,
     """
     import sys
     sys.path.insert(0, str(SCRIPT_DIR))
-    from reconstruct_state import reconstruct_state
+    from reconstruct_state import reconstruct_state, new_state, apply_event, finalize_state
 
     timeline = []
 
-    # Get all unique dates from both event logs
-    dates1 = pd.to_datetime(events1['timestamp']).dt.date.unique()
-    dates2 = pd.to_datetime(events2['timestamp']).dt.date.unique()
-    all_dates = sorted(set(dates1) | set(dates2))
+    # Event dates, parsed once for both the date axis and the cutoffs below
+    event_dates1 = _event_days(events1)
+    event_dates2 = _event_days(events2)
+    ordered1 = bool(np.all(event_dates1[:-1] <= event_dates1[1:]))
+    ordered2 = bool(np.all(event_dates2[:-1] <= event_dates2[1:]))
+
+    # Get all unique dates from both event logs (sorted)
+    all_dates = np.union1d(event_dates1, event_dates2)
 
     # Sample dates (monthly or every N events to avoid too many points)
     if len(all_dates) > 24:
         # Sample monthly
-        sampled_dates = all_dates[::max(1, len(all_dates) // 24)]
-        # Always include first and last
-        if all_dates[0] not in sampled_dates:
-            sampled_dates = [all_dates[0]] + list(sampled_dates)
-        if all_dates[-1] not in sampled_dates:
-            sampled_dates = list(sampled_dates) + [all_dates[-1]]
+        step = max(1, len(all_dates) // 24)
+        sampled_dates = all_dates[::step]
+        # Always include first and last; the stride starts at the first
+        if (len(all_dates) - 1) % step:
+            sampled_dates = np.append(sampled_dates, all_dates[-1])
     else:
         sampled_dates = all_dates
 
+    # For date-ordered logs each sample's events extend the previous sample's,
+    # so replay only the new ones into a running state
+    running1, running2 = new_state(), new_state()
+    replayed1 = replayed2 = 0
+
+    def state_through(events_to_date, ordered, running, replayed):
+        if len(events_to_date) == 0:
+            return {'total_value': 0, 'cash': 0}
+        if not ordered:
+            return reconstruct_state(events_to_date)
+        for event in events_to_date.iloc[replayed:].to_dict('records'):
+            apply_event(running, event)
+        return finalize_state(running)
+
     for date in sampled_dates:
         # Filter events up to this date
-        mask1 = pd.to_datetime(events1['timestamp']).dt.date <= date
-        mask2 = pd.to_datetime(events2['timestamp']).dt.date <= date
-
-        events1_to_date = events1[mask1]
-        events2_to_date = events2[mask2]
+        events1_to_date = _events_through(events1, event_dates1, date, ordered1)
+        events2_to_date = _events_through(events2, event_dates2, date, ordered2)
 
         if len(events1_to_date) == 0 and len(events2_to_date) == 0:
             continue
 
         # Reconstruct states
-        state1 = reconstruct_state(events1_to_date) if len(events1_to_date) > 0 else {'total_value': 0, 'cash': 0}
-        state2 = reconstruct_state(events2_to_date) if len(events2_to_date) > 0 else {'total_value': 0, 'cash': 0}
+        state1 = state_through(events1_to_date, ordered1, running1, replayed1)
+        state2 = state_through(events2_to_date, ordered2, running2, replayed2)
+        replayed1, replayed2 = len(events1_to_date), len(events2_to_date)
 
         timeline.append({
             "date": str(date),
@@ -1239,44 +1594,200 @@ def build_historical_timeline(events1: pd.DataFrame, events2: pd.DataFrame,
 # Part 2: Simple Reality Engine (from alternate_reality.py)
 # =============================================================================
 
+def _snapshots_file(reality_id: str) -> Path:
+    """Parquet sidecar holding a reality's timeline snapshots."""
+    return ALT_REALITIES_FILE.parent / f"snapshots_{reality_id}.parquet"
+
+
+# Snapshot holdings breakdowns are stored column-wise: one column per
+# (ticker, field), null on dates the ticker has no price
+_BREAKDOWN_PREFIX = 'holdings:'
+_BREAKDOWN_FIELDS = ('shares', 'price', 'value')
+
+
+def _write_snapshots(reality_id: str, snapshots: List[Dict]) -> None:
+    """Write a reality's snapshots to its Parquet sidecar."""
+    path = _snapshots_file(reality_id)
+    if not snapshots:
+        path.unlink(missing_ok=True)
+        return
+
+    breakdowns = [snapshot.get('holdings') or {} for snapshot in snapshots]
+    tickers = dict.fromkeys(ticker for breakdown in breakdowns for ticker in breakdown)
+    columns = {}
+    for key in snapshots[0]:
+        if key != 'holdings':
+            columns[key] = [snapshot.get(key) for snapshot in snapshots]
+            continue
+        for ticker in tickers:
+            for field in _BREAKDOWN_FIELDS:
+                columns[f"{_BREAKDOWN_PREFIX}{ticker}:{field}"] = [
+                    breakdown[ticker][field] if ticker in breakdown else None for breakdown in breakdowns
+                ]
+
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    pq.write_table(pa.table(columns), tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+def _read_snapshots(path: Path) -> List[Dict]:
+    """Rebuild the snapshot dicts from a sidecar written by _write_snapshots()."""
+    table = pq.read_table(path)
+    columns = table.to_pydict()
+
+    # Plain columns in order, with 'holdings' where its breakdown columns start
+    keys, tickers = [], {}
+    for name in columns:
+        if not name.startswith(_BREAKDOWN_PREFIX):
+            keys.append(name)
+            continue
+        if 'holdings' not in keys:
+            keys.append('holdings')
+        tickers[name[len(_BREAKDOWN_PREFIX):].rsplit(':', 1)[0]] = None
+    if 'holdings' not in keys:
+        keys.append('holdings')
+    ticker_columns = [
+        (ticker, *(columns[f"{_BREAKDOWN_PREFIX}{ticker}:{field}"] for field in _BREAKDOWN_FIELDS))
+        for ticker in tickers
+    ]
+
+    snapshots = []
+    for i in range(table.num_rows):
+        snapshot = {}
+        for key in keys:
+            if key == 'holdings':
+                snapshot[key] = {
+                    ticker: {'shares': shares[i], 'price': prices[i], 'value': values[i]}
+                    for ticker, shares, prices, values in ticker_columns
+                    if shares[i] is not None
+                }
+            else:
+                snapshot[key] = columns[key][i]
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _with_snapshots(reality: Dict) -> Dict:
+    """Return the reality with its snapshots, loading them from the sidecar if needed."""
+    if 'snapshots' in reality:
+        return reality
+    path = _snapshots_file(reality['id'])
+    snapshots = _read_snapshots(path) if pa is not None and path.exists() else []
+    return {**reality, 'snapshots': snapshots}
+
+
 def load_alternate_realities() -> Dict:
-    """Load saved alternate realities from file."""
+    """Load saved alternate realities from file.
+
+    Snapshots live in per-reality Parquet sidecars and are not included;
+    use _with_snapshots() on the realities that need them.
+    """
     if ALT_REALITIES_FILE.exists():
-        with open(ALT_REALITIES_FILE, 'r') as f:
-            return json.load(f)
+        with open(ALT_REALITIES_FILE, 'rb') as f:
+            return _loads(f.read())
     return {'realities': []}
 
 
 def save_alternate_realities(data: Dict) -> None:
-    """Save alternate realities to file."""
+    """Save alternate realities to file.
+
+    Realities carrying a 'snapshots' list (new, refreshed or from an older
+    file that kept them inline) get them written to their Parquet sidecar
+    instead of the JSON. Without pyarrow they stay inline.
+    """
     ALT_REALITIES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    if pa is not None:
+        realities = []
+        for reality in data.get('realities', []):
+            if 'snapshots' in reality:
+                _write_snapshots(reality['id'], reality['snapshots'])
+                reality = {k: v for k, v in reality.items() if k != 'snapshots'}
+            realities.append(reality)
+        data = {**data, 'realities': realities}
     with open(ALT_REALITIES_FILE, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+        f.write(_dumps(data, indent=True))
+
+
+def _price_cache_file(tickers: List[str], start_date: str, end_date: str) -> Path:
+    """Cache file for a ticker set and date range (ticker order doesn't matter)."""
+    key = hashlib.sha1(f"{sorted(tickers)}|{start_date}|{end_date}".encode()).hexdigest()
+    return PRICE_CACHE_DIR / f"{key}.parquet"
+
+
+def _fetch_price_frame(tickers: List[str], start_date: str, end_date: str) -> tuple:
+    """Download closes as a tidy (date, ticker, close) frame in ticker order.
+
+    Returns the frame and whether every ticker came back with prices.
+    yfinance reports many failures (rate limits, delisted symbols) as an
+    empty history rather than an exception, so those count as incomplete.
+    """
+    def fetch(ticker):
+        try:
+            return ticker, yf.Ticker(ticker).history(start=start_date, end=end_date)
+        except Exception as e:
+            print(f"Error fetching {ticker}: {e}")
+            return ticker, None
+
+    frames = []
+    complete = True
+    # Network-bound, so fetch in parallel; results come back in ticker order
+    with ThreadPoolExecutor(max_workers=min(16, len(tickers)) or 1) as executor:
+        for ticker, hist in executor.map(fetch, tickers):
+            if hist is None or hist.empty:
+                complete = False
+                continue
+            frames.append(pd.DataFrame({
+                'date': hist.index.strftime('%Y-%m-%d'),
+                'ticker': ticker,
+                'close': hist['Close'].round(2).to_numpy()
+            }))
+
+    if not frames:
+        return pd.DataFrame({'date': [], 'ticker': [], 'close': []}), complete
+    return pd.concat(frames, ignore_index=True), complete
 
 
 def get_historical_prices(tickers: List[str], start_date: str, end_date: str = None) -> Dict:
     """
     Fetch historical prices for tickers between dates.
 
+    Complete downloads are cached on disk per ticker set and date range;
+    ranges that run up to today are refetched after PRICE_CACHE_TTL.
+
     Returns dict of {date_str: {ticker: price}}
     """
+    today = datetime.now().strftime('%Y-%m-%d')
     if not end_date:
-        end_date = datetime.now().strftime('%Y-%m-%d')
+        end_date = today
 
-    prices_by_date = {}
+    cache_file = _price_cache_file(tickers, start_date, end_date)
+    frame = None
+    if pa is not None and cache_file.exists():
+        age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
+        if end_date < today or age < PRICE_CACHE_TTL:
+            try:
+                frame = pd.read_parquet(cache_file)
+            except Exception as e:
+                print(f"Ignoring unreadable price cache {cache_file.name}: {e}")
+
+    if frame is None:
+        frame, complete = _fetch_price_frame(tickers, start_date, end_date)
+        # Don't cache a range with failed or empty tickers, so they are retried next time
+        if pa is not None and complete and not frame.empty:
+            PRICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            frame.to_parquet(tmp_file, compression='zstd', index=False)
+            os.replace(tmp_file, cache_file)
+    else:
+        # A cache written for the same tickers in another order
+        order = {t: i for i, t in enumerate(tickers)}
+        frame = frame.iloc[np.argsort(frame['ticker'].map(order).to_numpy(), kind='stable')]
 
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
-
-            for date, row in hist.iterrows():
-                date_str = date.strftime('%Y-%m-%d')
-                if date_str not in prices_by_date:
-                    prices_by_date[date_str] = {}
-                prices_by_date[date_str][ticker] = round(row['Close'], 2)
-        except Exception as e:
-            print(f"Error fetching {ticker}: {e}")
+    prices_by_date = {}
+    for date_str, ticker, close in zip(frame['date'].tolist(), frame['ticker'].tolist(), frame['close'].tolist()):
+        if date_str not in prices_by_date:
+            prices_by_date[date_str] = {}
+        prices_by_date[date_str][ticker] = close
 
     return prices_by_date
 
@@ -1451,6 +1962,7 @@ def generate_timeline_snapshots(
     """Generate value snapshots for each date in the price history."""
     snapshots = []
     sorted_dates = sorted(prices_by_date.keys())
+    positions = list(holdings.items())
 
     prev_value = None
 
@@ -1461,13 +1973,14 @@ def generate_timeline_snapshots(
         holdings_value = 0
         holdings_breakdown = {}
 
-        for ticker, shares in holdings.items():
+        for ticker, shares in positions:
             if ticker in prices:
-                value = shares * prices[ticker]
+                price = prices[ticker]
+                value = shares * price
                 holdings_value += value
                 holdings_breakdown[ticker] = {
                     'shares': shares,
-                    'price': prices[ticker],
+                    'price': price,
                     'value': value
                 }
 
@@ -1509,7 +2022,7 @@ def get_alternate_reality(reality_id: str) -> Optional[Dict]:
     data = load_alternate_realities()
     for reality in data['realities']:
         if reality['id'] == reality_id:
-            return reality
+            return _with_snapshots(reality)
     return None
 
 
@@ -1535,6 +2048,7 @@ def delete_alternate_reality(reality_id: str) -> bool:
 
     if len(data['realities']) < original_count:
         save_alternate_realities(data)
+        _snapshots_file(reality_id).unlink(missing_ok=True)
         return True
     return False
 
@@ -1582,7 +2096,7 @@ def refresh_alternate_reality(reality_id: str) -> Optional[Dict]:
                 data['realities'][i] = reality
                 save_alternate_realities(data)
 
-            return reality
+            return _with_snapshots(reality)
 
     return None
 
@@ -1593,14 +2107,11 @@ def get_combined_timeline_data() -> Dict:
 
     Returns data structured for the multiverse visualization.
     """
-    from reconstruct_state import load_event_log, reconstruct_state
-
     # Load main portfolio state
-    events_df = load_event_log(str(DATA_DIR / 'event_log_enhanced.csv'))
-    main_state = reconstruct_state(events_df)
+    main_state = get_reality_state()
 
     # Get alternate realities
-    alt_realities = load_alternate_realities()['realities']
+    alt_realities = [_with_snapshots(r) for r in load_alternate_realities()['realities']]
 
     # Build main reality data
     main_reality = {
@@ -1649,23 +2160,23 @@ def get_combined_timeline_data() -> Dict:
 
 def get_portfolio_context() -> Dict:
     """Get current portfolio state for LLM context."""
-    from reconstruct_state import load_event_log, reconstruct_state
+    state = get_reality_state()
 
-    events_df = load_event_log(str(DATA_DIR / 'event_log_enhanced.csv'))
-    state = reconstruct_state(events_df)
+    latest_prices = state.get('latest_prices') or {}
+    cost_bases = state.get('cost_basis') or {}
 
     holdings_summary = []
-    for ticker, shares in state.get('holdings', {}).items():
+    for ticker, shares in (state.get('holdings') or {}).items():
         if shares > 0:
-            price = state.get('latest_prices', {}).get(ticker, 0)
-            cost_basis = state.get('cost_basis', {}).get(ticker, {})
+            price = latest_prices.get(ticker, 0)
+            avg_price = (cost_bases.get(ticker) or {}).get('avg_price', 0)
             holdings_summary.append({
                 'ticker': ticker,
                 'shares': shares,
                 'price': price,
                 'value': shares * price,
-                'cost_basis': cost_basis.get('avg_price', 0),
-                'gain_pct': ((price - cost_basis.get('avg_price', 1)) / cost_basis.get('avg_price', 1) * 100) if cost_basis.get('avg_price', 0) > 0 else 0
+                'cost_basis': avg_price,
+                'gain_pct': ((price - avg_price) / avg_price * 100) if avg_price > 0 else 0
             })
 
     return {
@@ -1680,6 +2191,11 @@ def get_portfolio_context() -> Dict:
 
 def build_projection_prompt(portfolio: Dict, years_forward: int = 3, years_back: int = 1) -> str:
     """Build the LLM prompt for generating projections."""
+    # One clock read so every date in the prompt agrees
+    now = datetime.now()
+    present_date = now.strftime('%Y-%m-%d')
+    start_date = (now - timedelta(days=365 * years_back)).strftime('%Y-%m-%d')
+    end_date = (now + timedelta(days=365 * years_forward)).strftime('%Y-%m-%d')
 
     holdings_text = "\n".join([
         f"- {h['ticker']}: {h['shares']:.0f} shares @ ${h['price']:.2f} = ${h['value']:,.0f} ({h['gain_pct']:+.1f}%)"
@@ -1688,7 +2204,7 @@ def build_projection_prompt(portfolio: Dict, years_forward: int = 3, years_back:
 
     prompt = f"""You are a financial analyst creating scenario projections for a portfolio visualization.
 
-## Current Portfolio (as of {datetime.now().strftime('%Y-%m-%d')})
+## Current Portfolio (as of {present_date})
 Total Value: ${portfolio['total_value']:,.0f}
 Cash: ${portfolio['cash']:,.0f}
 Holdings Value: ${portfolio['portfolio_value']:,.0f}
@@ -1706,11 +2222,11 @@ Generate a structured JSON response with timeline projections for this portfolio
 Return ONLY valid JSON (no markdown, no explanation) with this exact structure:
 
 {{
-    "generated_at": "{datetime.now().isoformat()}",
+    "generated_at": "{now.isoformat()}",
     "timeline": {{
-        "start_date": "{(datetime.now() - timedelta(days=365*years_back)).strftime('%Y-%m-%d')}",
-        "end_date": "{(datetime.now() + timedelta(days=365*years_forward)).strftime('%Y-%m-%d')}",
-        "present_date": "{datetime.now().strftime('%Y-%m-%d')}"
+        "start_date": "{start_date}",
+        "end_date": "{end_date}",
+        "present_date": "{present_date}"
     }},
     "realities": [
         {{
@@ -1782,29 +2298,30 @@ Generate realistic, thoughtful projections. For past events, reference real mark
 
 
 def parse_llm_response(response: str) -> Optional[Dict]:
-    """Parse LLM response, handling various formats."""
-    # Try to extract JSON from response
-    # First try: direct JSON parse
+    """Parse LLM response, handling various formats.
+
+    Accepts bare JSON, JSON surrounded by prose, and JSON in a ``` code
+    fence. The first complete object is decoded in a single scan, so
+    trailing prose containing braces does not break the parse.
+    """
+    # First try: the whole response is JSON
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
+        return _loads(response)
+    except ValueError:
         pass
 
-    # Second try: find JSON block
-    json_match = re.search(r'\{[\s\S]*\}', response)
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-
-    # Third try: find JSON in code blocks
-    code_match = re.search(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```', response)
-    if code_match:
+    # Then the first object in the response, or failing that the first one
+    # inside a code fence (prose before the fence may contain a stray '{')
+    fence = response.find('```')
+    for text in (response, response[fence + 3:] if fence >= 0 else None):
+        if text is None:
+            continue
         try:
-            return json.loads(code_match.group(1))
+            result = _decode_json_object(text)
         except json.JSONDecodeError:
-            pass
+            continue
+        if result is not None:
+            return result
 
     return None
 
@@ -1818,40 +2335,63 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
 
     base_value = portfolio['total_value']
 
-    def generate_snapshots(growth_rate: float, volatility: float) -> List[Dict]:
-        snapshots = []
-        current = start_date
-        months = 0
-
-        while current <= end_date:
-            # Calculate value at this point
-            years_from_present = (current - now).days / 365
-
-            if years_from_present < 0:
-                # Past: use lower volatility
-                value = base_value * (1 + growth_rate * years_from_present * 0.8)
-            else:
-                # Future: project with growth rate
-                value = base_value * (1 + growth_rate) ** years_from_present
-
-            # Add some variation
-            variation = math.sin(months * 0.5) * volatility * base_value
-            value += variation
-
-            sentiment_score = growth_rate + (variation / base_value)
-
-            snapshots.append({
-                'date': current.strftime('%Y-%m-%d'),
-                'total_value': round(value, 0),
-                'change_from_present_pct': round((value - base_value) / base_value * 100, 1),
-                'sentiment': 'bullish' if sentiment_score > 0.05 else ('bearish' if sentiment_score < -0.05 else 'neutral'),
-                'sentiment_score': round(max(-1, min(1, sentiment_score * 5)), 2)
-            })
-
-            current += timedelta(days=30)
-            months += 1
+    # All three scenarios share one 30-day grid, so compute them together as
+    # (scenario x month) arrays: rows are base, bull, bear.
+    growth = np.array([0.08, 0.25, -0.15])[:, None]
+    volatility = np.array([0.03, 0.05, 0.06])[:, None]
+
+    n_months = (end_date - start_date).days // 30 + 1
+    months = np.arange(n_months)
+    years_from_present = (months * 30 - (now - start_date).days) / 365
+    dates = pd.date_range(start_date, periods=n_months, freq='30D').strftime('%Y-%m-%d').tolist()
+
+    # Value relative to the present one. Past points use a damped linear
+    # trend, future points compound
+    factor = np.where(
+        years_from_present < 0,
+        1 + growth * years_from_present * 0.8,
+        (1 + growth) ** years_from_present
+    )
+    # Add some variation
+    variation = np.sin(months * 0.5) * volatility
+    factor = factor + variation
+    sentiment_score = growth + variation
+    if not base_value:
+        # Nothing invested: flat, neutral snapshots rather than 0/0 NaNs
+        factor = np.ones_like(factor)
+        sentiment_score = np.zeros_like(sentiment_score)
+    value = base_value * factor
+
+    sentiment = np.select(
+        [sentiment_score > 0.05, sentiment_score < -0.05], ['bullish', 'bearish'], 'neutral'
+    )
+    # Rounded here rather than per value when the dicts are built. np.round
+    # can differ from round() by one in the last digit on ties (1.685 -> 1.68,
+    # not 1.69); for simulated values that is not worth a Python call each.
+    total_values = np.rint(value).astype(np.int64)
+    change_pct = np.round((factor - 1) * 100, 1)
+    clipped_score = np.round(np.clip(sentiment_score * 5, -1, 1), 2)
+
+    def generate_snapshots(row: int) -> List[Dict]:
+        return [
+            {
+                'date': date,
+                'total_value': v,
+                'change_from_present_pct': pct,
+                'sentiment': label,
+                'sentiment_score': score
+            }
+            for date, v, pct, label, score in zip(
+                dates, total_values[row].tolist(), change_pct[row].tolist(),
+                sentiment[row].tolist(), clipped_score[row].tolist()
+            )
+        ]
 
-        return snapshots
+    # Tickers the macro events point at, shared by every scenario
+    all_tickers = [h['ticker'] for h in portfolio['holdings']]
+    top3 = all_tickers[:3]
+    top2 = all_tickers[:2]
+    rklb = ['RKLB'] if 'RKLB' in all_tickers else []
 
     # Generate macro events
     def generate_events(scenario: str) -> List[Dict]:
@@ -1865,7 +2405,7 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
             'description': 'Market experienced significant movement affecting growth stocks',
             'impact': 'neutral' if scenario == 'base' else ('positive' if scenario == 'bull' else 'negative'),
             'magnitude': 'moderate',
-            'affected_holdings': [h['ticker'] for h in portfolio['holdings'][:3]]
+            'affected_holdings': top3
         })
 
         # Future events
@@ -1877,21 +2417,21 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
 
         if scenario == 'bull':
             events.extend([
-                {'date': future_dates[0], 'title': 'AI Boom Accelerates', 'description': 'Major AI breakthroughs drive tech valuations higher', 'impact': 'positive', 'magnitude': 'major', 'affected_holdings': [h['ticker'] for h in portfolio['holdings'][:2]]},
-                {'date': future_dates[1], 'title': 'Fed Cuts Rates', 'description': 'Interest rate cuts boost growth stocks', 'impact': 'positive', 'magnitude': 'moderate', 'affected_holdings': [h['ticker'] for h in portfolio['holdings']]},
-                {'date': future_dates[2], 'title': 'Space Economy Expansion', 'description': 'Commercial space industry reaches new milestones', 'impact': 'positive', 'magnitude': 'major', 'affected_holdings': ['RKLB'] if any(h['ticker'] == 'RKLB' for h in portfolio['holdings']) else []}
+                {'date': future_dates[0], 'title': 'AI Boom Accelerates', 'description': 'Major AI breakthroughs drive tech valuations higher', 'impact': 'positive', 'magnitude': 'major', 'affected_holdings': top2},
+                {'date': future_dates[1], 'title': 'Fed Cuts Rates', 'description': 'Interest rate cuts boost growth stocks', 'impact': 'positive', 'magnitude': 'moderate', 'affected_holdings': all_tickers},
+                {'date': future_dates[2], 'title': 'Space Economy Expansion', 'description': 'Commercial space industry reaches new milestones', 'impact': 'positive', 'magnitude': 'major', 'affected_holdings': rklb}
             ])
         elif scenario == 'bear':
             events.extend([
-                {'date': future_dates[0], 'title': 'Recession Fears', 'description': 'Economic indicators point to slowdown', 'impact': 'negative', 'magnitude': 'major', 'affected_holdings': [h['ticker'] for h in portfolio['holdings']]},
-                {'date': future_dates[1], 'title': 'Tech Regulation', 'description': 'New regulations impact tech sector', 'impact': 'negative', 'magnitude': 'moderate', 'affected_holdings': [h['ticker'] for h in portfolio['holdings'][:3]]},
-                {'date': future_dates[2], 'title': 'Market Correction', 'description': 'Valuations normalize after prolonged rally', 'impact': 'negative', 'magnitude': 'moderate', 'affected_holdings': [h['ticker'] for h in portfolio['holdings']]}
+                {'date': future_dates[0], 'title': 'Recession Fears', 'description': 'Economic indicators point to slowdown', 'impact': 'negative', 'magnitude': 'major', 'affected_holdings': all_tickers},
+                {'date': future_dates[1], 'title': 'Tech Regulation', 'description': 'New regulations impact tech sector', 'impact': 'negative', 'magnitude': 'moderate', 'affected_holdings': top3},
+                {'date': future_dates[2], 'title': 'Market Correction', 'description': 'Valuations normalize after prolonged rally', 'impact': 'negative', 'magnitude': 'moderate', 'affected_holdings': all_tickers}
             ])
         else:
             events.extend([
-                {'date': future_dates[0], 'title': 'Mixed Earnings Season', 'description': 'Companies report varied results', 'impact': 'neutral', 'magnitude': 'minor', 'affected_holdings': [h['ticker'] for h in portfolio['holdings'][:2]]},
-                {'date': future_dates[1], 'title': 'Sector Rotation', 'description': 'Investors shift between growth and value', 'impact': 'neutral', 'magnitude': 'moderate', 'affected_holdings': [h['ticker'] for h in portfolio['holdings']]},
-                {'date': future_dates[2], 'title': 'Steady Growth', 'description': 'Markets continue gradual appreciation', 'impact': 'positive', 'magnitude': 'minor', 'affected_holdings': [h['ticker'] for h in portfolio['holdings']]}
+                {'date': future_dates[0], 'title': 'Mixed Earnings Season', 'description': 'Companies report varied results', 'impact': 'neutral', 'magnitude': 'minor', 'affected_holdings': top2},
+                {'date': future_dates[1], 'title': 'Sector Rotation', 'description': 'Investors shift between growth and value', 'impact': 'neutral', 'magnitude': 'moderate', 'affected_holdings': all_tickers},
+                {'date': future_dates[2], 'title': 'Steady Growth', 'description': 'Markets continue gradual appreciation', 'impact': 'positive', 'magnitude': 'minor', 'affected_holdings': all_tickers}
             ])
 
         return events
@@ -1912,7 +2452,7 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
                 'probability': 0.50,
                 'color': '#06b6d4',
                 'sentiment': 'neutral',
-                'snapshots': generate_snapshots(0.08, 0.03),
+                'snapshots': generate_snapshots(0),
                 'macro_events': generate_events('base')
             },
             {
@@ -1922,7 +2462,7 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
                 'probability': 0.25,
                 'color': '#22c55e',
                 'sentiment': 'bullish',
-                'snapshots': generate_snapshots(0.25, 0.05),
+                'snapshots': generate_snapshots(1),
                 'macro_events': generate_events('bull')
             },
             {
@@ -1932,13 +2472,13 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
                 'probability': 0.25,
                 'color': '#ef4444',
                 'sentiment': 'bearish',
-                'snapshots': generate_snapshots(-0.15, 0.06),
+                'snapshots': generate_snapshots(2),
                 'macro_events': generate_events('bear')
             }
         ],
         'portfolio_context': {
             'total_value': portfolio['total_value'],
-            'holdings': [h['ticker'] for h in portfolio['holdings']]
+            'holdings': all_tickers
         }
     }
 
@@ -1946,7 +2486,8 @@ def generate_fallback_projections(portfolio: Dict, years_forward: int = 3, years
 async def generate_projections(
     years_forward: int = 3,
     years_back: int = 1,
-    use_llm: bool = True
+    use_llm: bool = True,
+    portfolio: Dict = None
 ) -> Dict:
     """
     Generate timeline projections for the multiverse visualization.
@@ -1955,13 +2496,15 @@ async def generate_projections(
         years_forward: Years to project into future
         years_back: Years of history to include
         use_llm: Whether to use LLM for intelligent projections
+        portfolio: Portfolio context, if the caller already has one
 
     Returns:
         Structured projection data for visualization
     """
     from llm.config import get_llm_config
 
-    portfolio = get_portfolio_context()
+    if portfolio is None:
+        portfolio = get_portfolio_context()
 
     if not use_llm:
         return generate_fallback_projections(portfolio, years_forward, years_back)
@@ -2003,17 +2546,16 @@ def generate_projections_sync(
     years_back: int = 1,
     use_llm: bool = True
 ) -> Dict:
-    """Synchronous wrapper for generate_projections."""
+    """Synchronous wrapper for generate_projections.
+
+    For callers without an event loop; async code (e.g. API routes) should
+    await generate_projections directly.
+    """
+    # Built once and shared with the fallback below
+    portfolio = get_portfolio_context()
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            generate_projections(years_forward, years_back, use_llm)
-        )
-        loop.close()
-        return result
+        return asyncio.run(generate_projections(years_forward, years_back, use_llm, portfolio))
     except Exception as e:
-        portfolio = get_portfolio_context()
         result = generate_fallback_projections(portfolio, years_forward, years_back)
         result['error'] = str(e)
         return result
@@ -2040,10 +2582,46 @@ def generate_projection(
     Returns:
         Projection data with future frames
     """
+    inputs = _build_projection_inputs(history_id, idea_ids)
+    if inputs is None:
+        return {"error": "History not found"}
+
+    # Generate analysis and projections
+    if use_llm:
+        analysis = get_llm_analysis_for_projection(
+            inputs['holdings'], years, inputs['history_context'], inputs['idea_context']
+        )
+    else:
+        analysis = get_statistical_analysis_for_projection(
+            inputs['holdings'], years, inputs['history_context'], inputs['idea_context']
+        )
+
+    return _finalize_projection(history_id, years, inputs, analysis)
+
+
+async def generate_projection_async(
+    history_id: str = "reality",
+    years: int = 3,
+    use_llm: bool = True,
+    idea_ids: list = None
+) -> dict:
+    """Async variant of generate_projection.
+
+    The state replay and the LLM call block, so they run in a worker thread
+    and leave the event loop free to serve other requests meanwhile.
+    """
+    return await asyncio.to_thread(generate_projection, history_id, years, use_llm, idea_ids)
+
+
+def _build_projection_inputs(history_id: str, idea_ids: list = None) -> Optional[dict]:
+    """Load the state, holdings and context a projection is built from.
+
+    Returns None when history_id names a history that does not exist.
+    """
     import sys
     sys.path.insert(0, str(SCRIPT_DIR))
 
-    from reconstruct_state import load_event_log, reconstruct_state
+    from reconstruct_state import reconstruct_state
 
     # Get alternate history metadata if not reality
     history_context = None
@@ -2061,10 +2639,13 @@ def generate_projection(
     idea_context = None
     if idea_ids:
         try:
-            from api.routes.ideas import get_idea_by_id
+            from api.routes.ideas import get_ideas
 
+            # get_idea_by_id rebuilds every idea from the event log per call,
+            # so rebuild them once and look each one up
+            ideas_by_id = {idea['id']: idea for idea in get_ideas()}
             for idea_id in idea_ids:
-                idea = get_idea_by_id(idea_id)
+                idea = ideas_by_id.get(idea_id)
                 if idea:
                     applied_ideas.append({
                         "id": idea_id,
@@ -2085,46 +2666,51 @@ def generate_projection(
 
     # Load current state
     if history_id == "reality":
-        events = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
+        current_state = get_reality_state()
     else:
         events = get_history_events(history_id)
+        if events is None:
+            return None
+        current_state = reconstruct_state(events)
 
-    if events is None:
-        return {"error": "History not found"}
-
-    current_state = reconstruct_state(events)
+    latest_prices = current_state.get('latest_prices') or {}
+    cost_bases = current_state.get('cost_basis') or {}
 
     # Always load reality's prices as fallback for alternates
-    reality_prices = current_state.get('latest_prices', {})
+    reality_prices = latest_prices
     if history_id != "reality":
-        # Load reality prices to use as fallback
-        reality_events = load_event_log(str(DATA_DIR / "event_log_enhanced.csv"))
-        reality_state = reconstruct_state(reality_events)
-        reality_prices = reality_state.get('latest_prices', {})
+        reality_prices = get_reality_prices()
 
     # Get holdings for analysis
     holdings = []
-    for ticker, shares in current_state.get('holdings', {}).items():
+    for ticker, shares in (current_state.get('holdings') or {}).items():
         if shares > 0.01:
             # Use reality prices as fallback if alternate doesn't have prices
-            price = current_state.get('latest_prices', {}).get(ticker, 0)
-            if price == 0:
-                price = reality_prices.get(ticker, 0)
-            cost_info = current_state.get('cost_basis', {}).get(ticker, {})
+            price = latest_prices.get(ticker, 0) or reality_prices.get(ticker, 0)
+            avg_cost = (cost_bases.get(ticker) or {}).get('avg_price', 0)
             holdings.append({
                 "ticker": ticker,
                 "shares": shares,
                 "current_price": price,
                 "market_value": shares * price,
-                "avg_cost": cost_info.get('avg_price', 0),
-                "unrealized_gain_pct": ((price - cost_info.get('avg_price', 1)) / cost_info.get('avg_price', 1) * 100) if cost_info.get('avg_price', 0) > 0 else 0
+                "avg_cost": avg_cost,
+                "unrealized_gain_pct": ((price - avg_cost) / avg_cost * 100) if avg_cost > 0 else 0
             })
 
-    # Generate analysis and projections
-    if use_llm:
-        analysis = get_llm_analysis_for_projection(holdings, years, history_context, idea_context)
-    else:
-        analysis = get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+    return {
+        "current_state": current_state,
+        "holdings": holdings,
+        "history_context": history_context,
+        "idea_context": idea_context,
+        "applied_ideas": applied_ideas
+    }
+
+
+def _finalize_projection(history_id: str, years: int, inputs: dict, analysis: dict) -> dict:
+    """Turn an analysis into future frames, then assemble and save the projection."""
+    current_state = inputs['current_state']
+    holdings = inputs['holdings']
+    applied_ideas = inputs['applied_ideas']
 
     # Generate future price frames
     projection_id = str(uuid.uuid4())[:8]
@@ -2134,7 +2720,7 @@ def generate_projection(
         analysis,
         start_date,
         years,
-        idea_context
+        inputs['idea_context']
     )
 
     projection = {
@@ -2162,15 +2748,156 @@ def generate_projection(
     return projection
 
 
+def build_batch_analysis_prompt(items: List[Dict]) -> str:
+    """Build one analysis prompt covering several portfolios.
+
+    Each item carries the 'holdings' and 'years' of one projection request;
+    portfolios are numbered from 1 and the model is asked to answer with a
+    JSON array keyed by that number.
+    """
+    sections = []
+    for index, item in enumerate(items, 1):
+        holdings_summary = "\n".join([
+            f"- {h['ticker']}: {h['shares']:.0f} shares @ ${h['current_price']:.2f}"
+            for h in item['holdings']
+        ]) or "- (no holdings)"
+        sections.append(f"PORTFOLIO {index} ({item['years']}-year projection):\n{holdings_summary}")
+
+    portfolios = "\n\n".join(sections)
+    return f"""Analyze each of these portfolios for its projection horizon:
+
+{portfolios}
+
+Respond with ONLY a JSON array holding one object per portfolio, in order:
+[{{"index": 1, "ticker_analysis": {{...}}, "portfolio_projection": {{...}}}}, ...]"""
+
+
+def parse_batch_analysis_response(response: str, count: int) -> List[Optional[Dict]]:
+    """Split a batched analysis response back into per-portfolio analyses.
+
+    Returns a list of length count; entries the model left out (or that did
+    not parse) are None so the caller can fall back for just those. Accepts
+    the same shapes as parse_llm_response: a bare array, an array after
+    prose, or one inside a ``` code fence.
+    """
+    analyses = [None] * count
+
+    def as_batch(value):
+        # Analyses are objects; prose like "[1]" is not an answer
+        return value if isinstance(value, list) and any(isinstance(v, dict) for v in value) else None
+
+    # First try: the whole response is the array
+    try:
+        results = as_batch(_loads(response))
+    except ValueError:
+        results = None
+
+    # Then the first array in the response, or failing that the first one
+    # inside a code fence (prose before the fence may contain a stray '[')
+    fence = response.find('```')
+    for text in (response, response[fence + 3:] if fence >= 0 else None):
+        if results is not None or text is None:
+            break
+        start = text.find('[')
+        if start < 0:
+            continue
+        try:
+            results = as_batch(_JSON_DECODER.raw_decode(text, start)[0])
+        except json.JSONDecodeError:
+            continue
+    if results is None:
+        return analyses
+
+    for position, result in enumerate(results):
+        if not isinstance(result, dict):
+            continue
+        index = result.pop('index', position + 1)
+        if isinstance(index, int) and 1 <= index <= count:
+            analyses[index - 1] = result
+    return analyses
+
+
+def _batch_llm_analyses(items: List[Dict]) -> List[Optional[Dict]]:
+    """Analyze up to PROJECTION_BATCH_SIZE portfolios with a single LLM call."""
+    from llm.client import get_llm_response
+
+    response = get_llm_response(build_batch_analysis_prompt(items), max_tokens=2000 * len(items))
+    analyses = parse_batch_analysis_response(response, len(items))
+    for analysis in analyses:
+        if analysis is not None:
+            analysis["source"] = "llm"
+    return analyses
+
+
+def generate_projections_batch(requests: List[Dict]) -> List[Dict]:
+    """Generate several projections, sharing LLM calls between them.
+
+    Each request is a dict with the generate_projection arguments
+    (history_id, years, use_llm, idea_ids). LLM analyses are requested
+    PROJECTION_BATCH_SIZE portfolios per prompt, with the batches in
+    flight concurrently; any portfolio the batched answer does not cover
+    falls back to its own generate_projection-style analysis.
+
+    Returns:
+        One projection (or {"error": ...}) per request, in request order
+    """
+    from llm.config import get_llm_config
+
+    requests = [{"history_id": "reality", "years": 3, "use_llm": True, **r} for r in requests]
+    inputs = [_build_projection_inputs(r['history_id'], r.get('idea_ids')) for r in requests]
+    analyses = [None] * len(requests)
+
+    llm_indexes = [i for i, r in enumerate(requests) if r['use_llm'] and inputs[i] is not None]
+    if llm_indexes and get_llm_config().enabled:
+        batches = [llm_indexes[i:i + PROJECTION_BATCH_SIZE]
+                   for i in range(0, len(llm_indexes), PROJECTION_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=PROJECTION_MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(_batch_llm_analyses, [
+                    {"holdings": inputs[i]['holdings'], "years": requests[i]['years']} for i in batch
+                ])
+                for batch in batches
+            ]
+            for batch, future in zip(batches, futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"Batched LLM analysis failed: {e}")
+                    continue
+                for i, analysis in zip(batch, results):
+                    analyses[i] = analysis
+
+    def analyze(i: int) -> dict:
+        inp = inputs[i]
+        args = (inp['holdings'], requests[i]['years'], inp['history_context'], inp['idea_context'])
+        if requests[i]['use_llm']:
+            return get_llm_analysis_for_projection(*args)
+        return get_statistical_analysis_for_projection(*args)
+
+    missing = [i for i, inp in enumerate(inputs) if inp is not None and analyses[i] is None]
+    with ThreadPoolExecutor(max_workers=PROJECTION_MAX_WORKERS) as executor:
+        for i, analysis in zip(missing, executor.map(analyze, missing)):
+            analyses[i] = analysis
+
+    return [
+        _finalize_projection(r['history_id'], r['years'], inp, analyses[i])
+        if inp is not None else {"error": "History not found"}
+        for i, (r, inp) in enumerate(zip(requests, inputs))
+    ]
+
+
 def get_llm_analysis_for_projection(holdings: list, years: int, history_context: dict = None, idea_context: dict = None) -> dict:
     """Get LLM-powered analysis of holdings and market trends for projections."""
+    def statistical() -> dict:
+        return get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+
     try:
         from llm.config import get_llm_config
         from llm.client import get_llm_client
 
         config = get_llm_config()
         if not config.enabled:
-            return get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+            return statistical()
 
         # Build analysis prompt (simplified version)
         holdings_summary = "\n".join([
@@ -2187,7 +2914,7 @@ Provide JSON with ticker_analysis and portfolio_projection."""
 
         client = get_llm_client()
         if client is None:
-            return get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+            return statistical()
 
         response = client.generate(prompt, max_tokens=2000)
 
@@ -2202,28 +2929,29 @@ Provide JSON with ticker_analysis and portfolio_projection."""
         except json.JSONDecodeError:
             pass
 
-        return get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+        return statistical()
 
     except Exception as e:
         print(f"LLM analysis failed: {e}")
-        return get_statistical_analysis_for_projection(holdings, years, history_context, idea_context)
+        return statistical()
+
+
+# Default sector characteristics for statistical projections
+_SECTOR_PROFILES = {
+    "TSLA": {"growth": 20, "volatility": 45},
+    "META": {"growth": 15, "volatility": 30},
+    "DEFAULT": {"growth": 10, "volatility": 25}
+}
 
 
 def get_statistical_analysis_for_projection(holdings: list, years: int, history_context: dict = None, idea_context: dict = None) -> dict:
     """Generate statistical analysis for projections without LLM."""
     growth_multiplier = 1.0
 
-    # Default sector characteristics
-    sector_profiles = {
-        "TSLA": {"growth": 20, "volatility": 45},
-        "META": {"growth": 15, "volatility": 30},
-        "DEFAULT": {"growth": 10, "volatility": 25}
-    }
-
     ticker_analysis = {}
     for h in holdings:
         ticker = h['ticker']
-        profile = sector_profiles.get(ticker, sector_profiles["DEFAULT"])
+        profile = _SECTOR_PROFILES.get(ticker, _SECTOR_PROFILES["DEFAULT"])
         base_growth = profile["growth"] * growth_multiplier
 
         ticker_analysis[ticker] = {
@@ -2250,59 +2978,167 @@ def generate_future_frames_for_projection(
     idea_context: dict = None
 ) -> list:
     """Generate monthly frames for the projected future."""
-    frames = []
     ticker_analysis = analysis.get("ticker_analysis", {})
     months = years * 12
 
-    for month in range(months + 1):
-        frame_date = start_date + timedelta(days=month * 30)
-        frame_holdings = []
-        total_value = 0
-
-        for h in holdings:
-            ticker = h["ticker"]
-            current_price = h.get("current_price", 0)
-
-            if current_price <= 0:
-                continue
-
-            ta = ticker_analysis.get(ticker, {})
-            growth_rates = ta.get("annual_growth_rates", {"base": 10})
-            base_growth = growth_rates.get("base", 10)
-            annual_growth = base_growth / 100
-            noise = random.gauss(0, 0.015)
-
-            growth_factor = (1 + annual_growth / 12 + noise) ** month
-            projected_price = current_price * growth_factor
-            holding_value = h["shares"] * projected_price
-            total_value += holding_value
-
-            frame_holdings.append({
-                "ticker": ticker,
-                "shares": h["shares"],
-                "price": round(projected_price, 2),
-                "value": round(holding_value, 2),
-                "change_from_start": round((projected_price / current_price - 1) * 100, 1)
-            })
+    # Holdings with a price, as arrays along a holdings axis
+    priced = [h for h in holdings if h.get("current_price", 0) > 0]
+    tickers = [h["ticker"] for h in priced]
+    shares = [h["shares"] for h in priced]
+    current_prices = np.array([h["current_price"] for h in priced], dtype=np.float64)
+    annual_growth = np.array([
+        ticker_analysis.get(t, {}).get("annual_growth_rates", {"base": 10}).get("base", 10) / 100
+        for t in tickers
+    ], dtype=np.float64)
+
+    # Monthly noise for every holding in one draw
+    month_numbers = np.arange(months + 1)
+    noise = _rng.standard_normal((months + 1, len(priced))) * 0.015
+
+    # months x holdings projections
+    growth_factors = (1 + annual_growth / 12 + noise) ** month_numbers[:, None]
+    projected_prices = current_prices * growth_factors
+    holding_values = np.array(shares, dtype=np.float64) * projected_prices
+    changes = (projected_prices / current_prices - 1) * 100
+
+    # Summed one holding at a time so totals match adding them up per month
+    total_values = np.zeros(months + 1)
+    for i in range(len(priced)):
+        total_values += holding_values[:, i]
+
+    # Round in numpy; per-value round() calls were most of the frame cost,
+    # and a last-digit tie difference (see generate_fallback_projections)
+    # doesn't matter for projected prices
+    projected_prices = np.round(projected_prices, 2).tolist()
+    holding_values = np.round(holding_values, 2).tolist()
+    changes = np.round(changes, 1).tolist()
+    total_values = np.round(total_values, 2).tolist()
+
+    frame_dates = [(start_date + timedelta(days=month * 30)).isoformat()[:10] for month in range(months + 1)]
+    per_holding = list(zip(tickers, shares))
 
+    frames = []
+    for month, frame_date, total_value, prices_row, values_row, changes_row in zip(
+        range(months + 1), frame_dates, total_values, projected_prices, holding_values, changes
+    ):
         frames.append({
-            "date": frame_date.isoformat()[:10],
+            "date": frame_date,
             "month": month,
             "year": round(month / 12, 2),
-            "total_value": round(total_value, 2),
-            "holdings": frame_holdings,
+            "total_value": total_value,
+            "holdings": [
+                {
+                    "ticker": ticker,
+                    "shares": held,
+                    "price": price,
+                    "value": value,
+                    "change_from_start": change
+                }
+                for (ticker, held), price, value, change in zip(per_holding, prices_row, values_row, changes_row)
+            ],
             "is_projection": True
         })
 
     return frames
 
 
+# Fields list_projections reports, kept per projection in the index file
+_PROJECTION_INDEX_FIELDS = ("id", "history_id", "created_at", "years", "end_date")
+# Threads reading projection files that are new or changed since the last listing
+PROJECTION_INDEX_WORKERS = 8
+# In-process half of the index lock; flock in _projection_index_locked() covers
+# other processes. flock belongs to the open file, so threads need this too.
+_projection_index_lock = threading.Lock()
+
+
+def _projection_index_file() -> Path:
+    # Next to the projections directory, not in it, so it is never taken for one
+    return PROJECTIONS_DIR.with_name("projections_index.json")
+
+
+@contextmanager
+def _projection_index_locked():
+    """Hold the projections index lock across threads and processes."""
+    ensure_storage()
+    with _projection_index_lock:
+        with open(_projection_index_file().with_suffix('.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _projection_summary(projection: dict) -> dict:
+    return {field: projection.get(field) for field in _PROJECTION_INDEX_FIELDS}
+
+
+def _read_projection_summary(path: str) -> Optional[dict]:
+    try:
+        return _projection_summary(_loads(Path(path).read_bytes()))
+    except Exception:
+        return None
+
+
+def _load_projection_index() -> list:
+    """Summaries of the saved projections, checked against the directory.
+
+    The index keeps each file's summary with the mtime and size it was read
+    at. Listing the directory only stats the files; just the ones that are
+    new or changed since (saved by another process, restored from a backup,
+    copied in by hand) are read, and removed files drop out.
+
+    Call with _projection_index_locked() held.
+    """
+    index_file = _projection_index_file()
+    try:
+        cached = _loads(index_file.read_bytes())
+        if not isinstance(cached, dict):
+            cached = {}
+    except FileNotFoundError:
+        cached = {}
+    except ValueError:
+        print(f"Rebuilding corrupt projections index {index_file}")
+        cached = {}
+
+    # The index used to live in the directory itself, where globs over
+    # projections/*.json and load_projection('_index') picked it up
+    (PROJECTIONS_DIR / "_index.json").unlink(missing_ok=True)
+
+    stamps = {}
+    with os.scandir(PROJECTIONS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith('.json') and entry.is_file():
+                st = entry.stat()
+                stamps[entry.name] = [st.st_mtime_ns, st.st_size]
+
+    entries = {name: cached[name] for name, stamp in stamps.items()
+               if name in cached and cached[name].get("stamp") == stamp}
+    stale = [name for name in stamps if name not in entries]
+    if stale:
+        # File reads release the GIL, so overlap them
+        with ThreadPoolExecutor(max_workers=PROJECTION_INDEX_WORKERS) as executor:
+            summaries = executor.map(_read_projection_summary, [str(PROJECTIONS_DIR / name) for name in stale])
+            for name, summary in zip(stale, summaries):
+                if summary is not None:
+                    entries[name] = {"stamp": stamps[name], "summary": summary}
+
+    if entries.keys() != cached.keys() or stale:
+        tmp_file = index_file.with_name(f"{index_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(_dumps(entries))
+        os.replace(tmp_file, index_file)
+    return [entry["summary"] for entry in entries.values()]
+
+
 def save_projection(projection: dict):
     """Save a projection to disk."""
     ensure_storage()
     filepath = PROJECTIONS_DIR / f"{projection['id']}.json"
-    with open(filepath, 'w') as f:
-        json.dump(projection, f, indent=2, default=str)
+    # Written aside and renamed, so listings never see a partial file.
+    # Compact: frames x holdings make indentation a large share of the file
+    tmp_file = filepath.with_name(f"{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_file.write_text(_dumps(projection))
+    os.replace(tmp_file, filepath)
 
 
 def load_projection(projection_id: str) -> Optional[dict]:
@@ -2310,28 +3146,19 @@ def load_projection(projection_id: str) -> Optional[dict]:
     filepath = PROJECTIONS_DIR / f"{projection_id}.json"
     if not filepath.exists():
         return None
-    with open(filepath) as f:
-        return json.load(f)
+    return _loads(filepath.read_bytes())
 
 
 def list_projections() -> list:
-    """List all saved projections."""
-    ensure_storage()
-    projections = []
-    for f in PROJECTIONS_DIR.glob("*.json"):
-        try:
-            with open(f) as file:
-                p = json.load(file)
-                projections.append({
-                    "id": p.get("id"),
-                    "history_id": p.get("history_id"),
-                    "created_at": p.get("created_at"),
-                    "years": p.get("years"),
-                    "end_date": p.get("end_date")
-                })
-        except:
-            pass
-    return sorted(projections, key=lambda x: x.get("created_at", ""), reverse=True)
+    """List all saved projections.
+
+    Served from the index file; only projection files that changed since
+    the last listing are read, so the cost does not grow with the size of
+    the projections themselves.
+    """
+    with _projection_index_locked():
+        projections = _load_projection_index()
+    return sorted(projections, key=lambda x: x.get("created_at") or "", reverse=True)
 
 
 def delete_projection(projection_id: str) -> bool:
@@ -20,18 +20,53 @@ Uses parallel processing to scan multiple tickers concurrently.
 
 import asyncio
 import json
-import math
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytz
 import yfinance as yf
+from collections import namedtuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 SCRIPT_DIR = Path(__file__).parent.parent.resolve()
+OPTION_CACHE_DIR = SCRIPT_DIR / "data" / "option_cache"
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Without numba, "compiled" kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # Number of parallel workers for options chain scanning
 MAX_WORKERS = 5
 
+# Parallel option chain requests (one per expiration), across all tickers
+CHAIN_WORKERS = 8
+
+# How long Yahoo quotes and option chains are reused within this process
+QUOTE_CACHE_SECONDS = 300
+
+# How long an option chain saved to disk is reused during the regular session;
+# outside it a chain saved after the last close is reused until the next open
+OPTION_CACHE_TTL = timedelta(minutes=15)
+MARKET_TZ = pytz.timezone('US/Eastern')
+
 
 # ============================================================================
 # Portfolio Data Fetching
@@ -39,11 +74,10 @@ MAX_WORKERS = 5
 
 def get_portfolio_holdings() -> dict:
     """Get current holdings from portfolio state."""
-    from reconstruct_state import load_event_log, reconstruct_state
+    from core.realities import get_reality_state
     from api.database import get_cached_prices
 
-    events_df = load_event_log(str(SCRIPT_DIR / 'data' / 'event_log_enhanced.csv'))
-    state = reconstruct_state(events_df)
+    state = get_reality_state()
 
     # Get cached prices
     cached = get_cached_prices()
@@ -91,20 +125,238 @@ def get_portfolio_holdings() -> dict:
 # Options Chain Fetching
 # ============================================================================
 
-def fetch_options_chain(ticker: str, max_dte: int = 45) -> list:
+def _cache_bucket() -> int:
+    """Current QUOTE_CACHE_SECONDS window; cache keys expire when it moves on."""
+    return int(time.time() // QUOTE_CACHE_SECONDS)
+
+
+@lru_cache(maxsize=128)
+def _cached_ticker(ticker: str, bucket: int) -> yf.Ticker:
+    # yf.Ticker memoizes .info and .options itself, so reusing the object
+    # within a window also reuses those responses
+    return yf.Ticker(ticker)
+
+
+# Option chain columns we read; yfinance often omits the greeks entirely
+_CHAIN_COLUMNS = ['strike', 'bid', 'ask', 'lastPrice', 'delta', 'theta',
+                  'impliedVolatility', 'volume', 'openInterest']
+
+
+# Chain sides as read back from the disk cache, shaped like yfinance's result
+_OptionChain = namedtuple('_OptionChain', ['calls', 'puts'])
+
+
+def _option_cache_file(ticker: str, exp_str: str) -> Path:
+    return OPTION_CACHE_DIR / ticker / f"{exp_str}.parquet"
+
+
+def _last_market_close(now: datetime) -> datetime:
+    """Most recent weekday 16:00 Eastern at or before now (holidays not known)."""
+    close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+    if close > now:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+def _option_cache_fresh(saved: datetime) -> bool:
+    now = datetime.now(MARKET_TZ)
+    if now - saved < OPTION_CACHE_TTL:
+        return True
+    # Quotes don't move outside the regular session
+    minutes = now.hour * 60 + now.minute
+    session_open = now.weekday() < 5 and 9 * 60 + 30 <= minutes < 16 * 60
+    return not session_open and saved >= _last_market_close(now)
+
+
+def _read_option_cache(ticker: str, exp_str: str) -> Optional[_OptionChain]:
+    """A fresh chain from the disk cache, or None."""
+    if pa is None:
+        return None
+    cache_file = _option_cache_file(ticker, exp_str)
+    try:
+        saved = datetime.fromtimestamp(cache_file.stat().st_mtime, MARKET_TZ)
+    except FileNotFoundError:
+        return None
+    if not _option_cache_fresh(saved):
+        return None
+    try:
+        frame = pd.read_parquet(cache_file)
+    except Exception as e:
+        print(f"Ignoring unreadable option cache {cache_file}: {e}")
+        return None
+    is_put = (frame.pop('side') == 'PUT').to_numpy()
+    return _OptionChain(calls=frame[~is_put].reset_index(drop=True),
+                        puts=frame[is_put].reset_index(drop=True))
+
+
+def _write_option_cache(ticker: str, exp_str: str, chain) -> None:
+    """Save the columns _chain_options reads from both sides of a chain."""
+    if pa is None:
+        return
+    cache_file = _option_cache_file(ticker, exp_str)
+    try:
+        frame = pd.concat([
+            chain.puts.reindex(columns=_CHAIN_COLUMNS).astype(float).assign(side='PUT'),
+            chain.calls.reindex(columns=_CHAIN_COLUMNS).astype(float).assign(side='CALL')
+        ], ignore_index=True)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        frame.to_parquet(tmp_file, compression='zstd', index=False)
+        os.replace(tmp_file, cache_file)
+    except Exception as e:
+        print(f"Could not cache options for {ticker} {exp_str}: {e}")
+
+
+# Shared by every fetch_options_chain call, so the per-ticker scans running
+# in parallel (up to MAX_WORKERS) still make at most CHAIN_WORKERS chain
+# requests to Yahoo at once rather than MAX_WORKERS * CHAIN_WORKERS
+_chain_executor = ThreadPoolExecutor(max_workers=CHAIN_WORKERS, thread_name_prefix='option-chain')
+
+
+@lru_cache(maxsize=512)
+def _cached_option_chain(ticker: str, exp_str: str, bucket: int):
+    chain = _read_option_cache(ticker, exp_str)
+    if chain is None:
+        chain = _cached_ticker(ticker, bucket).option_chain(exp_str)
+        _write_option_cache(ticker, exp_str, chain)
+    return chain
+
+
+@lru_cache(maxsize=32)
+def _cached_prices(tickers: tuple, bucket: int) -> dict:
+    data = yf.download(list(tickers), period='5d', progress=False, auto_adjust=False)
+    if data.empty:
+        return {}
+    close = data['Close']
+    if isinstance(close, pd.Series):
+        close = close.to_frame(tickers[0])
+
+    prices = {}
+    for ticker in tickers:
+        if ticker in close.columns:
+            series = close[ticker].dropna()
+            if not series.empty:
+                prices[ticker] = float(series.iloc[-1])
+    return prices
+
+
+def fetch_prices_batch(tickers: list) -> dict:
+    """
+    Latest prices for many tickers from one yf.download call.
+
+    Much lighter than reading stock.info per ticker. Tickers Yahoo has no
+    price for are left out.
+    """
+    if not tickers:
+        return {}
+    try:
+        return dict(_cached_prices(tuple(sorted(set(tickers))), _cache_bucket()))
+    except Exception as e:
+        print(f"Error fetching prices for {', '.join(tickers)}: {e}")
+        return {}
+
+
+def _chain_options(chain_df: pd.DataFrame, option_type: str, ticker: str,
+                   exp_str: str, dte: int, current_price: float) -> list:
+    """
+    Turn one side of an option chain into option contract dicts.
+
+    PUTs become cash-secured puts struck below the current price, CALLs
+    covered calls struck above it. Missing or NaN fields count as 0.
+    """
+    # One float block for all fields, missing columns and NaNs as 0
+    values = chain_df.reindex(columns=_CHAIN_COLUMNS, fill_value=0.0).to_numpy(
+        dtype=np.float64, na_value=0.0)
+    strike, bid, ask, last_price, delta, theta, iv, volume, open_interest = values.T
+
+    # Mid price, falling back to the last trade when either side is missing
+    mid = np.where((bid != 0) & (ask != 0), (bid + ask) / 2, last_price)
+
+    # Only OTM contracts with a usable price
+    is_put = option_type == 'PUT'
+    otm = strike < current_price if is_put else strike > current_price
+    keep = otm & (mid > 0)
+    if not keep.any():
+        return []
+
+    strike, bid, ask, mid = strike[keep], bid[keep], ask[keep], mid[keep]
+    delta = delta[keep]
+    if is_put:
+        delta = np.abs(delta)
+    theta = theta[keep]
+    iv = iv[keep]
+    volume = volume[keep].astype(np.int64)
+    open_interest = open_interest[keep].astype(np.int64)
+
+    # Premium metrics: puts earn on the strike they secure, calls on the shares
+    if is_put:
+        premium_yield = np.divide(mid, strike, out=np.zeros_like(mid), where=strike > 0) * 100
+        # Distance from current price (safety margin)
+        otm_pct = ((current_price - strike) / current_price) * 100
+        collateral = (strike * 100).tolist()
+        strategy = 'Cash-Secured Put'
+    else:
+        premium_yield = (mid / current_price) * 100
+        # Upside before assignment
+        otm_pct = ((strike - current_price) / current_price) * 100
+        collateral = [current_price * 100] * len(mid)
+        strategy = 'Covered Call'
+    annualized_yield = premium_yield / dte * 365
+
+    # Rounded per value, unlike the simulated projections in core.realities:
+    # np.round scales before rounding, so ties can move a quoted figure by
+    # one in the last digit (np.round(1.685, 2) == 1.68, round() gives 1.69)
+    return [
+        {
+            'ticker': ticker,
+            'type': option_type,
+            'strategy': strategy,
+            'expiration': exp_str,
+            'dte': dte,
+            'strike': k,
+            'current_price': current_price,
+            'bid': b,
+            'ask': a,
+            'mid': m,
+            'premium_per_contract': m * 100,
+            'collateral_required': coll,
+            'premium_yield_pct': round(py, 2),
+            'annualized_yield_pct': round(ay, 1),
+            'otm_pct': round(otm_p, 1),
+            'delta': round(d, 3),
+            'theta': round(t, 4) if t else None,
+            'iv': round(v * 100, 1) if v else None,
+            'volume': vol,
+            'open_interest': oi,
+            'prob_otm': round((1 - d) * 100, 1) if d else None
+        }
+        for k, b, a, m, coll, py, ay, otm_p, d, t, v, vol, oi in zip(
+            strike.tolist(), bid.tolist(), ask.tolist(), mid.tolist(), collateral,
+            premium_yield.tolist(), annualized_yield.tolist(), otm_pct.tolist(),
+            delta.tolist(), theta.tolist(), iv.tolist(), volume.tolist(), open_interest.tolist()
+        )
+    ]
+
+
+def fetch_options_chain(ticker: str, max_dte: int = 45, current_price: float = None) -> list:
     """
     Fetch options chain for a ticker within DTE range.
 
     Args:
         ticker: Stock ticker symbol
         max_dte: Maximum days to expiration (default 45)
+        current_price: Underlying price if already known (skips stock.info)
 
     Returns:
         List of option contract dicts with greeks
     """
     try:
-        stock = yf.Ticker(ticker)
-        current_price = stock.info.get('regularMarketPrice') or stock.info.get('currentPrice', 0)
+        bucket = _cache_bucket()
+        stock = _cached_ticker(ticker, bucket)
+        if not current_price:
+            current_price = stock.info.get('regularMarketPrice') or stock.info.get('currentPrice', 0)
 
         if not current_price:
             # Try to get from history
@@ -125,7 +377,7 @@ def fetch_options_chain(ticker: str, max_dte: int = 45) -> list:
             return []
 
         today = datetime.now().date()
-        options = []
+        in_range = []
 
         for exp_str in expirations:
             exp_date = datetime.strptime(exp_str, '%Y-%m-%d').date()
@@ -134,129 +386,27 @@ def fetch_options_chain(ticker: str, max_dte: int = 45) -> list:
             # Filter to our DTE range (7-45 days ideal for theta decay)
             if dte < 7 or dte > max_dte:
                 continue
+            in_range.append((exp_str, dte))
 
+        if not in_range:
+            return []
+
+        def fetch_chain(exp_str):
             try:
-                chain = stock.option_chain(exp_str)
+                return _cached_option_chain(ticker, exp_str, bucket)
             except:
-                continue
-
-            # Process puts (for cash-secured puts)
-            for _, row in chain.puts.iterrows():
-                strike = row['strike']
-
-                # Only consider OTM puts (strike below current price)
-                if strike >= current_price:
-                    continue
-
-                # Calculate key metrics
-                bid = row.get('bid', 0) or 0
-                ask = row.get('ask', 0) or 0
-                mid = (bid + ask) / 2 if bid and ask else row.get('lastPrice', 0)
-
-                if mid <= 0:
-                    continue
-
-                # Greeks (may not always be available, handle NaN)
-                delta = abs(row.get('delta', 0) or 0)
-                if math.isnan(delta): delta = 0
-                theta = row.get('theta', 0) or 0
-                if math.isnan(theta): theta = 0
-                iv = row.get('impliedVolatility', 0) or 0
-                if math.isnan(iv): iv = 0
-                volume = row.get('volume', 0) or 0
-                if math.isnan(volume): volume = 0
-                open_interest = row.get('openInterest', 0) or 0
-                if math.isnan(open_interest): open_interest = 0
-
-                # Calculate premium metrics
-                premium_per_contract = mid * 100
-                collateral = strike * 100
-                premium_yield = (mid / strike) * 100 if strike > 0 else 0
-                annualized_yield = (premium_yield / dte * 365) if dte > 0 else 0
-
-                # Distance from current price (safety margin)
-                otm_pct = ((current_price - strike) / current_price) * 100
-
-                options.append({
-                    'ticker': ticker,
-                    'type': 'PUT',
-                    'strategy': 'Cash-Secured Put',
-                    'expiration': exp_str,
-                    'dte': dte,
-                    'strike': strike,
-                    'current_price': current_price,
-                    'bid': bid,
-                    'ask': ask,
-                    'mid': mid,
-                    'premium_per_contract': premium_per_contract,
-                    'collateral_required': collateral,
-                    'premium_yield_pct': round(premium_yield, 2),
-                    'annualized_yield_pct': round(annualized_yield, 1),
-                    'otm_pct': round(otm_pct, 1),
-                    'delta': round(delta, 3),
-                    'theta': round(theta, 4) if theta else None,
-                    'iv': round(iv * 100, 1) if iv else None,
-                    'volume': int(volume),
-                    'open_interest': int(open_interest),
-                    'prob_otm': round((1 - delta) * 100, 1) if delta else None
-                })
+                return None
 
-            # Process calls (for covered calls)
-            for _, row in chain.calls.iterrows():
-                strike = row['strike']
+        # Each expiration is its own round-trip; queue them all at once
+        chains = list(_chain_executor.map(fetch_chain, [exp_str for exp_str, _ in in_range]))
 
-                # Only consider OTM calls (strike above current price)
-                if strike <= current_price:
-                    continue
-
-                bid = row.get('bid', 0) or 0
-                ask = row.get('ask', 0) or 0
-                mid = (bid + ask) / 2 if bid and ask else row.get('lastPrice', 0)
-
-                if mid <= 0:
-                    continue
+        options = []
+        for (exp_str, dte), chain in zip(in_range, chains):
+            if chain is None:
+                continue
 
-                delta = row.get('delta', 0) or 0
-                if math.isnan(delta): delta = 0
-                theta = row.get('theta', 0) or 0
-                if math.isnan(theta): theta = 0
-                iv = row.get('impliedVolatility', 0) or 0
-                if math.isnan(iv): iv = 0
-                volume = row.get('volume', 0) or 0
-                if math.isnan(volume): volume = 0
-                open_interest = row.get('openInterest', 0) or 0
-                if math.isnan(open_interest): open_interest = 0
-
-                premium_per_contract = mid * 100
-                premium_yield = (mid / current_price) * 100 if current_price > 0 else 0
-                annualized_yield = (premium_yield / dte * 365) if dte > 0 else 0
-
-                # Upside before assignment
-                upside_pct = ((strike - current_price) / current_price) * 100
-
-                options.append({
-                    'ticker': ticker,
-                    'type': 'CALL',
-                    'strategy': 'Covered Call',
-                    'expiration': exp_str,
-                    'dte': dte,
-                    'strike': strike,
-                    'current_price': current_price,
-                    'bid': bid,
-                    'ask': ask,
-                    'mid': mid,
-                    'premium_per_contract': premium_per_contract,
-                    'collateral_required': current_price * 100,
-                    'premium_yield_pct': round(premium_yield, 2),
-                    'annualized_yield_pct': round(annualized_yield, 1),
-                    'otm_pct': round(upside_pct, 1),
-                    'delta': round(delta, 3),
-                    'theta': round(theta, 4) if theta else None,
-                    'iv': round(iv * 100, 1) if iv else None,
-                    'volume': int(volume),
-                    'open_interest': int(open_interest),
-                    'prob_otm': round((1 - delta) * 100, 1) if delta else None
-                })
+            options.extend(_chain_options(chain.puts, 'PUT', ticker, exp_str, dte, current_price))
+            options.extend(_chain_options(chain.calls, 'CALL', ticker, exp_str, dte, current_price))
 
         return options
 
@@ -269,27 +419,15 @@ def fetch_options_chain(ticker: str, max_dte: int = 45) -> list:
 # Option Scoring & Analysis
 # ============================================================================
 
-def score_option(option: dict, context: dict) -> float:
-    """
-    Score an option for income generation suitability.
-
-    Higher scores = better candidates for selling.
-    Uses continuous scoring for better granularity.
-
-    Factors:
-    - Premium yield (annualized) - 40 points max
-    - Safety margin (OTM distance) - 25 points max
-    - Theta decay rate - 10 points max
-    - Probability of profit (delta) - 20 points max
-    - DTE sweet spot - 10 points max
-    - Liquidity (volume, open interest) - 5 points max
+@njit(cache=True)
+def _score_fields(ann_yield, otm_pct, is_put, theta, prob_otm, dte, volume, oi):
+    """score_option on plain numbers, with 0 for any missing field.
 
-    Total: 110 points max, normalized to 100
+    Returns the normalized score before rounding.
     """
     score = 0.0
 
     # Premium yield (0-40 points) - continuous scoring
-    ann_yield = option.get('annualized_yield_pct', 0)
     if ann_yield >= 60:
         score += 40
     elif ann_yield >= 5:
@@ -299,8 +437,7 @@ def score_option(option: dict, context: dict) -> float:
         score += ann_yield * 2  # 0-5% gets 0-10 points
 
     # Safety margin / OTM distance (0-25 points) - continuous
-    otm_pct = option.get('otm_pct', 0)
-    if option['type'] == 'PUT':
+    if is_put:
         # For puts, want good cushion below current price
         if otm_pct >= 20:
             score += 25
@@ -319,7 +456,7 @@ def score_option(option: dict, context: dict) -> float:
             score += otm_pct * (5 / 3)
 
     # Theta decay bonus (0-10 points) - more theta = faster decay = better
-    theta = abs(option.get('theta', 0) or 0)
+    theta = abs(theta)
     if theta > 0:
         # Theta typically ranges from 0.01 to 0.10 for most options
         # Higher theta means faster time decay (good for sellers)
@@ -327,8 +464,6 @@ def score_option(option: dict, context: dict) -> float:
         score += theta_score
 
     # Delta-based probability (0-20 points) - continuous
-    delta = abs(option.get('delta', 0) or 0)
-    prob_otm = option.get('prob_otm')
     if prob_otm:
         if prob_otm >= 90:
             score += 20
@@ -339,7 +474,6 @@ def score_option(option: dict, context: dict) -> float:
             score += max(0, prob_otm - 50) * 0.5  # Below 60% gets minimal points
 
     # DTE sweet spot (0-10 points) - continuous with peak at 35 days
-    dte = option.get('dte', 0)
     # Peak at 35 days, taper off on both sides
     if 28 <= dte <= 42:
         score += 10  # Sweet spot
@@ -355,9 +489,6 @@ def score_option(option: dict, context: dict) -> float:
         score += max(0, 7 - (dte - 50) * 0.1)  # Diminishing returns
 
     # Liquidity (0-5 points) - continuous
-    volume = option.get('volume', 0) or 0
-    oi = option.get('open_interest', 0) or 0
-
     # Volume component (0-2.5 points)
     if volume >= 200:
         score += 2.5
@@ -371,9 +502,112 @@ def score_option(option: dict, context: dict) -> float:
         score += min(2.5, oi / 400)  # Linear up to 1000
 
     # Normalize to 100-point scale (max theoretical is 110)
-    normalized_score = min(100, score * (100 / 110))
+    return min(100.0, score * (100 / 110))
+
+
+@njit(cache=True)
+def _score_batch(ann_yield, otm_pct, is_put, theta, prob_otm, dte, volume, oi):
+    """_score_fields over parallel arrays, one entry per option."""
+    scores = np.empty(len(ann_yield))
+    for i in range(len(ann_yield)):
+        scores[i] = _score_fields(ann_yield[i], otm_pct[i], is_put[i], theta[i],
+                                  prob_otm[i], dte[i], volume[i], oi[i])
+    return scores
+
+
+def _score_arrays(ann_yield, otm_pct, is_put, theta, prob_otm, dte, volume, oi):
+    """_score_fields over parallel arrays as NumPy expressions.
+
+    Used for batches when numba is missing; adds the components in the same
+    order as _score_fields so the scores match it exactly.
+    """
+    # Premium yield (0-40 points)
+    score = np.where(ann_yield >= 60, 40.0,
+                     np.where(ann_yield >= 5, 10 + (ann_yield - 5) * (30 / 55), ann_yield * 2))
+
+    # Safety margin / OTM distance (0-25 points), stricter for puts
+    put_otm = np.where(otm_pct >= 20, 25.0,
+                       np.where(otm_pct >= 3, 5 + (otm_pct - 3) * (20 / 17), otm_pct * (5 / 3)))
+    call_otm = np.where(otm_pct >= 15, 25.0,
+                        np.where(otm_pct >= 3, 5 + (otm_pct - 3) * (20 / 12), otm_pct * (5 / 3)))
+    score = score + np.where(is_put, put_otm, call_otm)
+
+    # Theta decay bonus (0-10 points)
+    theta = np.abs(theta)
+    score = score + np.where(theta > 0, np.minimum(10, theta * 100), 0.0)
+
+    # Delta-based probability (0-20 points); 0 means unknown
+    prob_score = np.select(
+        [prob_otm >= 90, prob_otm >= 60],
+        [20.0, 5 + (prob_otm - 60) * (15 / 30)],
+        np.maximum(0, prob_otm - 50) * 0.5
+    )
+    score = score + np.where(prob_otm != 0, prob_score, 0.0)
+
+    # DTE sweet spot (0-10 points)
+    score = score + np.select(
+        [(28 <= dte) & (dte <= 42), (21 <= dte) & (dte < 28), (42 < dte) & (dte <= 50),
+         (14 <= dte) & (dte < 21), (7 <= dte) & (dte < 14), dte > 50],
+        [10.0, 7 + (dte - 21) * (3 / 7), 10 - (dte - 42) * (3 / 8),
+         4 + (dte - 14) * (3 / 7), 2 + (dte - 7) * (2 / 7), np.maximum(0, 7 - (dte - 50) * 0.1)],
+        0.0
+    )
 
-    return round(normalized_score, 1)
+    # Liquidity (0-5 points)
+    score = score + np.where(volume >= 200, 2.5, np.minimum(2.5, volume / 80))
+    score = score + np.where(oi >= 1000, 2.5, np.minimum(2.5, oi / 400))
+
+    return np.minimum(100.0, score * (100 / 110))
+
+
+def _score_inputs(option: dict) -> tuple:
+    """The fields score_option reads, in _score_fields order."""
+    return (
+        option.get('annualized_yield_pct', 0),
+        option.get('otm_pct', 0),
+        option['type'] == 'PUT',
+        option.get('theta', 0) or 0,
+        option.get('prob_otm') or 0,
+        option.get('dte', 0),
+        option.get('volume', 0) or 0,
+        option.get('open_interest', 0) or 0
+    )
+
+
+def score_option(option: dict, context: dict) -> float:
+    """
+    Score an option for income generation suitability.
+
+    Higher scores = better candidates for selling.
+    Uses continuous scoring for better granularity.
+
+    Factors:
+    - Premium yield (annualized) - 40 points max
+    - Safety margin (OTM distance) - 25 points max
+    - Theta decay rate - 10 points max
+    - Probability of profit (delta) - 20 points max
+    - DTE sweet spot - 10 points max
+    - Liquidity (volume, open interest) - 5 points max
+
+    Total: 110 points max, normalized to 100
+    """
+    return round(_score_fields(*_score_inputs(option)), 1)
+
+
+def score_options(options: list, context: dict = None) -> list:
+    """
+    Score many options at once; same scores as score_option on each.
+
+    With numba the batch runs as one compiled loop, otherwise as NumPy
+    array expressions.
+    """
+    if not options:
+        return []
+    columns = zip(*(_score_inputs(o) for o in options))
+    arrays = [np.array(c, dtype=np.float64) for c in columns]
+    arrays[2] = arrays[2].astype(np.bool_)
+    score_batch = _score_batch if NUMBA_AVAILABLE else _score_arrays
+    return [round(score, 1) for score in score_batch(*arrays).tolist()]
 
 
 def calculate_contract_recommendation(option: dict, context: dict) -> dict:
@@ -460,7 +694,8 @@ def calculate_break_even(option: dict) -> float:
         return round(strike + mid, 2)
 
 
-def scan_ticker_options(ticker: str, max_dte: int, holding_info: dict = None) -> Tuple[str, List[dict], str]:
+def scan_ticker_options(ticker: str, max_dte: int, holding_info: dict = None,
+                        price: float = None) -> Tuple[str, List[dict], str]:
     """
     Scan a single ticker for options opportunities.
 
@@ -470,12 +705,13 @@ def scan_ticker_options(ticker: str, max_dte: int, holding_info: dict = None) ->
         ticker: Stock ticker symbol
         max_dte: Maximum days to expiration
         holding_info: Optional holding info (shares, avg_cost) for covered calls
+        price: Optional current price, e.g. from fetch_prices_batch
 
     Returns:
         Tuple of (ticker, options_list, error_message)
     """
     try:
-        options = fetch_options_chain(ticker, max_dte)
+        options = fetch_options_chain(ticker, max_dte, current_price=price)
 
         if not options:
             return (ticker, [], f"{ticker}: No options data available")
@@ -535,15 +771,15 @@ def get_recommendations(
     remaining_goal = portfolio['remaining_goal']
 
     # Load idea tags for matching (only from enabled, non-archived ideas)
-    idea_tags = set()
+    idea_tags = frozenset()
     try:
         from api.routes.ideas import get_ideas
-        ideas = get_ideas()
-        for idea in ideas:
-            # Only include tags from enabled and non-archived ideas
-            if idea.get('status') != 'archived' and idea.get('enabled', True):
-                for tag in idea.get('tags', []):
-                    idea_tags.add(tag.upper())
+        idea_tags = frozenset(
+            tag.upper()
+            for idea in get_ideas()
+            if idea.get('status') != 'archived' and idea.get('enabled', True)
+            for tag in idea.get('tags', [])
+        )
     except Exception:
         pass  # Ideas not available, continue without matching
 
@@ -555,11 +791,14 @@ def get_recommendations(
     for ticker, info in holdings.items():
         scan_tasks.append((ticker, max_dte, info))
 
+    # One price request for every holding instead of stock.info per ticker
+    prices = fetch_prices_batch(list(holdings))
+
     # Run scans in parallel using ThreadPoolExecutor
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         # Submit all tasks
         future_to_ticker = {
-            executor.submit(scan_ticker_options, ticker, max_dte, info): ticker
+            executor.submit(scan_ticker_options, ticker, max_dte, info, prices.get(ticker)): ticker
             for ticker, max_dte_arg, info in [(t[0], t[1], t[2]) for t in scan_tasks]
         }
 
@@ -575,11 +814,13 @@ def get_recommendations(
 
                 # Get holding info for this ticker
                 info = holdings.get(ticker, {})
+                # Same for every option of this ticker
+                matches_idea = ticker.upper() in idea_tags
 
                 # Process calls (covered calls)
                 calls = [o for o in options if o['type'] == 'CALL']
-                for opt in calls:
-                    opt['score'] = score_option(opt, portfolio)
+                for opt, score in zip(calls, score_options(calls, portfolio)):
+                    opt['score'] = score
                     if opt['premium_per_contract'] >= min_premium:
                         # Add enhanced metrics
                         opt['break_even'] = calculate_break_even(opt)
@@ -593,18 +834,14 @@ def get_recommendations(
                         opt['assignment_risk_pct'] = round(abs(opt.get('delta', 0) or 0) * 100, 1)
                         # Time decay per day (theta is negative for options, so abs)
                         opt['daily_decay'] = round(abs(opt.get('theta', 0) or 0) * 100, 2)
-                        # Check if ticker matches any idea tag
-                        opt['matches_idea'] = ticker.upper() in idea_tags
+                        opt['matches_idea'] = matches_idea
                         all_options.append(opt)
 
                 # Process puts (cash-secured puts)
-                puts = [o for o in options if o['type'] == 'PUT']
-                for opt in puts:
-                    collateral = opt['collateral_required']
-                    if collateral > cash * 0.5:
-                        continue
+                puts = [o for o in options if o['type'] == 'PUT' and o['collateral_required'] <= cash * 0.5]
+                for opt, score in zip(puts, score_options(puts, portfolio)):
                     opt['cash_available'] = cash
-                    opt['score'] = score_option(opt, portfolio)
+                    opt['score'] = score
                     if opt['premium_per_contract'] >= min_premium:
                         # Add enhanced metrics
                         opt['break_even'] = calculate_break_even(opt)
@@ -618,8 +855,7 @@ def get_recommendations(
                         opt['assignment_risk_pct'] = round(abs(opt.get('delta', 0) or 0) * 100, 1)
                         # Time decay per day (theta is negative for options, so abs)
                         opt['daily_decay'] = round(abs(opt.get('theta', 0) or 0) * 100, 2)
-                        # Check if ticker matches any idea tag
-                        opt['matches_idea'] = ticker.upper() in idea_tags
+                        opt['matches_idea'] = matches_idea
                         all_options.append(opt)
 
             except Exception as e:
@@ -664,7 +900,7 @@ def get_llm_analysis(recommendations: list, portfolio: dict) -> dict:
         # Build context for LLM
         top_picks = recommendations[:5]
 
-        context = f"""
+        parts = [f"""
 Analyze these options selling opportunities for an income-focused portfolio:
 
 Portfolio Context:
@@ -674,9 +910,8 @@ Portfolio Context:
 - Cash Available: ${portfolio['cash']:,.0f}
 
 Top Recommendations:
-"""
-        for i, rec in enumerate(top_picks, 1):
-            context += f"""
+"""]
+        parts.extend(f"""
 {i}. {rec['ticker']} {rec['type']} ${rec['strike']} exp {rec['expiration']}
    - Strategy: {rec['strategy']}
    - Premium: ${rec['premium_per_contract']:.0f}/contract
@@ -685,7 +920,8 @@ Top Recommendations:
    - Delta: {rec['delta']:.3f}
    - DTE: {rec['dte']} days
    - Score: {rec['score']:.0f}/100
-"""
+""" for i, rec in enumerate(top_picks, 1))
+        context = ''.join(parts)
 
         prompt = f"""{context}
 
@@ -938,9 +1174,10 @@ async def get_agent_recommendations(
     research_data = {}
 
     # 1. Fetch options chains in parallel
+    prices = fetch_prices_batch(list(holdings))
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
-            executor.submit(fetch_options_chain, ticker, max_dte): ticker
+            executor.submit(fetch_options_chain, ticker, max_dte, prices.get(ticker)): ticker
             for ticker in holdings.keys()
         }
 
@@ -950,8 +1187,8 @@ async def get_agent_recommendations(
                 options = future.result()
                 if options:
                     # Pre-score and filter options
-                    for opt in options:
-                        opt['score'] = score_option(opt, portfolio)
+                    for opt, score in zip(options, score_options(options, portfolio)):
+                        opt['score'] = score
 
                         # Filter by premium threshold
                         if opt['premium_per_contract'] >= min_premium:
@@ -39,19 +39,16 @@ def load_starting_state(filepath='starting_state.json'):
     with open(filepath, 'r') as f:
         return json.load(f)
 
-def reconstruct_state(events_df, as_of_timestamp=None, ticker_filter=None):
+def new_state(as_of_timestamp=None):
     """
-    Reconstruct portfolio state by replaying events
-    
+    Portfolio state before any events: the starting state's cash and holdings
+
     Args:
-        events_df: DataFrame of events
-        as_of_timestamp: Optional datetime to stop reconstruction
-        ticker_filter: Optional ticker to filter events
-    
+        as_of_timestamp: Optional datetime the state is reconstructed as of
+
     Returns:
-        dict: Complete portfolio state
+        dict: Portfolio state to replay events into with apply_event()
     """
-    
     # Load starting state
     starting = load_starting_state(SCRIPT_DIR / 'data' / 'starting_state.json')
     
@@ -87,212 +84,218 @@ def reconstruct_state(events_df, as_of_timestamp=None, ticker_filter=None):
                 'avg_price': info['cost_basis_per_share']
             }
     
-    # Replay events
-    for idx, event in events_df.iterrows():
-        # Stop if past desired timestamp
-        if as_of_timestamp and event['timestamp'] > pd.to_datetime(as_of_timestamp):
-            break
-        
-        # Filter by ticker if specified
-        if ticker_filter:
-            event_ticker = event['data'].get('ticker', '')
-            if event_ticker != ticker_filter:
-                continue
+    return state
+
+def apply_event(state, event):
+    """
+    Apply one event (an event log row) to a portfolio state in place
+
+    Replaying a log's events in order through apply_event() and then calling
+    finalize_state() is what reconstruct_state() does, so callers that need
+    states at several points of one log can carry a state forward instead of
+    replaying from the start each time.
+    """
+    # Process event based on type
+    event_type = event['event_type']
+    data = event['data']
+    
+    if event_type == 'TRADE':
+        ticker = data['ticker']
+        action = data['action']
+        shares = data.get('shares', 0)
         
-        # Process event based on type
-        event_type = event['event_type']
-        data = event['data']
+        # Handle "multiple" or "partial" shares
+        if isinstance(shares, str):
+            shares = 0  # Will need to be filled in later
         
-        if event_type == 'TRADE':
-            ticker = data['ticker']
-            action = data['action']
-            shares = data.get('shares', 0)
+        if action == 'BUY':
+            # Add to holdings
+            state['holdings'][ticker] = state['holdings'].get(ticker, 0) + shares
             
-            # Handle "multiple" or "partial" shares
-            if isinstance(shares, str):
-                shares = 0  # Will need to be filled in later
+            # Update cost basis
+            if ticker not in state['cost_basis']:
+                state['cost_basis'][ticker] = {'total_cost': 0, 'shares': 0, 'avg_price': 0}
             
-            if action == 'BUY':
-                # Add to holdings
-                state['holdings'][ticker] = state['holdings'].get(ticker, 0) + shares
-                
-                # Update cost basis
-                if ticker not in state['cost_basis']:
-                    state['cost_basis'][ticker] = {'total_cost': 0, 'shares': 0, 'avg_price': 0}
-                
-                cost_basis = state['cost_basis'][ticker]
-                cost_basis['total_cost'] += data.get('total', 0)
-                cost_basis['shares'] += shares
-                if cost_basis['shares'] > 0:
-                    cost_basis['avg_price'] = cost_basis['total_cost'] / cost_basis['shares']
-                
-            elif action == 'SELL':
-                # Remove from holdings
-                state['holdings'][ticker] = state['holdings'].get(ticker, 0) - shares
-
-                # Calculate gain from cost basis if not provided
-                gain = data.get('gain_loss', 0)
-                if gain == 0 and shares > 0 and ticker in state['cost_basis']:
-                    cost_basis = state['cost_basis'][ticker]
-                    avg_cost = cost_basis.get('avg_price', 0)
-                    sell_price = data.get('price', 0)
-                    sale_total = data.get('total', 0)
+            cost_basis = state['cost_basis'][ticker]
+            cost_basis['total_cost'] += data.get('total', 0)
+            cost_basis['shares'] += shares
+            if cost_basis['shares'] > 0:
+                cost_basis['avg_price'] = cost_basis['total_cost'] / cost_basis['shares']
+            
+        elif action == 'SELL':
+            # Remove from holdings
+            state['holdings'][ticker] = state['holdings'].get(ticker, 0) - shares
 
-                    # Calculate gain: sale proceeds - cost of shares sold
-                    cost_of_shares_sold = shares * avg_cost
-                    if sale_total > 0:
-                        gain = sale_total - cost_of_shares_sold
-                    elif sell_price > 0:
-                        gain = (shares * sell_price) - cost_of_shares_sold
+            # Calculate gain from cost basis if not provided
+            gain = data.get('gain_loss', 0)
+            if gain == 0 and shares > 0 and ticker in state['cost_basis']:
+                cost_basis = state['cost_basis'][ticker]
+                avg_cost = cost_basis.get('avg_price', 0)
+                sell_price = data.get('price', 0)
+                sale_total = data.get('total', 0)
 
-                # Update cost basis (reduce proportionally)
-                if ticker in state['cost_basis'] and shares > 0:
-                    cost_basis = state['cost_basis'][ticker]
-                    proportion = shares / cost_basis['shares'] if cost_basis['shares'] > 0 else 0
-                    cost_basis['total_cost'] *= (1 - proportion)
-                    cost_basis['shares'] -= shares
-                    if cost_basis['shares'] > 0:
-                        cost_basis['avg_price'] = cost_basis['total_cost'] / cost_basis['shares']
+                # Calculate gain: sale proceeds - cost of shares sold
+                cost_of_shares_sold = shares * avg_cost
+                if sale_total > 0:
+                    gain = sale_total - cost_of_shares_sold
+                elif sell_price > 0:
+                    gain = (shares * sell_price) - cost_of_shares_sold
 
-                # Track gains - only count YTD (current year)
-                event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
-                current_year = datetime.now().year
-                if event_year == current_year:
-                    if gain >= 0:
-                        state['ytd_realized_gains'] += gain
-                    else:
-                        state['ytd_realized_losses'] += abs(gain)
-                    state['ytd_trading_gains'] += gain  # Net for backwards compat
-                    state['ytd_income'] += gain
-            
-            # Update cash
-            state['cash'] += event['cash_delta']
-        
-        elif event_type == 'OPTION_OPEN':
-            state['active_options'].append({
-                'event_id': event['event_id'],
-                'position_id': data.get('position_id', ''),
-                'ticker': data['ticker'],
-                'strategy': data['strategy'],
-                'strike': data['strike'],
-                'expiration': data['expiration'],
-                'contracts': data.get('contracts', 1),
-                'total_premium': data.get('total_premium', data.get('premium', 0))
-            })
+            # Update cost basis (reduce proportionally)
+            if ticker in state['cost_basis'] and shares > 0:
+                cost_basis = state['cost_basis'][ticker]
+                proportion = shares / cost_basis['shares'] if cost_basis['shares'] > 0 else 0
+                cost_basis['total_cost'] *= (1 - proportion)
+                cost_basis['shares'] -= shares
+                if cost_basis['shares'] > 0:
+                    cost_basis['avg_price'] = cost_basis['total_cost'] / cost_basis['shares']
 
-            # Track option income - only count YTD (current year) for SELL options
-            action = data.get('action', 'SELL')
+            # Track gains - only count YTD (current year)
             event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
             current_year = datetime.now().year
-            if event_year == current_year and action == 'SELL':
-                premium = data.get('total_premium', data.get('premium', 0))
-                state['ytd_option_income'] += premium
-                state['ytd_income'] += premium
-            state['cash'] += event['cash_delta']
+            if event_year == current_year:
+                if gain >= 0:
+                    state['ytd_realized_gains'] += gain
+                else:
+                    state['ytd_realized_losses'] += abs(gain)
+                state['ytd_trading_gains'] += gain  # Net for backwards compat
+                state['ytd_income'] += gain
         
-        elif event_type in ['OPTION_CLOSE', 'OPTION_EXPIRE', 'OPTION_ASSIGN']:
-            # Remove from active options - try multiple matching strategies
-            position_id = data.get('position_id')
-            option_id = data.get('option_id')
-            uuid = data.get('uuid')
+        # Update cash
+        state['cash'] += event['cash_delta']
+    
+    elif event_type == 'OPTION_OPEN':
+        state['active_options'].append({
+            'event_id': event['event_id'],
+            'position_id': data.get('position_id', ''),
+            'ticker': data['ticker'],
+            'strategy': data['strategy'],
+            'strike': data['strike'],
+            'expiration': data['expiration'],
+            'contracts': data.get('contracts', 1),
+            'total_premium': data.get('total_premium', data.get('premium', 0))
+        })
 
-            # Track initial count to see if we matched
-            initial_count = len(state['active_options'])
+        # Track option income - only count YTD (current year) for SELL options
+        action = data.get('action', 'SELL')
+        event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
+        current_year = datetime.now().year
+        if event_year == current_year and action == 'SELL':
+            premium = data.get('total_premium', data.get('premium', 0))
+            state['ytd_option_income'] += premium
+            state['ytd_income'] += premium
+        state['cash'] += event['cash_delta']
+    
+    elif event_type in ['OPTION_CLOSE', 'OPTION_EXPIRE', 'OPTION_ASSIGN']:
+        # Remove from active options - try multiple matching strategies
+        position_id = data.get('position_id')
+        option_id = data.get('option_id')
+        uuid = data.get('uuid')
 
-            # Try option_id first (most reliable for imported data)
-            if option_id:
-                state['active_options'] = [opt for opt in state['active_options']
-                                          if opt['event_id'] != option_id]
+        # Track initial count to see if we matched
+        initial_count = len(state['active_options'])
 
-            # If no match, try position_id
-            if len(state['active_options']) == initial_count and position_id:
-                state['active_options'] = [opt for opt in state['active_options']
-                                          if opt.get('position_id') != position_id]
+        # Try option_id first (most reliable for imported data)
+        if option_id:
+            state['active_options'] = [opt for opt in state['active_options']
+                                      if opt['event_id'] != option_id]
 
-            # If still no match, try uuid
-            if len(state['active_options']) == initial_count and uuid:
-                state['active_options'] = [opt for opt in state['active_options']
-                                          if opt.get('uuid') != uuid]
+        # If no match, try position_id
+        if len(state['active_options']) == initial_count and position_id:
+            state['active_options'] = [opt for opt in state['active_options']
+                                      if opt.get('position_id') != position_id]
 
-            # Track profit - only count YTD (current year)
-            profit = data.get('profit', 0)
-            event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
-            current_year = datetime.now().year
-            if event_year == current_year:
-                state['ytd_option_income'] += profit
-                state['ytd_income'] += profit
+        # If still no match, try uuid
+        if len(state['active_options']) == initial_count and uuid:
+            state['active_options'] = [opt for opt in state['active_options']
+                                      if opt.get('uuid') != uuid]
 
-            # Update cash (e.g., buying back an option costs money)
-            state['cash'] += event['cash_delta']
-        
-        elif event_type == 'DIVIDEND':
-            amount = data['amount']
-            # Track dividends - only count YTD (current year)
-            event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
-            current_year = datetime.now().year
-            if event_year == current_year:
-                state['ytd_dividends'] += amount
-                state['ytd_income'] += amount
-            state['cash'] += event['cash_delta']
-        
-        elif event_type == 'WITHDRAWAL':
-            state['withdrawals'] += abs(event['cash_delta'])
-            state['cash'] += event['cash_delta']
-        
-        elif event_type == 'DEPOSIT':
-            state['cash'] += event['cash_delta']
-        
-        elif event_type == 'PRICE_UPDATE':
-            prices = data.get('prices', {})
-            state['latest_prices'].update(prices)
-        
-        elif event_type == 'NOTE':
-            category = data.get('category', 'general')
-            if category == 'investment_thesis':
-                ticker = data['ticker']
-                state['theses'][ticker] = data['content']
-            else:
-                state['notes'].append({
-                    'timestamp': event['timestamp'],
-                    'category': category,
-                    'content': data['content']
-                })
-        
-        elif event_type == 'GOAL_UPDATE':
-            state['goals'].append({
+        # Track profit - only count YTD (current year)
+        profit = data.get('profit', 0)
+        event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
+        current_year = datetime.now().year
+        if event_year == current_year:
+            state['ytd_option_income'] += profit
+            state['ytd_income'] += profit
+
+        # Update cash (e.g., buying back an option costs money)
+        state['cash'] += event['cash_delta']
+    
+    elif event_type == 'DIVIDEND':
+        amount = data['amount']
+        # Track dividends - only count YTD (current year)
+        event_year = event['timestamp'].year if hasattr(event['timestamp'], 'year') else pd.to_datetime(event['timestamp']).year
+        current_year = datetime.now().year
+        if event_year == current_year:
+            state['ytd_dividends'] += amount
+            state['ytd_income'] += amount
+        state['cash'] += event['cash_delta']
+    
+    elif event_type == 'WITHDRAWAL':
+        state['withdrawals'] += abs(event['cash_delta'])
+        state['cash'] += event['cash_delta']
+    
+    elif event_type == 'DEPOSIT':
+        state['cash'] += event['cash_delta']
+    
+    elif event_type == 'PRICE_UPDATE':
+        prices = data.get('prices', {})
+        state['latest_prices'].update(prices)
+    
+    elif event_type == 'NOTE':
+        category = data.get('category', 'general')
+        if category == 'investment_thesis':
+            ticker = data['ticker']
+            state['theses'][ticker] = data['content']
+        else:
+            state['notes'].append({
                 'timestamp': event['timestamp'],
-                'type': data['goal_type'],
+                'category': category,
                 'content': data['content']
             })
-        
-        elif event_type == 'STRATEGY_UPDATE':
-            state['strategies'].append({
-                'timestamp': event['timestamp'],
-                'name': data['strategy_name'],
-                'details': {k: v for k, v in data.items() if k != 'strategy_name'}
-            })
+    
+    elif event_type == 'GOAL_UPDATE':
+        state['goals'].append({
+            'timestamp': event['timestamp'],
+            'type': data['goal_type'],
+            'content': data['content']
+        })
+    
+    elif event_type == 'STRATEGY_UPDATE':
+        state['strategies'].append({
+            'timestamp': event['timestamp'],
+            'name': data['strategy_name'],
+            'details': {k: v for k, v in data.items() if k != 'strategy_name'}
+        })
 
-        elif event_type == 'ADJUSTMENT':
-            # Cash adjustments (journal entries, reconciliation, etc.)
-            state['cash'] += event['cash_delta']
+    elif event_type == 'ADJUSTMENT':
+        # Cash adjustments (journal entries, reconciliation, etc.)
+        state['cash'] += event['cash_delta']
 
-            # Handle cost basis adjustments
-            adj_type = data.get('type', '')
-            if adj_type == 'COST_BASIS_SYNC' and 'adjustments' in data:
-                for ticker, adj in data['adjustments'].items():
-                    if ticker in state['cost_basis']:
-                        target_cost = adj.get('target', adj.get('new_value', 0))
-                        if target_cost > 0:
-                            shares = state['cost_basis'][ticker]['shares']
-                            state['cost_basis'][ticker]['total_cost'] = target_cost
-                            state['cost_basis'][ticker]['avg_price'] = target_cost / shares if shares > 0 else 0
+        # Handle cost basis adjustments
+        adj_type = data.get('type', '')
+        if adj_type == 'COST_BASIS_SYNC' and 'adjustments' in data:
+            for ticker, adj in data['adjustments'].items():
+                if ticker in state['cost_basis']:
+                    target_cost = adj.get('target', adj.get('new_value', 0))
+                    if target_cost > 0:
+                        shares = state['cost_basis'][ticker]['shares']
+                        state['cost_basis'][ticker]['total_cost'] = target_cost
+                        state['cost_basis'][ticker]['avg_price'] = target_cost / shares if shares > 0 else 0
 
-        elif event_type == 'INSIGHT_LOG':
-            # AI insight usage logging - no state change
-            pass
+    elif event_type == 'INSIGHT_LOG':
+        # AI insight usage logging - no state change
+        pass
 
-        state['events_processed'] += 1
-    
+    state['events_processed'] += 1
+
+def finalize_state(state):
+    """
+    Fill in the derived values (holdings value, total value, unrealized gains)
+
+    Recomputed from scratch on each call, so a state can keep receiving
+    events after being finalized.
+    """
     # Calculate current portfolio value
     state['portfolio_value'] = 0
     state['holdings_value'] = {}
@@ -315,6 +318,36 @@ def reconstruct_state(events_df, as_of_timestamp=None, ticker_filter=None):
     
     return state
 
+def reconstruct_state(events_df, as_of_timestamp=None, ticker_filter=None):
+    """
+    Reconstruct portfolio state by replaying events
+    
+    Args:
+        events_df: DataFrame of events
+        as_of_timestamp: Optional datetime to stop reconstruction
+        ticker_filter: Optional ticker to filter events
+    
+    Returns:
+        dict: Complete portfolio state
+    """
+    state = new_state(as_of_timestamp)
+    
+    # Replay events (plain dicts are far cheaper to build than iterrows' Series)
+    for event in events_df.to_dict('records'):
+        # Stop if past desired timestamp
+        if as_of_timestamp and event['timestamp'] > pd.to_datetime(as_of_timestamp):
+            break
+        
+        # Filter by ticker if specified
+        if ticker_filter:
+            event_ticker = event['data'].get('ticker', '')
+            if event_ticker != ticker_filter:
+                continue
+        
+        apply_event(state, event)
+    
+    return finalize_state(state)
+
 def print_state(state):
     """Pretty print the portfolio state"""
     print("="*80)
@@ -0,0 +1,374 @@
+"""
+Tests for the core data access layer (core/data.py).
+
+Each test runs against a throwaway copy of the event log so the real
+data/event_log_enhanced.csv is never touched.
+"""
+
+import pytest
+import pandas as pd
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.data as data
+
+HEADER = 'event_id,timestamp,event_type,data_json,reason_json,notes,tags_json,affects_cash,cash_delta\n'
+SEED_ROWS = [
+    '1,2026-01-02 09:30:00,DEPOSIT,"{""amount"": 1000}",{},Initial,[],True,1000.0\n',
+    '2,2026-01-02 10:00:00,TRADE,"{""action"": ""BUY"", ""ticker"": ""TSLA"", ""shares"": 1, ""price"": 400, ""total"": 400}",{},,"[""trade""]",True,-400.0\n',
+]
+
+
+@pytest.fixture
+def event_log(tmp_path, monkeypatch):
+    """Point core.data at a temporary event log seeded with two events."""
+    csv_path = tmp_path / 'event_log_enhanced.csv'
+    csv_path.write_text(HEADER + ''.join(SEED_ROWS))
+    monkeypatch.setattr(data, 'CSV_PATH', csv_path)
+    data._invalidate_cache()
+    yield csv_path
+    data._invalidate_cache()
+
+
+class TestWriteLocking:
+    """Test concurrent writers through the shared lock"""
+
+    def test_concurrent_appends_get_unique_ids(self, event_log):
+        """Threads appending at the same time must not lose or duplicate events"""
+        def writer():
+            for _ in range(5):
+                data.append_event('NOTE', {'content': 'x'})
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        df = data.load_events(parse_json=False)
+        assert len(df) == 2 + 20
+        assert df['event_id'].is_unique
+
+    def test_nested_lock_does_not_deadlock(self, event_log):
+        """A writer holding the lock can still read and write"""
+        with data.csv_lock('w'):
+            event_id = data.append_event('NOTE', {'content': 'nested'})
+            df = data.load_events(parse_json=False)
+
+        assert event_id == 3
+        assert len(df) == 3
+
+    def test_write_inside_read_lock(self, event_log):
+        """A nested write upgrades an outer read lock instead of deadlocking"""
+        with data.csv_lock('r'):
+            event_id = data.append_event('NOTE', {'content': 'upgraded'})
+
+        assert event_id == 3
+        assert data._lock_state.mode is None
+
+    def test_lock_file_opened_once(self, event_log):
+        """Repeated locking reuses one lock file handle"""
+        with data.csv_lock('r'):
+            pass
+        fd = data._lock_files[event_log.with_suffix('.lock')][1].fileno()
+        data.append_event('NOTE', {'content': 'x'})
+        data.load_events(parse_json=False)
+
+        assert data._lock_files[event_log.with_suffix('.lock')][1].fileno() == fd
+
+
+class TestAppendEvent:
+    """Test append-only event writes"""
+
+    def test_append_keeps_existing_bytes(self, event_log):
+        """Appending must not rewrite earlier rows"""
+        before = event_log.read_text()
+        event_id = data.append_event('DEPOSIT', {'amount': 50}, affects_cash=True, cash_delta=50)
+
+        after = event_log.read_text()
+        assert event_id == 3
+        assert after.startswith(before)
+        assert after.count('\n') == before.count('\n') + 1
+
+    def test_appended_row_round_trips(self, event_log):
+        """The appended row reads back with the same values"""
+        event_id = data.append_event(
+            'TRADE', {'action': 'SELL', 'ticker': 'TSLA', 'total': 450},
+            notes='Took profit, "quoted"', tags=['trade'], affects_cash=True, cash_delta=450
+        )
+
+        event = data.get_event_by_id(event_id)
+        assert event['data']['ticker'] == 'TSLA'
+        assert event['notes'] == 'Took profit, "quoted"'
+        assert event['tags'] == ['trade']
+        assert bool(event['affects_cash']) is True
+        assert event['cash_delta'] == 450.0
+
+    def test_next_id_after_external_rewrite(self, event_log):
+        """A stale .maxid sidecar is ignored once the CSV changes underneath it"""
+        data.append_event('NOTE', {'content': 'a'})
+        with open(event_log, 'a') as f:
+            f.write('10,2026-01-03 09:00:00,NOTE,{},{},,[],False,0.0\n')
+
+        assert data.get_next_event_id() == 11
+        assert data.append_event('NOTE', {'content': 'b'}) == 11
+
+
+class TestGetEvents:
+    """Test filtered event queries"""
+
+    def test_filter_by_ticker_is_case_insensitive(self, event_log):
+        """Ticker filter matches regardless of case and ignores other tickers"""
+        data.append_event('TRADE', {'action': 'BUY', 'ticker': 'META', 'total': 100})
+
+        events = data.get_events(ticker='tsla')
+        assert [e['event_id'] for e in events] == [2]
+
+    def test_filter_by_event_type_and_limit(self, event_log):
+        """Type filter and limit return the most recent matching events first"""
+        for i in range(3):
+            data.append_event('NOTE', {'content': str(i)})
+
+        events = data.get_events(event_type='NOTE', limit=2)
+        assert [e['event_id'] for e in events] == [5, 4]
+        assert events[0]['data'] == {'content': '2'}
+
+
+class TestLoadEventsCache:
+    """Test the in-process parsed CSV cache"""
+
+    def test_repeat_loads_reuse_parsed_frame(self, event_log, monkeypatch):
+        """A second load with an unchanged file does not re-read the CSV"""
+        data.load_events()
+        calls = []
+        real_read_csv = data.pd.read_csv
+        monkeypatch.setattr(data.pd, 'read_csv', lambda *a, **k: calls.append(a) or real_read_csv(*a, **k))
+
+        df = data.load_events()
+        assert len(df) == 2
+        assert calls == []
+
+    def test_external_change_invalidates_cache(self, event_log):
+        """Rows written by another process show up on the next load"""
+        data.load_events()
+        with open(event_log, 'a') as f:
+            f.write('3,2026-01-03 09:00:00,NOTE,"{""content"": ""external""}",{},,[],False,0.0\n')
+
+        df = data.load_events()
+        assert df['event_id'].tolist() == [1, 2, 3]
+        assert df.iloc[-1]['data'] == {'content': 'external'}
+
+    def test_returned_frame_is_a_copy(self, event_log):
+        """Mutating a returned frame does not leak into later loads"""
+        df = data.load_events(parse_json=False)
+        df.loc[0, 'notes'] = 'changed'
+
+        assert data.load_events(parse_json=False).loc[0, 'notes'] == 'Initial'
+
+
+class TestReadEventCsv:
+    """Test the shared event log reader"""
+
+    @pytest.mark.parametrize('use_pyarrow', [True, False])
+    def test_blank_affects_cash_reads_as_false(self, event_log, monkeypatch, use_pyarrow):
+        """Both readers give a plain bool column with blanks as False"""
+        if use_pyarrow and data.pa is None:
+            pytest.skip("pyarrow not installed")
+        if not use_pyarrow:
+            monkeypatch.setattr(data, 'pa', None)
+        with open(event_log, 'a') as f:
+            f.write('3,2026-01-03 09:00:00,NOTE,{},{},,[],,0.0\n')
+
+        df = data.read_event_csv(event_log)
+
+        assert df['affects_cash'].dtype == bool
+        assert df['affects_cash'].tolist() == [True, True, False]
+
+
+class TestDeleteEvent:
+    """Test single-event deletes"""
+
+    def test_delete_removes_only_that_row(self, event_log):
+        """Deleting an event drops its line and leaves the others byte-identical"""
+        assert data.delete_event(1) is True
+
+        assert event_log.read_text() == HEADER + SEED_ROWS[1]
+        assert data.get_event_by_id(1) is None
+
+    def test_delete_missing_event_leaves_file_alone(self, event_log):
+        """Deleting an unknown id returns False without rewriting the file"""
+        mtime = event_log.stat().st_mtime_ns
+
+        assert data.delete_event(99) is False
+        assert event_log.stat().st_mtime_ns == mtime
+        assert list(event_log.parent.glob('*.tmp')) == []
+
+
+class TestCompactPriceEvents:
+    """Test PRICE_UPDATE compaction"""
+
+    def test_keeps_first_and_last_price_update_per_day(self, event_log):
+        """Middle PRICE_UPDATE events of a day are removed, other events kept"""
+        rows = [
+            '3,2026-01-05 09:30:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+            '4,2026-01-05 11:00:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+            '5,2026-01-05 12:00:00,NOTE,{},{},,[],False,0.0\n',
+            '6,2026-01-05 13:00:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+            '7,2026-01-05 16:00:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+            '8,2026-01-06 09:30:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+            '9,2026-01-06 16:00:00,PRICE_UPDATE,{},{},,[],False,0.0\n',
+        ]
+        with open(event_log, 'a') as f:
+            f.writelines(rows)
+
+        removed = data.compact_price_events()
+
+        assert removed == {'2026-01-05': 2}
+        df = data.load_events(parse_json=False)
+        assert df['event_id'].tolist() == [1, 2, 3, 5, 7, 8, 9]
+
+    def test_nothing_to_compact(self, event_log):
+        """Logs with two or fewer PRICE_UPDATE events are left alone"""
+        data.append_event('PRICE_UPDATE', {'prices': {}})
+
+        assert data.compact_price_events() == {}
+
+
+class TestSqliteReadCache:
+    """Test serving reads from the SQLite cache"""
+
+    @pytest.fixture
+    def synced_db(self, event_log, tmp_path, monkeypatch):
+        """A SQLite cache synced from the temporary event log"""
+        import api.database as database
+        monkeypatch.setattr(database, 'DB_PATH', tmp_path / 'portfolio.db')
+        monkeypatch.setattr(database, 'CSV_PATH', event_log)
+        database.init_database()
+        database.sync_csv_to_db()
+        return database
+
+    def test_reads_use_cache_when_in_sync(self, synced_db, monkeypatch):
+        """A fresh cache answers without touching the CSV"""
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV should not be read")
+        monkeypatch.setattr(data, 'load_events', fail)
+
+        events = data.get_events(ticker='tsla')
+        assert [e['event_id'] for e in events] == [2]
+        assert events[0]['data']['ticker'] == 'TSLA'
+        assert events[0]['affects_cash'] is True
+        assert data.get_event_by_id(1)['data'] == {'amount': 1000}
+        assert data.get_event_by_id(99) is None
+
+    def test_cache_rows_match_csv_rows(self, synced_db):
+        """Both read paths return the same values, empty notes included"""
+        cached = data.get_events(parse_json=False)
+        data.set_read_cache(None)
+        try:
+            from_csv = data.get_events(parse_json=False)
+        finally:
+            data.set_read_cache(synced_db.query_synced_events)
+
+        assert pd.isna(cached[0]['notes']) and pd.isna(from_csv[0]['notes'])
+        assert [{k: v for k, v in row.items() if k != 'notes'} for row in cached] == \
+            [{k: v for k, v in row.items() if k != 'notes'} for row in from_csv]
+
+    def test_missing_database_is_not_created(self, synced_db, tmp_path, monkeypatch):
+        """Reads fall back to the CSV without creating the database file"""
+        monkeypatch.setattr(synced_db, 'DB_PATH', tmp_path / 'missing.db')
+
+        assert data.get_event_by_id(2)['data']['ticker'] == 'TSLA'
+        assert not (tmp_path / 'missing.db').exists()
+
+    def test_stale_cache_falls_back_to_csv(self, synced_db):
+        """Events appended after the last sync are still returned"""
+        event_id = data.append_event('NOTE', {'content': 'unsynced'})
+
+        assert data.get_event_by_id(event_id)['data'] == {'content': 'unsynced'}
+        assert data.get_events(limit=1)[0]['event_id'] == event_id
+
+
+class TestAppendEventsBulk:
+    """Test batched event writes"""
+
+    def test_bulk_append_allocates_contiguous_ids(self, event_log):
+        """All events are written in order with consecutive ids"""
+        ids = data.append_events_bulk([
+            {'event_type': 'PRICE_UPDATE', 'data': {'prices': {'TSLA': 400}}},
+            {'event_type': 'PRICE_UPDATE', 'data': {'prices': {'TSLA': 401}}, 'tags': ['prices']},
+            {'event_type': 'DEPOSIT', 'data': {'amount': 5}, 'affects_cash': True, 'cash_delta': 5},
+        ])
+
+        assert ids == [3, 4, 5]
+        df = data.load_events()
+        assert df['event_type'].tolist()[-3:] == ['PRICE_UPDATE', 'PRICE_UPDATE', 'DEPOSIT']
+        assert df.iloc[-2]['tags'] == ['prices']
+        assert df.iloc[-1]['cash_delta'] == 5.0
+        assert data.get_next_event_id() == 6
+
+    def test_bulk_append_empty_is_noop(self, event_log):
+        """An empty batch writes nothing"""
+        before = event_log.read_text()
+
+        assert data.append_events_bulk([]) == []
+        assert event_log.read_text() == before
+
+
+class TestUpdateEvent:
+    """Test in-place event updates"""
+
+    def test_update_patches_only_that_row(self, event_log):
+        """Updated fields are written and other rows stay byte-identical"""
+        data.load_events()  # warm the cache so the in-memory patch path runs
+
+        assert data.update_event(2, {
+            'data': {'action': 'BUY', 'ticker': 'TSLA', 'total': 420},
+            'notes': 'Fixed price',
+            'cash_delta': -420,
+        }) is True
+
+        lines = event_log.read_text().splitlines(keepends=True)
+        assert lines[1] == SEED_ROWS[0]
+        event = data.get_event_by_id(2)
+        assert event['data']['total'] == 420
+        assert event['notes'] == 'Fixed price'
+        assert event['cash_delta'] == -420.0
+
+    def test_patched_cache_matches_fresh_read(self, event_log):
+        """The patched in-memory frame equals a re-read of the CSV"""
+        data.load_events()
+        data.update_event(1, {'data_json': {'amount': 2000}, 'affects_cash': False, 'tags': ['cash']})
+
+        patched = data.load_events()
+        data._invalidate_cache()
+        fresh = data.load_events()
+        assert patched['data'].tolist() == fresh['data'].tolist() == [{'amount': 2000}, fresh['data'][1]]
+        assert patched['tags'].tolist() == fresh['tags'].tolist()
+        assert patched['affects_cash'].tolist() == fresh['affects_cash'].tolist() == [False, True]
+
+    def test_update_missing_event(self, event_log):
+        """Updating an unknown id returns False"""
+        assert data.update_event(99, {'notes': 'x'}) is False
+
+
+class TestGetEventById:
+    """Test single-event lookups from the CSV"""
+
+    def test_lookup_by_id(self, event_log):
+        """Existing ids return the event, unknown ids return None"""
+        event = data.get_event_by_id(2)
+
+        assert event['event_id'] == 2
+        assert event['data']['ticker'] == 'TSLA'
+        assert data.get_event_by_id(99) is None
+
+    def test_duplicate_ids_return_first(self, event_log):
+        """A duplicated event_id resolves to its first row"""
+        with open(event_log, 'a') as f:
+            f.write('2,2026-01-03 09:00:00,NOTE,{},{},dup,[],False,0.0\n')
+
+        assert data.get_event_by_id(2, parse_json=False)['event_type'] == 'TRADE'
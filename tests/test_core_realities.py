@@ -0,0 +1,530 @@
+"""
+Tests for alternate histories, realities and projections (core/realities.py).
+
+Storage paths are redirected to a temporary directory so the real
+data/alt_histories and data/projections are never touched.
+"""
+
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.realities as realities
+
+HEADER = 'event_id,timestamp,event_type,data_json,reason_json,notes,tags_json,affects_cash,cash_delta\n'
+SEED_ROWS = [
+    '1,2026-01-02 09:30:00,DEPOSIT,"{""amount"":1000}",{},Initial,[],True,1000.0\n',
+    '2,2026-01-02 10:00:00,TRADE,"{""action"":""BUY"",""ticker"":""TSLA"",""shares"":2,""price"":100,""total"":200}",{},,[],True,-200.0\n',
+    '3,2026-01-03 10:00:00,TRADE,"{""action"": ""BUY"", ""ticker"": ""AAPL"", ""shares"": 1, ""price"": 50, ""total"": 50}",{},,[],True,-50.0\n',
+    '4,2026-01-04 10:00:00,TRADE,"{""action"": ""SELL"", ""ticker"": ""TSLA"", ""shares"": 1, ""price"": 120, ""total"": 120}",{},,[],True,120.0\n',
+]
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker with a deterministic price series."""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start=None, end=None, **kwargs):
+        dates = pd.bdate_range('2025-01-01', periods=120)
+        base = 100 if self.symbol == 'TSLA' else 50
+        close = [base * (1 + 0.01 * ((i % 20) - 10)) for i in range(len(dates))]
+        return pd.DataFrame({'Close': close}, index=dates)
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    """Serve price history from FakeTicker instead of the network."""
+    monkeypatch.setattr(realities.yf, 'Ticker', FakeTicker)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point core.realities at temporary storage seeded with a real event log."""
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'event_log_enhanced.csv').write_text(HEADER + ''.join(SEED_ROWS))
+
+    monkeypatch.setattr(realities, 'DATA_DIR', data_dir)
+    monkeypatch.setattr(realities, 'ALT_HISTORIES_DIR', data_dir / 'alt_histories')
+    monkeypatch.setattr(realities, 'ALT_HISTORIES_INDEX', data_dir / 'alt_histories' / 'index.json')
+    monkeypatch.setattr(realities, 'ALT_REALITIES_FILE', data_dir / 'alternate_realities.json')
+    monkeypatch.setattr(realities, 'PROJECTIONS_DIR', data_dir / 'projections')
+    monkeypatch.setattr(realities, 'PRICE_CACHE_DIR', data_dir / 'price_cache')
+    realities.ensure_storage.cache_clear()
+    realities._read_index.cache_clear()
+    realities._index_by_id.cache_clear()
+    realities._read_history_events.cache_clear()
+    realities._reality_events_and_state.cache_clear()
+    yield data_dir
+    realities.ensure_storage.cache_clear()
+    realities._read_index.cache_clear()
+    realities._index_by_id.cache_clear()
+    realities._read_history_events.cache_clear()
+    realities._reality_events_and_state.cache_clear()
+
+
+class TestApplyModifications:
+    """Test modification rules applied to an alternate history"""
+
+    def test_scale_position_scales_shares_total_and_cash(self, storage):
+        """Only the ticker's trades are scaled, whatever the JSON spacing"""
+        history = realities.create_history('Double TSLA', modifications=[
+            {'type': 'scale_position', 'ticker': 'TSLA', 'scale': 2.0}
+        ], use_llm=False)
+
+        df = realities.get_history_events(history['id'])
+        by_ticker = {(d.get('ticker'), d.get('action')): (d, cash) for d, cash in zip(df['data'], df['cash_delta'])}
+
+        assert by_ticker[('TSLA', 'BUY')][0]['shares'] == 4
+        assert by_ticker[('TSLA', 'BUY')][0]['total'] == 400
+        assert by_ticker[('TSLA', 'BUY')][1] == -400
+        assert by_ticker[('TSLA', 'SELL')][1] == 240
+        assert by_ticker[('AAPL', 'BUY')][0]['shares'] == 1
+        assert by_ticker[('AAPL', 'BUY')][1] == -50
+
+
+    def test_added_trades_are_batched_and_visible_to_later_rules(self, storage):
+        """add_trade rows get fresh ids and later rules still see them"""
+        history = realities.create_history('Adds', modifications=[
+            {'type': 'add_trade', 'ticker': 'NVDA', 'action': 'BUY', 'shares': 1, 'price': 10, 'timestamp': '2026-01-06 10:00:00'},
+            {'type': 'add_trade', 'ticker': 'META', 'action': 'BUY', 'shares': 1, 'price': 20, 'timestamp': '2026-01-07 10:00:00'},
+            {'type': 'remove_ticker', 'ticker': 'NVDA'},
+            {'type': 'add_trade', 'ticker': 'AMD', 'action': 'SELL', 'shares': 2, 'price': 5, 'timestamp': '2026-01-08 10:00:00'},
+        ], use_llm=False)
+
+        df = realities.get_history_events(history['id'])
+
+        assert df['event_id'].tolist() == [1, 2, 3, 4, 5, 6]
+        assert [d.get('ticker') for d in df['data']][-2:] == ['META', 'AMD']
+        assert df['cash_delta'].tolist()[-2:] == [-20, 10]
+
+    def test_change_trade_price_updates_total_and_cash(self, storage):
+        """The trade's price, total and cash delta follow the new price"""
+        history = realities.create_history('Cheaper', modifications=[
+            {'type': 'change_trade_price', 'event_id': 2, 'price': 80},
+            {'type': 'change_trade_price', 'event_id': 4, 'price': 150},
+        ], use_llm=False)
+
+        df = realities.get_history_events(history['id'])
+
+        assert df['data'].iloc[1]['total'] == 160
+        assert df['cash_delta'].tolist() == [1000, -160, -50, 150]
+
+class TestCreateHistory:
+    """Test creating alternate histories from the real event log"""
+
+    def test_event_count_handles_multiline_notes(self, storage):
+        """A quoted note spanning lines still counts as one event"""
+        with open(storage / 'event_log_enhanced.csv', 'a') as f:
+            f.write('5,2026-01-05 10:00:00,NOTE,{},{},"line one\nline two",[],False,0.0\n')
+
+        history = realities.create_history('Copy', use_llm=False)
+
+        assert history['event_count'] == 5
+        assert realities.get_history(history['id'])['event_count'] == 5
+
+
+class TestDecodeJsonObject:
+    """Test pulling the JSON answer out of an LLM response"""
+
+    def test_stops_at_the_matching_brace(self):
+        """Braces in strings or trailing prose don't end the object early or late"""
+        text = 'Sure: {"analysis": "sell {some} TSLA", "modifications": []} Hope that helps }'
+
+        assert realities._decode_json_object(text) == {
+            "analysis": "sell {some} TSLA", "modifications": []
+        }
+        assert realities._decode_json_object('no json here') is None
+
+
+class TestParseLlmResponse:
+    """Test pulling the projection JSON out of an LLM reply"""
+
+    def test_fenced_json_after_stray_brace(self):
+        """A '{' in the prose before a code fence does not hide the fenced JSON"""
+        response = 'Use {placeholders} sparingly.\n```json\n{"realities": [{"id": "base"}]}\n```'
+        assert realities.parse_llm_response(response) == {'realities': [{'id': 'base'}]}
+
+    def test_trailing_brace_in_prose(self):
+        """Prose after the object may contain braces"""
+        response = '{"realities": []} (values in {USD})'
+        assert realities.parse_llm_response(response) == {'realities': []}
+        assert realities.parse_llm_response('no json here') is None
+
+
+class TestGenerateFallbackProjections:
+    """Test the projections used when no LLM is available"""
+
+    def test_empty_portfolio_is_flat(self):
+        """A zero-value portfolio gives flat, neutral snapshots, not NaNs"""
+        result = realities.generate_fallback_projections({'total_value': 0, 'holdings': []})
+
+        for reality in result['realities']:
+            assert {(s['total_value'], s['change_from_present_pct'], s['sentiment'], s['sentiment_score'])
+                    for s in reality['snapshots']} == {(0, 0.0, 'neutral', 0.0)}
+
+
+class TestGetHistoryEvents:
+    """Test loading an alternate history's event log"""
+
+    def test_parses_data_and_mixed_timestamps(self, storage):
+        """isoformat() and space-separated timestamps both parse and sort"""
+        with open(storage / 'event_log_enhanced.csv', 'a') as f:
+            f.write('5,2026-01-01T08:00:00.123456,NOTE,,{},,[],False,0.0\n')
+        history = realities.create_history('Copy', use_llm=False)
+
+        df = realities.get_history_events(history['id'])
+
+        assert df['event_id'].tolist() == [5, 1, 2, 3, 4]
+        assert df['data'].iloc[0] == {}
+        assert df['data'].iloc[2]['ticker'] == 'TSLA'
+
+
+class TestBuildHistoricalTimeline:
+    """Test the value-over-time comparison of two event logs"""
+
+    def test_running_state_matches_full_replay(self, storage):
+        """A date-ordered log carried forward agrees with from-scratch replays"""
+        history = realities.create_history('Copy', use_llm=False)
+        events = realities.get_history_events(history['id'])
+
+        # The reversed copy is out of date order, so each point is replayed in full
+        timeline = realities.build_historical_timeline(events, events.iloc[::-1], 'ordered', 'reversed')
+
+        assert [p['date'] for p in timeline] == ['2026-01-02', '2026-01-03', '2026-01-04']
+        assert [p['history_1']['event_count'] for p in timeline] == [2, 3, 4]
+        cash = [p['history_1']['cash'] for p in timeline]
+        assert [c - cash[0] for c in cash] == [0, -50, 70]
+        assert [p['history_2']['cash'] for p in timeline] == cash
+
+
+class TestHistoryCache:
+    """Test the mtime-keyed index and event log caches"""
+
+    def test_repeat_loads_reuse_parsed_events(self, storage, monkeypatch):
+        """An unchanged event file is parsed once; modifications are picked up"""
+        history = realities.create_history('Copy', use_llm=False)
+        realities.get_history_events(history['id'])
+
+        calls = []
+        real_read = realities.read_event_csv
+        monkeypatch.setattr(realities, 'read_event_csv', lambda path: calls.append(path) or real_read(path))
+
+        assert len(realities.get_history_events(history['id'])) == 4
+        assert calls == []
+
+        realities.apply_modifications(history['id'], [{'type': 'remove_ticker', 'ticker': 'TSLA'}])
+        assert len(realities.get_history_events(history['id'])) == 2
+        assert len(calls) == 1
+
+    def test_callers_cannot_mutate_cached_index(self, storage):
+        """Edits to a loaded index only land once saved"""
+        history = realities.create_history('Copy', use_llm=False)
+
+        realities.load_index()['histories'].clear()
+        realities.get_history(history['id'])['name'] = 'changed'
+
+        assert realities.get_history(history['id'])['name'] == 'Copy'
+        realities.update_history(history['id'], {'name': 'Renamed'})
+        assert realities.list_histories()[0]['name'] == 'Renamed'
+
+
+class TestFindDivergencePoints:
+    """Test event-level diffs between two histories"""
+
+    def test_reports_removed_added_and_modified_events(self, storage):
+        """Each kind of difference is reported once, in timestamp order"""
+        history = realities.create_history('Copy', use_llm=False)
+        base = realities.get_history_events(history['id'])
+        other = base[base['event_id'] != 3].copy()
+        other['data'] = [{**d, 'shares': 9} if eid == 2 else d for eid, d in zip(other['event_id'], other['data'])]
+
+        divergences = realities.find_divergence_points(base, other)
+
+        assert [(d['event_id'], d['in_history']) for d in divergences] == [(2, 'modified'), (3, 'history_1_only')]
+        assert divergences[0]['changes'] == {'shares': {'from': 2, 'to': 9}}
+        assert divergences[1]['description'] == 'Event #3: TRADE - AAPL'
+
+    def test_raw_json_frames_compare_by_content(self, storage):
+        """Unparsed data_json compares by value, so spacing alone is not a change"""
+        base = pd.DataFrame({'event_id': [1, 2], 'timestamp': ['t1', 't2'], 'event_type': ['NOTE', 'NOTE'],
+                             'data_json': ['{"a": 1}', '{"a": 2}']})
+        other = base.assign(data_json=['{"a":1}', '{"a":3}'])
+
+        divergences = realities.find_divergence_points(base, other)
+
+        assert [(d['event_id'], d['changes']) for d in divergences] == [(2, {'a': {'from': 2, 'to': 3}})]
+
+
+class TestGenerateAlgorithmicTrades:
+    """Test the rule-based trade generators behind seeded realities"""
+
+    def test_swing_moving_averages(self):
+        """MA20/MA5 cover the 20 and 5 bars before the current one"""
+        dates = [f"2024-01-{d:02d}" for d in range(1, 23)]
+        closes = [100.0 + i for i in range(21)] + [100.0]
+        price_data = {'TSLA': dict(zip(dates, closes))}
+
+        trades = realities.generate_algorithmic_trades(
+            price_data, dates, 100000, ['TSLA'], 'swing', 'moderate'
+        )
+
+        assert [(t['date'], t['action'], t['shares']) for t in trades] == [
+            ('2024-01-21', 'BUY', 208), ('2024-01-22', 'SELL', 208)
+        ]
+        assert trades[0]['reason'] == 'Swing buy: price 120.00 > MA20 109.50'
+        assert trades[1]['reason'] == 'Swing sell: stop loss (-16.7%)'
+
+
+class TestCreateSeededReality:
+    """Test generating a reality from historical prices"""
+
+    def test_seeded_reality_round_trips(self, storage, fake_yf):
+        """The generated log is readable, modifiable and deletable"""
+        history = realities.create_seeded_reality(
+            'Seeded', 'test', '2025-01-01', 10000, ['TSLA', 'AAPL'], use_llm=False
+        )
+        assert 'error' not in history
+
+        suffix = '.parquet' if realities.HISTORY_PARQUET else '.csv'
+        event_file = storage / 'alt_histories' / f"{history['id']}{suffix}"
+        assert event_file.exists()
+
+        df = realities.get_history_events(history['id'])
+        assert df['event_type'].iloc[0] == 'DEPOSIT'
+        assert df['data'].iloc[0]['amount'] == 10000
+        assert len(df) == history['trade_count'] + 1
+
+        realities.apply_modifications(history['id'], [{'type': 'remove_ticker', 'ticker': 'TSLA'}])
+        tickers = {d.get('ticker') for d in realities.get_history_events(history['id'])['data']}
+        assert 'TSLA' not in tickers
+
+        realities.delete_history(history['id'])
+        assert not event_file.exists()
+
+
+class TestGetHistoricalPrices:
+    """Test the date -> ticker -> close lookup used by simple realities"""
+
+    def test_merges_tickers_by_date(self, storage, fake_yf):
+        """Each date carries every ticker's rounded close"""
+        prices = realities.get_historical_prices(['TSLA', 'AAPL'], '2025-01-01', '2025-12-31')
+
+        assert len(prices) == 120
+        assert prices['2025-01-01'] == {'TSLA': 90.0, 'AAPL': 45.0}
+        assert list(prices['2025-01-02']) == ['TSLA', 'AAPL']
+
+    @pytest.mark.skipif(realities.pa is None, reason="pyarrow not installed")
+    def test_past_ranges_are_served_from_disk(self, storage, fake_yf, monkeypatch):
+        """A repeat request skips the network, whatever the ticker order"""
+        first = realities.get_historical_prices(['TSLA', 'AAPL'], '2025-01-01', '2025-12-31')
+        monkeypatch.setattr(realities.yf, 'Ticker', None)
+
+        assert realities.get_historical_prices(['TSLA', 'AAPL'], '2025-01-01', '2025-12-31') == first
+        swapped = realities.get_historical_prices(['AAPL', 'TSLA'], '2025-01-01', '2025-12-31')
+        assert list(swapped['2025-01-02']) == ['AAPL', 'TSLA']
+        assert swapped == first
+
+    @pytest.mark.skipif(realities.pa is None, reason="pyarrow not installed")
+    def test_empty_history_is_not_cached(self, storage, monkeypatch):
+        """A ticker that comes back empty is fetched again next time"""
+        class EmptyTicker(FakeTicker):
+            def history(self, **kwargs):
+                return pd.DataFrame({'Close': []}) if self.symbol == 'AAPL' else super().history(**kwargs)
+
+        monkeypatch.setattr(realities.yf, 'Ticker', EmptyTicker)
+        prices = realities.get_historical_prices(['TSLA', 'AAPL'], '2025-01-01', '2025-12-31')
+        assert prices['2025-01-01'] == {'TSLA': 90.0}
+
+        monkeypatch.setattr(realities.yf, 'Ticker', FakeTicker)
+        prices = realities.get_historical_prices(['TSLA', 'AAPL'], '2025-01-01', '2025-12-31')
+        assert prices['2025-01-01'] == {'TSLA': 90.0, 'AAPL': 45.0}
+
+
+class TestAlternateRealities:
+    """Test the simple seed-and-hold realities"""
+
+    def test_reality_round_trips(self, storage, fake_yf):
+        """A created reality is saved, listed, loaded and deleted"""
+        reality = realities.create_alternate_reality(
+            'Hold', 'test', '2025-01-01', 10000, [{'ticker': 'tsla', 'shares': 10}]
+        )
+
+        assert reality['holdings'] == {'TSLA': 10}
+        assert len(reality['snapshots']) == 120
+        assert [r['id'] for r in realities.list_alternate_realities()] == [reality['id']]
+        assert realities.get_alternate_reality(reality['id']) == reality
+
+        sidecar = storage / f"snapshots_{reality['id']}.parquet"
+        if realities.pa is not None:
+            assert sidecar.exists()
+            assert 'snapshots' not in realities.load_alternate_realities()['realities'][0]
+
+        assert realities.delete_alternate_reality(reality['id'])
+        assert realities.list_alternate_realities() == []
+        assert not sidecar.exists()
+
+
+class TestRealityState:
+    """Test the cached reconstruction of the real event log"""
+
+    def test_projection_entrypoints_share_one_replay(self, storage, monkeypatch):
+        """Context and projections reuse one parse; callers get private copies"""
+        import reconstruct_state
+        calls = []
+        real_load = reconstruct_state.load_event_log
+        monkeypatch.setattr(reconstruct_state, 'load_event_log', lambda path: calls.append(path) or real_load(path))
+
+        context = realities.get_portfolio_context()
+        realities.generate_projection('reality', years=1, use_llm=False)
+        state = realities.get_reality_state()
+        assert len(calls) == 1
+        assert context['cash'] == state['cash'] == 870
+
+        state['holdings']['TSLA'] = 0
+        assert realities.get_reality_state()['holdings']['TSLA'] == 1
+
+    def test_reality_prices_come_from_the_cached_replay(self, storage):
+        """The price map matches the full state and is the caller's own copy"""
+        with open(storage / 'event_log_enhanced.csv', 'a') as f:
+            f.write('5,2026-01-05 16:00:00,PRICE_UPDATE,"{""prices"": {""TSLA"": 120}}",{},,[],False,0.0\n')
+
+        prices = realities.get_reality_prices()
+        assert prices == realities.get_reality_state()['latest_prices']
+        assert prices['TSLA'] == 120
+
+        prices['TSLA'] = 0
+        assert realities.get_reality_prices()['TSLA'] == 120
+
+
+class TestGenerateProjection:
+    """Test single projections"""
+
+    def test_ideas_are_loaded_once_in_request_order(self, storage, monkeypatch):
+        """All requested ideas come from one rebuild, in the order asked for"""
+        import types
+        calls = []
+
+        def fake_get_ideas(status_filter=None):
+            calls.append(status_filter)
+            return [{'id': i, 'title': i.upper(), 'tags': ['TSLA', i]} for i in ('a', 'b', 'c')]
+
+        # A stand-in module, so the real routes (and their SQLite setup) aren't imported
+        monkeypatch.setitem(sys.modules, 'api.routes.ideas', types.SimpleNamespace(get_ideas=fake_get_ideas))
+
+        projection = realities.generate_projection('reality', years=1, use_llm=False, idea_ids=['c', 'missing', 'a'])
+
+        assert len(calls) == 1
+        assert [i['title'] for i in projection['applied_ideas']] == ['C', 'A']
+
+
+class TestGenerateProjectionsBatch:
+    """Test generating several projections from shared LLM calls"""
+
+    def test_one_prompt_per_batch_with_per_request_fallback(self, storage, monkeypatch):
+        """Portfolios share a prompt; ones the answer skips fall back alone"""
+        import llm.client
+        import llm.config
+        prompts = []
+
+        def fake_response(prompt, max_tokens=500, system_prompt=None):
+            prompts.append(prompt)
+            return 'Sure: [{"index": 2, "ticker_analysis": {}, "portfolio_projection": {"note": "second"}}]'
+
+        monkeypatch.setattr(llm.config, 'get_llm_config', lambda: llm.config.LLMConfig(enabled=True))
+        monkeypatch.setattr(llm.client, 'get_llm_response', fake_response)
+        monkeypatch.setattr(realities, 'get_llm_analysis_for_projection', realities.get_statistical_analysis_for_projection)
+
+        results = realities.generate_projections_batch([
+            {'years': 1},
+            {'years': 2},
+            {'history_id': 'missing', 'years': 1},
+            {'years': 1, 'use_llm': False},
+        ])
+
+        assert len(prompts) == 1
+        assert 'PORTFOLIO 2 (2-year projection)' in prompts[0]
+        assert [r.get('analysis', {}).get('source') for r in results] == ['statistical', 'llm', None, 'statistical']
+        assert results[1]['analysis']['portfolio_projection'] == {'note': 'second'}
+        assert results[2] == {'error': 'History not found'}
+        assert realities.load_projection(results[1]['id'])['years'] == 2
+
+    def test_batch_response_shapes(self):
+        """Bare, prose-wrapped and fenced arrays all parse; stray brackets don't"""
+        answer = '[{"index": 2, "portfolio_projection": {}}, {"index": 1}]'
+        expected = [{}, {'portfolio_projection': {}}]
+
+        assert realities.parse_batch_analysis_response(answer, 2) == expected
+        assert realities.parse_batch_analysis_response(f'Here you go: {answer} Thanks [1]', 2) == expected
+        assert realities.parse_batch_analysis_response(f'Portfolios [1] and [2]:\n```json\n{answer}\n```', 2) == expected
+        assert realities.parse_batch_analysis_response('No idea [sorry]', 2) == [None, None]
+
+
+class TestProjectionStorage:
+    """Test saving, listing and deleting projections"""
+
+    def test_list_keeps_index_in_step_with_directory(self, storage):
+        """Files saved before the index existed, or changed behind its back, are listed as they are on disk"""
+        projections_dir = storage / 'projections'
+        projections_dir.mkdir()
+        (projections_dir / 'old.json').write_text(
+            '{"id": "old", "history_id": "reality", "created_at": "2025-01-01T00:00:00", "years": 1, "frames": []}'
+        )
+        (projections_dir / '_index.json').write_text('[]')
+
+        assert [p['id'] for p in realities.list_projections()] == ['old']
+        # The index sits beside the projections, never among them
+        assert (storage / 'projections_index.json').exists()
+        assert not (projections_dir / '_index.json').exists()
+        assert realities.load_projection('_index') is None
+
+        realities.save_projection({'id': 'new', 'history_id': 'h1', 'created_at': '2026-01-01T00:00:00',
+                                   'years': 2, 'end_date': '2028-01-01T00:00:00', 'frames': [{'month': 0}]})
+        listed = realities.list_projections()
+        assert [p['id'] for p in listed] == ['new', 'old']
+        assert listed[0] == {'id': 'new', 'history_id': 'h1', 'created_at': '2026-01-01T00:00:00',
+                             'years': 2, 'end_date': '2028-01-01T00:00:00'}
+
+        # Another process rewrites one projection and removes the other
+        (projections_dir / 'new.json').write_text(
+            '{"id": "new", "history_id": "h2", "created_at": "2026-01-01T00:00:00", "years": 3, "frames": []}'
+        )
+        (projections_dir / 'old.json').unlink()
+        listed = realities.list_projections()
+        assert [(p['id'], p['history_id'], p['years']) for p in listed] == [('new', 'h2', 3)]
+
+        assert realities.delete_projection('new')
+        assert realities.list_projections() == []
+
+
+class TestCompareHistories:
+    """Test comparing alternate histories against reality"""
+
+    def test_reality_is_parsed_once_per_log_version(self, storage, monkeypatch):
+        """Repeat comparisons reuse reality's parsed log until it changes"""
+        import reconstruct_state
+        calls = []
+        real_load = reconstruct_state.load_event_log
+        monkeypatch.setattr(reconstruct_state, 'load_event_log', lambda path: calls.append(path) or real_load(path))
+
+        history = realities.create_history('No TSLA', modifications=[
+            {'type': 'remove_ticker', 'ticker': 'TSLA'}
+        ], use_llm=False)
+
+        first = realities.compare_histories(history['id'], include_projections=False)
+        second = realities.compare_histories(history['id'], include_projections=False)
+        assert len(calls) == 1
+        assert first['comparison'] == second['comparison']
+        assert first['history_1']['cash'] == 950
+        assert first['history_2']['cash'] == 870
+
+        with open(storage / 'event_log_enhanced.csv', 'a') as f:
+            f.write('5,2026-01-05 10:00:00,DEPOSIT,"{""amount"":100}",{},,[],True,100.0\n')
+        assert realities.compare_histories(history['id'], include_projections=False)['history_2']['cash'] == 970
+        assert len(calls) == 2
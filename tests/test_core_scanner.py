@@ -0,0 +1,150 @@
+"""
+Tests for option chain fetching in the options scanner (core/scanner.py).
+
+yfinance is replaced by FakeTicker and the option chain disk cache is
+redirected to a temporary directory, so no network or real cache is used.
+"""
+
+import os
+import pandas as pd
+import pytest
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.scanner as scanner
+
+Chain = namedtuple('Chain', ['calls', 'puts'])
+
+
+def expiry(days: int) -> str:
+    return (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker serving canned option chains.
+
+    chains maps each expiration to a Chain, or to an exception to raise.
+    With price None, reading .info fails the test.
+    """
+    price = 100.0
+    chains = {}
+    created = []
+    fetched = []
+
+    def __init__(self, symbol):
+        self.created.append(symbol)
+        self.options = tuple(self.chains)
+
+    @property
+    def info(self):
+        if self.price is None:
+            raise AssertionError("stock.info should not be read")
+        return {'regularMarketPrice': self.price}
+
+    def option_chain(self, exp):
+        self.fetched.append(exp)
+        chain = self.chains[exp]
+        if isinstance(chain, Exception):
+            raise chain
+        return chain
+
+
+def clear_caches():
+    scanner._cached_prices.cache_clear()
+    scanner._cached_ticker.cache_clear()
+    scanner._cached_option_chain.cache_clear()
+
+
+@pytest.fixture
+def fake_yf(monkeypatch, tmp_path):
+    """Serve yfinance from a fresh FakeTicker subclass, with empty caches."""
+    ticker = type('FakeTicker', (FakeTicker,), {'chains': {}, 'created': [], 'fetched': []})
+    monkeypatch.setattr(scanner.yf, 'Ticker', ticker)
+    monkeypatch.setattr(scanner, 'OPTION_CACHE_DIR', tmp_path)
+    clear_caches()
+    yield ticker
+    clear_caches()
+
+
+class TestFetchOptionsChain:
+    """Test building option contracts from Yahoo chains"""
+
+    def test_reuses_yahoo_responses(self, fake_yf):
+        """Repeat scans within the cache window don't refetch chains"""
+        side = pd.DataFrame({'strike': [90.0, 110.0], 'bid': [1.0, 1.2], 'ask': [1.2, 1.4],
+                             'lastPrice': [1.1, 1.3], 'impliedVolatility': [0.3, 0.35],
+                             'volume': [10.0, float('nan')], 'openInterest': [100, 200]})
+        fake_yf.chains = {expiry(20): Chain(calls=side, puts=side)}
+
+        first = scanner.fetch_options_chain('TEST')
+        second = scanner.fetch_options_chain('TEST')
+
+        assert first == second
+        assert [o['type'] for o in first] == ['PUT', 'CALL']
+        assert first[0]['strike'] == 90.0 and first[1]['volume'] == 0
+        assert fake_yf.created == ['TEST']
+        assert fake_yf.fetched == [expiry(20)]
+
+    @pytest.mark.skipif(scanner.pa is None, reason="pyarrow not installed")
+    def test_caches_chains_on_disk(self, fake_yf, tmp_path):
+        """A fresh chain on disk is read back instead of refetched; a stale one is not"""
+        puts = pd.DataFrame({'strike': [90.0, 95.0], 'bid': [1.0, 0.0], 'ask': [1.2, 2.0],
+                             'lastPrice': [1.1, 1.9], 'delta': [-0.2, float('nan')],
+                             'volume': [10.0, float('nan')], 'openInterest': [100, 200],
+                             'contractSymbol': ['P90', 'P95']})
+        calls = pd.DataFrame({'strike': [110.0], 'bid': [1.5], 'ask': [1.7], 'impliedVolatility': [0.4]})
+        fake_yf.chains = {expiry(20): Chain(calls=calls, puts=puts)}
+
+        def scan():
+            clear_caches()
+            return scanner.fetch_options_chain('DISK')
+
+        first = scan()
+        cache_file = tmp_path / 'DISK' / f'{expiry(20)}.parquet'
+        assert cache_file.exists()
+        assert scan() == first
+        assert fake_yf.fetched == [expiry(20)]
+
+        week_ago = (datetime.now() - timedelta(days=7)).timestamp()
+        os.utime(cache_file, (week_ago, week_ago))
+        assert scan() == first
+        assert fake_yf.fetched == [expiry(20)] * 2
+
+    def test_keeps_expiration_order(self, fake_yf):
+        """Chains fetched concurrently still come back in expiration order"""
+        side = pd.DataFrame({'strike': [90.0, 110.0], 'bid': [1.0, 1.0], 'ask': [1.2, 1.2]})
+        fake_yf.chains = {expiry(10): Chain(calls=side, puts=side),
+                          expiry(20): ValueError("no chain"),
+                          expiry(30): Chain(calls=side, puts=side),
+                          expiry(90): Chain(calls=side, puts=side)}
+
+        options = scanner.fetch_options_chain('ORDER', max_dte=45)
+
+        assert [o['expiration'] for o in options] == [expiry(10)] * 2 + [expiry(30)] * 2
+
+    def test_batches_prices(self, fake_yf, monkeypatch):
+        """Prices come from one download; a known price skips stock.info"""
+        downloads = []
+        index = pd.to_datetime(['2026-01-05', '2026-01-06'])
+        columns = pd.MultiIndex.from_product([['Close'], ['AAA', 'BBB']])
+
+        def fake_download(tickers, **kwargs):
+            downloads.append(tickers)
+            return pd.DataFrame([[10.0, 20.0], [11.0, float('nan')]], index=index, columns=columns)
+
+        monkeypatch.setattr(scanner.yf, 'download', fake_download)
+        side = pd.DataFrame({'strike': [9.0, 12.0], 'bid': [0.5, 0.5], 'ask': [0.6, 0.6]})
+        fake_yf.chains = {expiry(20): Chain(calls=side, puts=side)}
+        fake_yf.price = None
+
+        assert scanner.fetch_prices_batch(['BBB', 'AAA', 'CCC']) == {'AAA': 11.0, 'BBB': 20.0}
+        assert scanner.fetch_prices_batch(['AAA', 'CCC', 'BBB']) == {'AAA': 11.0, 'BBB': 20.0}
+        assert downloads == [['AAA', 'BBB', 'CCC']]
+
+        options = scanner.fetch_options_chain('AAA', current_price=11.0)
+        assert [(o['type'], o['strike'], o['current_price']) for o in options] == [('PUT', 9.0, 11.0), ('CALL', 12.0, 11.0)]
@@ -506,6 +506,21 @@ class TestOptionsScannerE2E:
         assert put_score > 0, "Put should have positive score"
         assert call_score > 0, "Call should have positive score"
 
+    def test_scanner_batch_scores_match_single(self):
+        """score_options gives each option the score score_option would"""
+        from core.scanner import score_option, score_options
+
+        options = [
+            {'type': t, 'annualized_yield_pct': y, 'otm_pct': otm, 'theta': theta,
+             'prob_otm': prob, 'dte': dte, 'volume': 50, 'open_interest': 1200}
+            for t in ('PUT', 'CALL')
+            for y, otm, theta, prob, dte in [(3, 1, None, None, 5), (35, 12, -0.05, 80, 35),
+                                             (80, 25, -0.2, 95, 60), (10, 3, 0, 55, 45)]
+        ]
+
+        assert score_options(options, {}) == [score_option(o, {}) for o in options]
+        assert score_options([], {}) == []
+
     def test_scanner_recommendations_structure(self):
         """Test that get_recommendations returns proper structure"""
         from core.scanner import get_recommendations